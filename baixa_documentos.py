@@ -0,0 +1,204 @@
+#  BAIXA DOCUMENTOS
+#  BAIXA OS DOCUMENTOS LIGADOS A CADA EDITAL DA CGESG (COLUNAS Edital, Ficha E Tabela) EM PARALELO,
+#  COM UMA SESSÃO HTTP ÚNICA (POOL DE CONEXÕES LIMITADO) E UM CACHE EM DISCO ENDEREÇADO PELO CONTEÚDO:
+#      <pasta>/objetos/ab/abcdef...   -> conteúdo, com o SHA-256 como nome (o mesmo arquivo nunca é gravado duas vezes)
+#      <pasta>/indice.json            -> URL -> SHA-256, ETag, Last-Modified (para as requisições condicionais)
+#      <pasta>/editais/<Edital No>/   -> Edital.pdf, Ficha.pdf, Tabela.pdf de cada edital (ligações para os objetos)
+#      <pasta>/manifesto.csv          -> uma linha por documento: edital, tipo, URL, situação, SHA-256, arquivo
+#  USADO PELO busca_edital_CESU.py (--documentos). PARA TESTAR SEM INTERNET: servidor_local_demanda.py --documentos PASTA
+
+import csv
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from sessao_http import cria_sessao
+from texto import nome_arquivo_seguro
+
+PASTA_DOCUMENTOS = "documentos_editais"
+NUM_CONEXOES = 8
+COLUNAS_DOCUMENTOS = ["Edital", "Ficha", "Tabela"]
+
+class CacheDocumentos:
+    """Objetos gravados pelo SHA-256 do conteúdo + índice URL -> metadados. Pode ser usado por várias threads."""
+
+    def __init__(self, pasta=PASTA_DOCUMENTOS):
+        self.pasta = pasta
+        self.pasta_objetos = os.path.join(pasta, "objetos")
+        self.caminho_indice = os.path.join(pasta, "indice.json")
+        os.makedirs(self.pasta_objetos, exist_ok=True)
+        self._trava = threading.Lock()
+        self.indice = {}
+        if os.path.exists(self.caminho_indice):
+            with open(self.caminho_indice, encoding="utf-8") as arquivo:
+                self.indice = json.load(arquivo)
+
+    def caminho_objeto(self, sha256):
+        return os.path.join(self.pasta_objetos, sha256[:2], sha256)
+
+    def consulta(self, url):
+        """Metadados da URL, só se o objeto ainda estiver no disco."""
+        with self._trava:
+            meta = self.indice.get(url)
+        if meta and os.path.exists(self.caminho_objeto(meta["sha256"])):
+            return meta
+        return None
+
+    def grava(self, resposta):
+        """Grava o corpo da resposta (em blocos, sem carregar tudo na memória) e retorna o SHA-256."""
+        sha = hashlib.sha256()
+        descritor, temporario = tempfile.mkstemp(dir=self.pasta_objetos, suffix=".tmp")
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                for bloco in resposta.iter_content(1 << 16):
+                    sha.update(bloco)
+                    arquivo.write(bloco)
+            sha256 = sha.hexdigest()
+            destino = self.caminho_objeto(sha256)
+            if os.path.exists(destino):
+                os.remove(temporario)
+            else:
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                os.replace(temporario, destino)
+            return sha256
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+    def registra(self, url, meta):
+        with self._trava:
+            self.indice[url] = meta
+
+    def salva(self):
+        with self._trava:
+            conteudo = json.dumps(self.indice, ensure_ascii=False, indent=2)
+        with open(self.caminho_indice + ".tmp", "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+        os.replace(self.caminho_indice + ".tmp", self.caminho_indice)
+
+def baixa_url(sessao, cache, url, timeout=30):
+    """
+    Baixa uma URL usando o cache. Com ETag/Last-Modified guardados, faz uma requisição condicional:
+    304 = o objeto em cache continua valendo. Retorna {url, situacao, sha256, tipo_conteudo, segundos}
+    com situacao "novo", "alterado", "igual" (baixou de novo, mesmo conteúdo) ou "nao_modificado".
+    """
+    inicio = time.perf_counter()
+    meta = cache.consulta(url)
+    cabecalhos = {}
+    if meta:
+        if meta.get("etag"):
+            cabecalhos["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            cabecalhos["If-Modified-Since"] = meta["last_modified"]
+
+    with sessao.get(url, headers=cabecalhos, timeout=timeout, stream=True) as resposta:
+        if resposta.status_code == 304 and meta:
+            situacao = "nao_modificado"
+            novo_meta = dict(meta, verificado_em=time.time())
+        else:
+            resposta.raise_for_status()
+            sha256 = cache.grava(resposta)
+            if not meta:
+                situacao = "novo"
+            else:
+                situacao = "igual" if meta["sha256"] == sha256 else "alterado"
+            novo_meta = {
+                "sha256": sha256,
+                "etag": resposta.headers.get("ETag"),
+                "last_modified": resposta.headers.get("Last-Modified"),
+                "tipo_conteudo": resposta.headers.get("Content-Type", ""),
+                "verificado_em": time.time(),
+            }
+    cache.registra(url, novo_meta)
+    return {"url": url, "situacao": situacao, "sha256": novo_meta["sha256"],
+            "tipo_conteudo": novo_meta["tipo_conteudo"], "segundos": time.perf_counter() - inicio}
+
+def extensao_documento(url, tipo_conteudo):
+    extensao = os.path.splitext(urlparse(url).path)[1].lower()
+    if re.fullmatch(r"\.[a-z0-9]{1,5}", extensao):
+        return extensao
+    return mimetypes.guess_extension((tipo_conteudo or "").split(";")[0].strip()) or ".pdf"
+
+def nome_pasta_edital(edital_no):
+    return nome_arquivo_seguro(edital_no) or "sem_numero"
+
+def liga_arquivo(origem, destino):
+    # Ligação física quando possível (não ocupa espaço de novo); cópia como alternativa
+    if os.path.exists(destino):
+        os.remove(destino)
+    try:
+        os.link(origem, destino)
+    except OSError:
+        shutil.copyfile(origem, destino)
+
+def documentos_dos_editais(df, colunas=COLUNAS_DOCUMENTOS):
+    """Lista (edital_no, tipo, url) das células com URL http(s) do DataFrame de editais."""
+    documentos = []
+    for linha in df[["Edital No"] + colunas].itertuples(index=False, name=None):
+        edital_no, urls = linha[0], linha[1:]
+        for tipo, url in zip(colunas, urls):
+            if isinstance(url, str) and url.strip().lower().startswith(("http://", "https://")):
+                documentos.append((edital_no, tipo, url.strip()))
+    return documentos
+
+def baixa_documentos(df, pasta=PASTA_DOCUMENTOS, conexoes=NUM_CONEXOES, timeout=30, sessao=None, cronometro=None):
+    """
+    Baixa em paralelo (conexoes threads, uma sessão) os documentos dos editais do DataFrame.
+    Cada URL é baixada uma vez, mesmo que apareça em vários editais. Erros não interrompem os demais downloads.
+    Retorna a lista de linhas do manifesto.
+    """
+    documentos = documentos_dos_editais(df)
+    urls = list(dict.fromkeys(url for _, _, url in documentos))
+    cache = CacheDocumentos(pasta)
+    sessao = sessao or cria_sessao(conexoes, hosts=4)  # edital, ficha e tabela podem vir de hosts diferentes
+
+    def baixa(url):
+        try:
+            resultado = baixa_url(sessao, cache, url, timeout)
+        except Exception as e:
+            print(f"[ERRO] {url}: {e}")
+            return {"url": url, "situacao": "erro", "sha256": "", "tipo_conteudo": "", "segundos": 0.0, "erro": str(e)}
+        if cronometro is not None:
+            cronometro.registra("documento", resultado["segundos"], url)
+        return resultado
+
+    try:
+        with ThreadPoolExecutor(max_workers=conexoes) as executor:
+            resultados = dict(zip(urls, executor.map(baixa, urls)))
+    finally:
+        cache.salva()
+
+    manifesto = []
+    for edital_no, tipo, url in documentos:
+        resultado = resultados[url]
+        arquivo = ""
+        if resultado["sha256"]:
+            pasta_edital = os.path.join(pasta, "editais", nome_pasta_edital(edital_no))
+            os.makedirs(pasta_edital, exist_ok=True)
+            arquivo = os.path.join(pasta_edital, tipo + extensao_documento(url, resultado["tipo_conteudo"]))
+            liga_arquivo(cache.caminho_objeto(resultado["sha256"]), arquivo)
+        manifesto.append({"edital_no": edital_no, "tipo": tipo, "url": url, "situacao": resultado["situacao"],
+                          "sha256": resultado["sha256"], "arquivo": arquivo, "erro": resultado.get("erro", "")})
+
+    with open(os.path.join(pasta, "manifesto.csv"), "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=["edital_no", "tipo", "url", "situacao", "sha256", "arquivo", "erro"])
+        escritor.writeheader()
+        escritor.writerows(manifesto)
+
+    return manifesto
+
+def resume_manifesto(manifesto):
+    """Contagem de URLs distintas por situação."""
+    situacoes = {}
+    for url, situacao in {linha["url"]: linha["situacao"] for linha in manifesto}.items():
+        situacoes[situacao] = situacoes.get(situacao, 0) + 1
+    return situacoes
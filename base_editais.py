@@ -0,0 +1,195 @@
+#  BASE EDITAIS
+#  BASE LOCAL (SQLITE) DOS EDITAIS DA CGESG, ATUALIZADA A CADA EXECUÇÃO DO busca_edital_CESU.py.
+#  CADA EDITAL (CHAVE: Edital No) GUARDA QUANDO FOI VISTO PELA PRIMEIRA E PELA ÚLTIMA VEZ E QUANDO MUDOU,
+#  O QUE PERMITE PERGUNTAR "O QUE APARECEU OU MUDOU DESDE A ÚLTIMA EXECUÇÃO" SEM RELER O CSV.
+#  OS FILTROS (FATEC, CURSO, ...) SÃO CONSULTAS NA TABELA DE TERMOS INDEXADA.
+
+import hashlib
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from texto import normaliza_termo
+
+ARQUIVO_BASE = "editais_cgesg.sqlite"
+
+# Coluna do DataFrame -> coluna da tabela editais
+COLUNAS_BASE = {
+    "Edital No": "edital_no",
+    "Fatec": "fatec",
+    "Curso": "curso",
+    "Disciplina": "disciplina",
+    "Área da disciplina": "area",
+    "Determinado ou indeterminado": "tipo",
+    "Período": "periodo",
+    "Data abertura": "data_abertura",
+    "Data limite": "data_limite",
+    "Edital": "edital",
+    "Ficha": "ficha",
+    "Tabela": "tabela",
+}
+
+# Campo do perfil de filtro -> coluna da tabela editais (campos multi-valor, separados por vírgula)
+CAMPOS_TERMOS = {
+    "fatec": "fatec",
+    "curso": "curso",
+    "disciplina": "disciplina",
+    "area": "area",
+    "tipo": "tipo",
+    "periodo": "periodo",
+}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS editais (
+    edital_no TEXT PRIMARY KEY,
+    fatec TEXT, curso TEXT, disciplina TEXT, area TEXT, tipo TEXT, periodo TEXT,
+    data_abertura TEXT, data_limite TEXT,
+    edital TEXT, ficha TEXT, tabela TEXT,
+    hash TEXT NOT NULL,
+    primeiro_visto TEXT NOT NULL,
+    ultimo_visto TEXT NOT NULL,
+    alterado_em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_editais_data_limite ON editais (data_limite);
+CREATE INDEX IF NOT EXISTS idx_editais_alterado_em ON editais (alterado_em);
+CREATE INDEX IF NOT EXISTS idx_editais_ultimo_visto ON editais (ultimo_visto);
+
+CREATE TABLE IF NOT EXISTS termos (
+    campo TEXT NOT NULL,
+    termo TEXT NOT NULL,
+    edital_no TEXT NOT NULL,
+    PRIMARY KEY (campo, termo, edital_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_termos_edital ON termos (edital_no);
+
+CREATE TABLE IF NOT EXISTS execucoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    executado_em TEXT NOT NULL,
+    snapshot_sha256 TEXT
+);
+"""
+
+def abre_base(caminho=ARQUIVO_BASE):
+    con = sqlite3.connect(caminho)
+    con.executescript(ESQUEMA)
+    return con
+
+def ultima_execucao(con):
+    """Retorna (executado_em, snapshot_sha256) da execução anterior, ou (None, None)."""
+    linha = con.execute("SELECT executado_em, snapshot_sha256 FROM execucoes ORDER BY id DESC LIMIT 1").fetchone()
+    return linha if linha else (None, None)
+
+def termos_celula(celula):
+    if celula is None:
+        return set()
+    return {normaliza_termo(parte) for parte in str(celula).split(",") if parte.strip()}
+
+def registros_snapshot(df):
+    """Linhas do snapshot no formato da tabela (datas em ISO), uma por Edital No (a última vence)."""
+    base = df[list(COLUNAS_BASE)].rename(columns=COLUNAS_BASE)
+    for coluna in ("data_abertura", "data_limite"):
+        base[coluna] = base[coluna].dt.strftime("%Y-%m-%d")
+    base = base.astype(object).where(base.notna(), None)
+    base["edital_no"] = base["edital_no"].astype(str)
+    base = base.drop_duplicates(subset="edital_no", keep="last")
+
+    registros = []
+    for linha in base.itertuples(index=False, name=None):
+        conteudo = "\x1f".join("" if v is None else str(v) for v in linha)
+        registros.append((linha, hashlib.sha1(conteudo.encode("utf-8")).hexdigest()))
+    return registros
+
+def atualiza_base(con, df, snapshot_sha256=None, agora=None):
+    """
+    Grava o snapshot na base. Editais novos entram com primeiro_visto = agora; editais com conteúdo
+    diferente são atualizados (alterado_em = agora); todos os presentes ficam com ultimo_visto = agora.
+    Se o snapshot for o mesmo da execução anterior (mesmo SHA-256), só ultimo_visto é atualizado.
+    Retorna {"novos": n, "alterados": n, "iguais": n} (None quando o snapshot não mudou).
+    """
+    agora = agora or datetime.now().isoformat(timespec="seconds")
+    anterior_em, anterior_sha = ultima_execucao(con)
+
+    with con:
+        if snapshot_sha256 and snapshot_sha256 == anterior_sha:
+            con.execute("UPDATE editais SET ultimo_visto = ? WHERE ultimo_visto = ?", (agora, anterior_em))
+            con.execute("INSERT INTO execucoes (executado_em, snapshot_sha256) VALUES (?, ?)", (agora, snapshot_sha256))
+            return None
+
+        existentes = dict(con.execute("SELECT edital_no, hash FROM editais"))
+        colunas = list(COLUNAS_BASE.values())
+        novos, alterados, iguais = [], [], []
+        for linha, hash_linha in registros_snapshot(df):
+            edital_no = linha[0]
+            if edital_no not in existentes:
+                novos.append(linha + (hash_linha, agora, agora, agora))
+            elif existentes[edital_no] != hash_linha:
+                alterados.append(linha[1:] + (hash_linha, agora, agora, edital_no))
+            else:
+                iguais.append((agora, edital_no))
+
+        con.executemany(
+            f"INSERT INTO editais ({', '.join(colunas)}, hash, primeiro_visto, ultimo_visto, alterado_em) "
+            f"VALUES ({', '.join('?' * (len(colunas) + 4))})",
+            novos,
+        )
+        con.executemany(
+            f"UPDATE editais SET {', '.join(f'{c} = ?' for c in colunas[1:])}, hash = ?, ultimo_visto = ?, "
+            f"alterado_em = ? WHERE edital_no = ?",
+            alterados,
+        )
+        con.executemany("UPDATE editais SET ultimo_visto = ? WHERE edital_no = ?", iguais)
+
+        # Termos dos filtros: só dos editais novos ou alterados
+        mudaram = [linha[0] for linha in novos] + [linha[-1] for linha in alterados]
+        con.executemany("DELETE FROM termos WHERE edital_no = ?", [(e,) for e in mudaram])
+        posicao = {coluna: i for i, coluna in enumerate(colunas)}
+        termos = []
+        for linha in novos:
+            for campo, coluna in CAMPOS_TERMOS.items():
+                termos.extend((campo, termo, linha[0]) for termo in termos_celula(linha[posicao[coluna]]))
+        for linha in alterados:
+            # alterados: (colunas sem edital_no..., hash, ultimo_visto, alterado_em, edital_no)
+            for campo, coluna in CAMPOS_TERMOS.items():
+                termos.extend((campo, termo, linha[-1]) for termo in termos_celula(linha[posicao[coluna] - 1]))
+        con.executemany("INSERT OR IGNORE INTO termos (campo, termo, edital_no) VALUES (?, ?, ?)", termos)
+
+        con.execute("INSERT INTO execucoes (executado_em, snapshot_sha256) VALUES (?, ?)", (agora, snapshot_sha256))
+
+    return {"novos": len(novos), "alterados": len(alterados), "iguais": len(iguais)}
+
+def consulta_editais(con, perfil=None, apenas_validos=True, desde=None, hoje=None):
+    """
+    Editais da base que atendem ao perfil ({"fatec": [...], "curso": [...], ...}; vazio = sem filtro),
+    como DataFrame no mesmo formato do CSV lido (colunas e datas).
+      - apenas_validos: só editais com Data limite >= hoje
+      - desde: só editais novos ou alterados depois desse instante (ISO), ex.: a execução anterior
+    """
+    condicoes, parametros = [], []
+    if apenas_validos:
+        condicoes.append("e.data_limite >= ?")
+        parametros.append((hoje or datetime.now().date()).isoformat())
+    if desde:
+        condicoes.append("e.alterado_em > ?")
+        parametros.append(desde)
+    for campo, valores in (perfil or {}).items():
+        termos = sorted({normaliza_termo(v) for v in valores or [] if str(v).strip()})
+        if not termos:
+            continue
+        if campo not in CAMPOS_TERMOS:
+            raise ValueError(f"Campo de filtro desconhecido: {campo}")
+        condicoes.append(
+            f"e.edital_no IN (SELECT edital_no FROM termos WHERE campo = ? AND termo IN ({', '.join('?' * len(termos))}))"
+        )
+        parametros.extend([campo, *termos])
+
+    sql = f"SELECT {', '.join('e.' + c for c in COLUNAS_BASE.values())} FROM editais e"
+    if condicoes:
+        sql += " WHERE " + " AND ".join(condicoes)
+    sql += " ORDER BY e.rowid"
+
+    df = pd.read_sql_query(sql, con, params=parametros)
+    df.columns = list(COLUNAS_BASE)
+    for coluna in ("Data abertura", "Data limite"):
+        df[coluna] = pd.to_datetime(df[coluna], format="%Y-%m-%d", errors="coerce")
+    return df
@@ -0,0 +1,378 @@
+#  BENCHMARK
+#  MEDE O DESEMPENHO DAS FERRAMENTAS SEM INTERNET, COM DADOS SINTÉTICOS (dados_sinteticos.py) E O SERVIDOR LOCAL
+#  (servidor_local_demanda.py) NO LUGAR DOS SITES DA CESU E DA CGESG. CENÁRIOS:
+#      raspagem      -> busca_demanda_vestibular_fatec.py (motor http) contra páginas de demanda geradas
+#      normalizacao  -> processa_arquivo_demanda_fatecs.py sobre um todas_fatecs_demanda.csv grande
+#      editais       -> busca_edital_CESU.py: baixa o CSV do servidor local, lê, filtra os perfis e gera os PDFs
+#      imagens       -> extrai_imagens_pdf.py sobre PDFs com muitas imagens
+#      qrcode        -> qrcode_generator.py: QRCodes um a um e o lote em folha PDF (com e sem cache)
+#      inicio        -> python -m cinto_de_utilidades: tempo de importação da CLI e dos subcomandos leves
+#  CADA CENÁRIO RODA EM UM PROCESSO SEPARADO (O PICO DE MEMÓRIA É SÓ DELE) E INFORMA VAZÃO, LATÊNCIAS (p50/p95/p99)
+#  E PICO DE MEMÓRIA (RSS). O RESULTADO VAI PARA UM JSON; COM --comparar, MOSTRA A DIFERENÇA PARA UM RESULTADO ANTERIOR.
+#      python benchmark.py                          (todos os cenários, tamanho pequeno)
+#      python benchmark.py editais qrcode --tamanho medio --comparar benchmark_resultados/anterior.json
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from cronometro import percentil
+
+PASTA_RESULTADOS = "benchmark_resultados"
+PASTA_DADOS = os.path.join(tempfile.gettempdir(), "cinto_benchmark")
+VERSAO_DADOS = 2  # mude quando dados_sinteticos.py mudar, para não medir em cima de dados antigos
+
+TAMANHOS = {
+    "pequeno": {"semestres": 2, "unidades": 10, "cursos": 6, "linhas_demanda": 50_000, "editais": 500,
+                "perfis": 4, "pdfs": 3, "paginas_pdf": 40, "qrcodes": 200},
+    "medio": {"semestres": 4, "unidades": 40, "cursos": 8, "linhas_demanda": 500_000, "editais": 3_000,
+              "perfis": 8, "pdfs": 6, "paginas_pdf": 150, "qrcodes": 1_000},
+    "grande": {"semestres": 10, "unidades": 80, "cursos": 10, "linhas_demanda": 3_000_000, "editais": 10_000,
+               "perfis": 16, "pdfs": 12, "paginas_pdf": 300, "qrcodes": 5_000},
+}
+
+def pasta_cenario(pasta, nome, tamanho):
+    caminho = os.path.join(pasta, f"{nome}_{tamanho}_v{VERSAO_DADOS}")
+    os.makedirs(caminho, exist_ok=True)
+    return caminho
+
+def resultado(itens, unidade, segundos, latencias, **extras):
+    latencias = sorted(latencias)
+    return {
+        "itens": itens,
+        "unidade": unidade,
+        "segundos": segundos,
+        "vazao_por_s": itens / segundos if segundos else 0.0,
+        "latencia_ms": {
+            "n": len(latencias),
+            "p50": 1000 * percentil(latencias, 50),
+            "p95": 1000 * percentil(latencias, 95),
+            "p99": 1000 * percentil(latencias, 99),
+            "max": 1000 * latencias[-1] if latencias else 0.0,
+        },
+        "extras": extras,
+    }
+
+# ======================================================
+# CENÁRIOS (prepara: no processo principal; executa: no processo do cenário)
+# ======================================================
+def prepara_raspagem(pasta, t):
+    from dados_sinteticos import gera_paginas_demanda
+    paginas = os.path.join(pasta, "paginas")
+    if not os.path.exists(os.path.join(paginas, "inicio.html")):
+        gera_paginas_demanda(paginas, t["semestres"], t["unidades"], t["cursos"])
+
+def executa_raspagem(pasta, t):
+    import busca_demanda_vestibular_fatec as demanda
+    from servidor_local_demanda import inicia_servidor
+
+    servidor, url = inicia_servidor(pasta=os.path.join(pasta, "paginas"))
+    caminho_checkpoint = os.path.join(pasta, "checkpoint.sqlite")
+    if os.path.exists(caminho_checkpoint):
+        os.remove(caminho_checkpoint)
+    checkpoint = demanda.Checkpoint(caminho_checkpoint)
+    try:
+        inicio = time.perf_counter()
+        demanda.busca_via_http(checkpoint, url, demanda.NUM_CONEXOES)
+        segundos = time.perf_counter() - inicio
+        pares = checkpoint.resumo().get("ok", 0)
+    finally:
+        checkpoint.fecha()
+        servidor.shutdown()
+
+    requisicoes = [r["segundos"] for r in demanda.CRONOMETRO.registros
+                   if r["etapa"] in ("carrega_pagina", "submete_ano_sem", "submete_unidade")]
+    return resultado(pares, "pares", segundos, requisicoes, requisicoes=len(requisicoes),
+                     observacao="latência por requisição HTTP")
+
+def prepara_normalizacao(pasta, t):
+    from dados_sinteticos import gera_demanda_csv
+    entrada = os.path.join(pasta, "todas_fatecs_demanda.csv")
+    if not os.path.exists(entrada):
+        gera_demanda_csv(entrada, t["linhas_demanda"])
+
+def executa_normalizacao(pasta, t, repeticoes=3):
+    import processa_arquivo_demanda_fatecs as processa
+    from indice_aliases import carrega_indice
+
+    dmap = processa.build_alias_mapping(processa.DICT_CSV)
+    indice = carrega_indice(processa.DICT_CSV, dmap, os.path.join(pasta, "indice.pkl"))
+    entrada = os.path.join(pasta, "todas_fatecs_demanda.csv")
+    saida = os.path.join(pasta, "normalizado.csv")
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        linhas, _, _ = processa.processa_em_blocos(entrada, saida, dmap, processa.CHUNKSIZE, indice)
+        tempos.append(time.perf_counter() - inicio)
+    return resultado(linhas * repeticoes, "linhas", sum(tempos), tempos, repeticoes=repeticoes,
+                     observacao="latência por execução completa")
+
+def prepara_editais(pasta, t):
+    from dados_sinteticos import CURSOS, gera_csv_cgesg, nomes_unidades
+    caminho_csv = os.path.join(pasta, "editais_cgesg.csv")
+    if not os.path.exists(caminho_csv):
+        gera_csv_cgesg(caminho_csv, t["editais"])
+    # Cada perfil fica com uma fatia das unidades; os ímpares também filtram um curso
+    unidades = nomes_unidades(40)
+    perfis = {}
+    for n in range(t["perfis"]):
+        perfis[f"perfil_{n}"] = {"fatec": unidades[n::t["perfis"]]}
+        if n % 2:
+            perfis[f"perfil_{n}"]["curso"] = [CURSOS[n % len(CURSOS)]]
+    with open(os.path.join(pasta, "perfis.json"), "w", encoding="utf-8") as arquivo:
+        json.dump(perfis, arquivo, ensure_ascii=False, indent=2)
+
+def executa_editais(pasta, t):
+    import pandas as pd
+    import requests
+    import busca_edital_CESU as editais
+    from servidor_local_demanda import inicia_servidor
+
+    servidor, url = inicia_servidor(arquivo_cgesg=os.path.join(pasta, "editais_cgesg.csv"))
+    try:
+        inicio = time.perf_counter()
+        resposta = requests.get(url.replace("/demanda/", "/cgesg/editais.csv"), timeout=30)
+        resposta.raise_for_status()
+        baixado = os.path.join(pasta, "baixado.csv")
+        with open(baixado, "wb") as arquivo:
+            arquivo.write(resposta.content)
+        download = time.perf_counter() - inicio
+    finally:
+        servidor.shutdown()
+
+    inicio = time.perf_counter()
+    df = editais.le_csv_cgesg(baixado)
+    leitura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    indice = editais.constroi_indice(df)
+    validos = df["Data limite"] >= pd.Timestamp(datetime.now().date())
+    tempo_indice = time.perf_counter() - inicio
+
+    perfis = editais.carrega_perfis(os.path.join(pasta, "perfis.json"))
+    latencias = []
+    renderizados = 0
+    inicio_perfis = time.perf_counter()
+    for nome, perfil in perfis.items():
+        inicio = time.perf_counter()
+        df_filtrado = editais.filtra_perfil(df, indice, validos, perfil)
+        editais.gera_pdf_editais(df_filtrado, os.path.join(pasta, editais.nome_arquivo_perfil(nome)))
+        latencias.append(time.perf_counter() - inicio)
+        renderizados += len(df_filtrado)
+    segundos = time.perf_counter() - inicio_perfis
+
+    return resultado(len(perfis), "perfis", segundos, latencias, editais=len(df), editais_renderizados=renderizados,
+                     download_s=download, leitura_s=leitura, indice_s=tempo_indice,
+                     observacao="latência por perfil (filtro + PDF)")
+
+def prepara_imagens(pasta, t):
+    from dados_sinteticos import gera_pdf_imagens
+    pasta_pdfs = os.path.join(pasta, "pdfs")
+    os.makedirs(pasta_pdfs, exist_ok=True)
+    for n in range(t["pdfs"]):
+        caminho = os.path.join(pasta_pdfs, f"documento_{n:03d}.pdf")
+        if not os.path.exists(caminho):
+            gera_pdf_imagens(caminho, t["paginas_pdf"], semente=n)
+
+def executa_imagens(pasta, t):
+    import shutil
+    import extrai_imagens_pdf as imagens
+
+    pasta_pdfs = os.path.join(pasta, "pdfs")
+    saida = os.path.join(pasta, "imagens")
+    shutil.rmtree(saida, ignore_errors=True)
+
+    latencias = []
+    ocorrencias = arquivos = total_bytes = 0
+    inicio = time.perf_counter()
+    for nome in sorted(os.listdir(pasta_pdfs)):
+        inicio_pdf = time.perf_counter()
+        resumo = imagens.extrai_pdf(os.path.join(pasta_pdfs, nome), os.path.join(saida, nome), processos=1)
+        latencias.append(time.perf_counter() - inicio_pdf)
+        ocorrencias += resumo["ocorrencias"]
+        arquivos += resumo["arquivos"]
+        total_bytes += resumo["bytes"]
+    segundos = time.perf_counter() - inicio
+    return resultado(ocorrencias, "ocorrências de imagem", segundos, latencias, pdfs=len(latencias),
+                     arquivos=arquivos, mb_por_s=total_bytes / 1e6 / segundos if segundos else 0.0,
+                     observacao="latência por PDF")
+
+def prepara_qrcode(pasta, t):
+    from dados_sinteticos import gera_payloads_csv
+    caminho = os.path.join(pasta, "payloads.csv")
+    if not os.path.exists(caminho):
+        gera_payloads_csv(caminho, t["qrcodes"])
+
+def executa_qrcode(pasta, t):
+    import shutil
+    import qrcode_generator
+
+    caminho_csv = os.path.join(pasta, "payloads.csv")
+    opcoes = {"correcao": "L", "box_size": 5, "border": 0}
+    linhas = qrcode_generator.le_lote(caminho_csv)
+
+    latencias = []
+    inicio = time.perf_counter()
+    for _, payload in linhas:
+        inicio_qr = time.perf_counter()
+        qrcode_generator.renderiza(payload, opcoes, "png")
+        latencias.append(time.perf_counter() - inicio_qr)
+    segundos = time.perf_counter() - inicio
+
+    saida = os.path.join(pasta, "lote")
+    shutil.rmtree(saida, ignore_errors=True)
+    lote = qrcode_generator.gera_lote(caminho_csv, saida, "pdf", opcoes=opcoes)
+    lote_cache = qrcode_generator.gera_lote(caminho_csv, saida, "pdf", opcoes=opcoes)
+    return resultado(len(linhas), "QRCodes", segundos, latencias, lote_pdf_s=lote["segundos"],
+                     lote_pdf_com_cache_s=lote_cache["segundos"], observacao="latência por QRCode (PNG)")
+
+def prepara_inicio(pasta, t):
+    pass
+
+def executa_inicio(pasta, t):
+    from cinto_de_utilidades import cli
+
+    inicio = time.perf_counter()
+    verificacoes = cli.verifica_inicio()
+    segundos = time.perf_counter() - inicio
+    return resultado(len(verificacoes), "subcomandos", segundos, [v["ms"] / 1000 for v in verificacoes],
+                     importacao_ms={v["subcomando"]: round(v["ms"], 1) for v in verificacoes},
+                     dentro_do_orcamento=all(v["ok"] for v in verificacoes),
+                     observacao="latência = importação de cada subcomando em interpretador novo")
+
+CENARIOS = {
+    "raspagem": (prepara_raspagem, executa_raspagem),
+    "normalizacao": (prepara_normalizacao, executa_normalizacao),
+    "editais": (prepara_editais, executa_editais),
+    "imagens": (prepara_imagens, executa_imagens),
+    "qrcode": (prepara_qrcode, executa_qrcode),
+    "inicio": (prepara_inicio, executa_inicio),
+}
+
+# ======================================================
+# EXECUÇÃO ISOLADA E RELATÓRIO
+# ======================================================
+def rss_pico_mb(filhos=False):
+    # O módulo resource só existe em sistemas Unix; no Windows o pico de memória fica sem medida (None)
+    try:
+        import resource
+    except ImportError:
+        return None
+    maximo = resource.getrusage(resource.RUSAGE_CHILDREN if filhos else resource.RUSAGE_SELF).ru_maxrss
+    # No Linux ru_maxrss vem em KB; no macOS, em bytes
+    return maximo / (1024 * 1024) if sys.platform == "darwin" else maximo / 1024
+
+def executa_no_processo_atual(nome, tamanho, pasta, caminho_resultado):
+    # Chamado no processo filho (--interno): a saída dos programas é descartada, só o JSON interessa
+    _, executa = CENARIOS[nome]
+    with contextlib.redirect_stdout(io.StringIO()):
+        medido = executa(pasta_cenario(pasta, nome, tamanho), TAMANHOS[tamanho])
+    medido["rss_pico_mb"] = rss_pico_mb()
+    medido["rss_pico_filhos_mb"] = rss_pico_mb(filhos=True)
+    with open(caminho_resultado, "w", encoding="utf-8") as arquivo:
+        json.dump(medido, arquivo, ensure_ascii=False)
+
+def executa_cenario(nome, tamanho, pasta):
+    prepara, _ = CENARIOS[nome]
+    prepara(pasta_cenario(pasta, nome, tamanho), TAMANHOS[tamanho])
+
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as temporario:
+        caminho_resultado = temporario.name
+    try:
+        processo = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--interno", nome, "--tamanho", tamanho, "--pasta", pasta,
+             "--resultado", caminho_resultado],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True,
+        )
+        if processo.returncode != 0:
+            return {"erro": (processo.stderr or processo.stdout).strip().splitlines()[-1:]}
+        with open(caminho_resultado, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    finally:
+        os.remove(caminho_resultado)
+
+def versao_codigo():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def imprime_resultados(resultados, anteriores=None):
+    print(f"{'Cenário':<14} {'itens':>9} {'vazão/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'RSS MB':>8}  comparação")
+    print("-" * 100)
+    for nome, r in resultados.items():
+        if "erro" in r:
+            print(f"{nome:<14} ERRO: {' '.join(r['erro'])}")
+            continue
+        comparacao = ""
+        anterior = (anteriores or {}).get(nome)
+        if anterior and "erro" not in anterior and anterior.get("vazao_por_s"):
+            comparacao = (f"vazão {100 * (r['vazao_por_s'] / anterior['vazao_por_s'] - 1):+.1f}%, "
+                          f"p95 {100 * (r['latencia_ms']['p95'] / (anterior['latencia_ms']['p95'] or 1) - 1):+.1f}%")
+        rss = "-" if r.get("rss_pico_mb") is None else f"{r['rss_pico_mb']:.0f}"
+        print(f"{nome:<14} {r['itens']:>9} {r['vazao_por_s']:>10.1f} {r['latencia_ms']['p50']:>9.1f} "
+              f"{r['latencia_ms']['p95']:>9.1f} {r['latencia_ms']['p99']:>9.1f} {rss:>8}  {comparacao}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das ferramentas com dados sintéticos, sem internet.")
+    parser.add_argument("cenarios", nargs="*", default=[],
+                        help=f"cenários (padrão: todos): {', '.join(CENARIOS)}")
+    parser.add_argument("--tamanho", choices=list(TAMANHOS), default="pequeno", help="volume dos dados (padrão: pequeno)")
+    parser.add_argument("--pasta", default=PASTA_DADOS, help=f"pasta dos dados gerados (padrão: {PASTA_DADOS})")
+    parser.add_argument("--saida", help=f"JSON do resultado (padrão: {PASTA_RESULTADOS}/<data>_<versão>.json)")
+    parser.add_argument("--comparar", metavar="ARQUIVO_JSON", help="resultado anterior para comparar")
+    parser.add_argument("--interno", help=argparse.SUPPRESS)
+    parser.add_argument("--resultado", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    desconhecidos = [nome for nome in args.cenarios if nome not in CENARIOS]
+    if desconhecidos:
+        parser.error(f"cenário(s) desconhecido(s): {', '.join(desconhecidos)}")
+
+    if args.interno:
+        executa_no_processo_atual(args.interno, args.tamanho, args.pasta, args.resultado)
+        return
+
+    anteriores = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anteriores = json.load(arquivo)["cenarios"]
+
+    resultados = {}
+    for nome in args.cenarios or list(CENARIOS):
+        print(f"⏱️ {nome} ({args.tamanho})...", flush=True)
+        resultados[nome] = executa_cenario(nome, args.tamanho, args.pasta)
+
+    versao = versao_codigo()
+    agora = datetime.now()
+    relatorio = {
+        "data": agora.isoformat(timespec="seconds"),
+        "versao": versao,
+        "tamanho": args.tamanho,
+        "parametros": TAMANHOS[args.tamanho],
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "cenarios": resultados,
+    }
+    saida = args.saida or os.path.join(PASTA_RESULTADOS, f"{agora:%Y%m%d_%H%M%S}_{versao or 'sem_git'}.json")
+    os.makedirs(os.path.dirname(saida) or ".", exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+    print()
+    imprime_resultados(resultados, anteriores)
+    print(f"\nResultado salvo em '{saida}'.")
+
+if __name__ == "__main__":
+    main()
@@ -1,102 +1,698 @@
 #  BUSCA DEMANDA VESTIBULAR FATEC
 #  ESTE PROGRAMA LÊ OS DADOS DO SITE DA CESU (https://vestibular.fatec.sp.gov.br/demanda/), E FAZ UMA BUSCA DAS DEMANDAS, TODOS OS ANOS E TODAS AS UNIDADES.
 #  NO FINAL, ELE GERA UM ARQUIVO CSV COM OS DADOS (todas_fatecs_demanda.csv).
+#  CADA PAR (ano_sem, unidade) CONCLUÍDO FICA GRAVADO EM todas_fatecs_demanda.sqlite: AS PRÓXIMAS EXECUÇÕES SÓ BUSCAM
+#  OS SEMESTRES NOVOS E OS PARES QUE FALHARAM, E O CSV É REGERADO A PARTIR DESSE ARQUIVO.
+#  AS BUSCAS SÃO DISTRIBUÍDAS EM UM POOL DE NAVEGADORES (HEADLESS) QUE FICAM ABERTOS DURANTE TODA A EXECUÇÃO.
+#  COM --motor http AS BUSCAS SÃO FEITAS SEM NAVEGADOR, REPETINDO AS SUBMISSÕES DO FORMULÁRIO (TESTE OFFLINE: servidor_local_demanda.py).
+#  O SELENIUM SÓ É IMPORTADO DENTRO DAS FUNÇÕES DO MOTOR selenium: COM --motor http ELE NEM PRECISA ESTAR INSTALADO.
 #  DANIEL RODRIGUES DE SOUSA 19/06/2025
 
+import argparse
 import csv
-import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import functools
+import json
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from cronometro import Cronometro
+from sessao_http import cria_sessao
 
 url = "https://vestibular.fatec.sp.gov.br/demanda/"
+ARQUIVO_SAIDA = "todas_fatecs_demanda.csv"
+ARQUIVO_CHECKPOINT = "todas_fatecs_demanda.sqlite"  # pares (ano_sem, unidade) já buscados
+NUM_NAVEGADORES = 4  # quantidade padrão de navegadores no pool
+EXTRACAO_PADRAO = "script"  # script | html | celulas
+NUM_CONEXOES = 16  # requisições simultâneas no motor http
+TENTATIVAS_NAVEGADOR = 2  # vezes que uma tarefa é tentada quando o navegador cai no meio dela
 
-# Inicializa navegador para pegar anos disponíveis
+CRONOMETRO = Cronometro()  # tempos de cada etapa, relatório no final da execução
 
-# Abre navegador apenas para obter os anos
-try:
-    driver = webdriver.Chrome()
-    wait = WebDriverWait(driver, 10)
-    driver.get(url)
+CABECALHO = ["Ano", "Semestre", "Unidade", "Curso", "Período", "Inscritos", "Vagas", "Demanda"]
+
+# ======================================================
+# POOL DE NAVEGADORES
+# ======================================================
+def cria_driver(headless=True):
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    with CRONOMETRO.etapa("inicio_driver"):
+        return webdriver.Chrome(options=options)
+
+def abre_pool(quantidade, headless=True):
+    # Abre os navegadores em paralelo: a partida a frio do Chrome é a etapa mais lenta
+    drivers = [None] * quantidade
+
+    def abre(i):
+        try:
+            drivers[i] = cria_driver(headless)
+        except Exception as e:
+            print(f"[ERRO] ao abrir navegador {i + 1}: {e}")
+
+    threads = [threading.Thread(target=abre, args=(i,)) for i in range(quantidade)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    drivers = [d for d in drivers if d is not None]
+    if not drivers:
+        raise RuntimeError("Nenhum navegador pôde ser aberto.")
+    return drivers
+
+def fecha_pool(drivers):
+    for driver in drivers:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+def driver_ativo(driver):
+    # Qualquer comando falha se o Chrome caiu ou a sessão foi encerrada; um erro da página não derruba o navegador
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+def executa_no_pool(drivers, tarefas, funcao, cria=None):
+    """
+    Distribui as tarefas entre os navegadores do pool através de uma fila compartilhada.
+    Cada navegador executa funcao(driver, *tarefa) para a próxima tarefa livre.
+    Retorna a lista de resultados NA MESMA ORDEM das tarefas (None para as que falharam),
+    independente de qual navegador terminou primeiro.
+    Se o navegador cair no meio de uma tarefa, ela volta para a fila (até TENTATIVAS_NAVEGADOR vezes) e o navegador
+    é trocado por um novo (cria()); sem cria, ou se não abrir, aquela thread para e as outras continuam a fila.
+    """
+    fila = queue.Queue()
+    for indice, tarefa in enumerate(tarefas):
+        fila.put((indice, tarefa, 1))
+
+    resultados = [None] * len(tarefas)
+
+    def trabalhador(posicao):
+        while True:
+            try:
+                indice, tarefa, tentativa = fila.get_nowait()
+            except queue.Empty:
+                return
+            rotulo = " - ".join(str(t) for t in tarefa)
+            try:
+                resultados[indice] = funcao(drivers[posicao], *tarefa)
+                continue
+            except Exception as e:
+                if driver_ativo(drivers[posicao]):
+                    print(f"[ERRO] {rotulo}: {e}")
+                    continue
+                print(f"[ERRO] navegador {posicao + 1} caiu em {rotulo}: {e}")
+                if tentativa < TENTATIVAS_NAVEGADOR:
+                    fila.put((indice, tarefa, tentativa + 1))
+
+            try:
+                drivers[posicao].quit()
+            except Exception:
+                pass
+            try:
+                if cria is None:
+                    raise RuntimeError("sem como abrir outro navegador")
+                drivers[posicao] = cria()
+            except Exception as e:
+                print(f"[ERRO] navegador {posicao + 1} não foi reaberto ({e}); as tarefas seguem nos demais.")
+                return
+
+    threads = [threading.Thread(target=trabalhador, args=(i,)) for i in range(len(drivers))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return resultados
 
-    select_ano_elem = wait.until(EC.presence_of_element_located((By.NAME, "ano-sem")))
+# ======================================================
+# ETAPAS DA BUSCA (CADA UMA VOLTA O NAVEGADOR PARA A URL DA DEMANDA)
+# ======================================================
+def tabela_atualizada(elemento_antigo, linhas_antes):
+    """
+    Condição de espera: a tabela de resultado está pronta quando o elemento antigo
+    (da página antes do envio) ficou obsoleto — a página foi recarregada — ou, se a
+    página for atualizada sem recarregar, quando a quantidade de linhas da tabela mudou.
+    """
+    from selenium.common.exceptions import StaleElementReferenceException
+    from selenium.webdriver.common.by import By
+
+    def condicao(driver):
+        try:
+            elemento_antigo.is_enabled()
+            recarregou = False
+        except StaleElementReferenceException:
+            recarregou = True
+
+        tabelas = driver.find_elements(By.CSS_SELECTOR, "table.table-striped")
+        if not tabelas:
+            return False
+        if recarregou:
+            return tabelas[0]
+        linhas = driver.execute_script("return arguments[0].rows.length;", tabelas[0])
+        return tabelas[0] if linhas != linhas_antes else False
+    return condicao
+
+def seleciona_ano_sem(driver, wait, ano_sem, url=url):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import Select
+
+    with CRONOMETRO.etapa("carrega_pagina", ano_sem):
+        driver.get(url)
+        select_ano = Select(wait.until(EC.presence_of_element_located((By.NAME, "ano-sem"))))
+
+    with CRONOMETRO.etapa("submete_ano_sem", ano_sem):
+        select_ano.select_by_value(ano_sem)
+
+        btn_exibir = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.btn.btn-primary[type='send']")))
+        driver.execute_script("arguments[0].click();", btn_exibir)
+
+        return Select(wait.until(EC.presence_of_element_located((By.ID, "FATEC"))))
+
+def busca_anos(driver, url=url):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import Select, WebDriverWait
+
+    wait = WebDriverWait(driver, 10)
+    with CRONOMETRO.etapa("carrega_pagina"):
+        driver.get(url)
+        select_ano_elem = wait.until(EC.presence_of_element_located((By.NAME, "ano-sem")))
     select_ano = Select(select_ano_elem)
     anos_semestral = [opt.get_attribute("value") for opt in select_ano.options if opt.get_attribute("value")]
     del anos_semestral[0]  # Remove "Selecione..."
-    driver.quit()
-except Exception as e:
-    print(f"[ERRO] ao busca o ano_sem para: {e}")
+    return anos_semestral
+
+def busca_unidades(driver, ano_sem, url=url):
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    wait = WebDriverWait(driver, 10)
+    select_fatec = seleciona_ano_sem(driver, wait, ano_sem, url)
+    return [o.get_attribute("value") for o in select_fatec.options if o.get_attribute("value")]
+
+def busca_demanda_unidade(driver, ano_sem, unidade, extracao=EXTRACAO_PADRAO, url=url):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    wait = WebDriverWait(driver, 10)
+    ano = ano_sem[:4]
+    semestre = ano_sem[4]
+    unidade_upper = unidade.upper()
+
+    rotulo = f"{ano_sem} - {unidade_upper}"
+
+    select_fatec = seleciona_ano_sem(driver, wait, ano_sem, url)
+
+    with CRONOMETRO.etapa("submete_unidade", rotulo):
+        select_fatec.select_by_value(unidade)
+
+        # Referências da página antes do envio, para saber quando o resultado chegou
+        elemento_antigo = driver.find_element(By.ID, "FATEC")
+        tabelas_antes = driver.find_elements(By.CSS_SELECTOR, "table.table-striped")
+        linhas_antes = driver.execute_script("return arguments[0].rows.length;", tabelas_antes[0]) if tabelas_antes else -1
+
+        btn_exibir = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.btn.btn-primary[type='send']")))
+        driver.execute_script("arguments[0].click();", btn_exibir)
+
+    with CRONOMETRO.etapa("tabela_pronta", rotulo):
+        tabela = wait.until(tabela_atualizada(elemento_antigo, linhas_antes))
+
+    with CRONOMETRO.etapa("extracao", rotulo):
+        registros = linhas_para_registros(ano, semestre, unidade, extrai_linhas_tabela(driver, tabela, extracao))
+    print(f"[OK] {ano_sem} - {unidade_upper}")
+    return registros
 
-#teste
-#anos_semestral = ["20231", "20251"]
+# ======================================================
+# EXTRAÇÃO DA TABELA DE DEMANDA
+# ======================================================
+# Lê todas as células da tabela em uma única chamada ao navegador
+JS_LINHAS_TABELA = """
+return Array.from(arguments[0].rows).slice(1).map(
+    tr => Array.from(tr.querySelectorAll('td')).map(td => td.innerText)
+);
+"""
 
+class TabelaDemandaParser(HTMLParser):
+    """Lê o HTML da tabela table-striped e guarda o texto das células <td> de cada <tr>."""
 
-with open("todas_fatecs_demanda.csv", mode="w", newline="", encoding="utf-8") as arquivo:
-    escritor = csv.writer(arquivo)
-    escritor.writerow(["Ano", "Semestre", "Unidade", "Curso", "Período", "Inscritos", "Vagas", "Demanda"])
+    def __init__(self):
+        super().__init__()
+        self.linhas = []
+        self._profundidade = 0  # > 0 enquanto estiver dentro da table-striped
+        self._linha = None
+        self._celula = None
 
-    for ano_sem in anos_semestral:
-        ano = ano_sem[:4]
-        semestre = ano_sem[4]
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            if self._profundidade:
+                self._profundidade += 1
+            elif "table-striped" in (dict(attrs).get("class") or "").split():
+                self._profundidade = 1
+        elif not self._profundidade:
+            return
+        elif tag == "tr":
+            self._linha = []
+        elif tag == "td" and self._linha is not None:
+            self._celula = []
+        elif tag == "br" and self._celula is not None:
+            self._celula.append(" ")
 
-        # Abre navegador apenas para obter as unidades válidas
+    def handle_endtag(self, tag):
+        if not self._profundidade:
+            return
+        if tag == "td" and self._celula is not None:
+            self._linha.append(" ".join("".join(self._celula).split()))
+            self._celula = None
+        elif tag == "tr" and self._linha is not None:
+            self.linhas.append(self._linha)
+            self._linha = None
+        elif tag == "table":
+            self._profundidade -= 1
+
+    def handle_data(self, data):
+        if self._celula is not None:
+            self._celula.append(data)
+
+def parse_tabela_demanda(html):
+    """Retorna as linhas (lista de textos das células) da tabela table-striped, sem o cabeçalho."""
+    parser = TabelaDemandaParser()
+    parser.feed(html)
+    parser.close()
+    return parser.linhas[1:]
+
+def extrai_linhas_tabela(driver, tabela, extracao=EXTRACAO_PADRAO):
+    """
+    Extrai as linhas da tabela (sem o cabeçalho) como listas de textos das células.
+      - script: uma única chamada execute_script devolve a tabela inteira
+      - html: lê o outerHTML uma única vez e interpreta localmente
+      - celulas: uma chamada por linha e por célula (modo antigo, bem mais lento)
+    """
+    if extracao == "script":
+        return driver.execute_script(JS_LINHAS_TABELA, tabela)
+    if extracao == "html":
+        return parse_tabela_demanda(tabela.get_attribute("outerHTML"))
+    if extracao == "celulas":
+        from selenium.webdriver.common.by import By
+
+        return [
+            [coluna.text for coluna in linha.find_elements(By.TAG_NAME, "td")]
+            for linha in tabela.find_elements(By.TAG_NAME, "tr")[1:]
+        ]
+    raise ValueError(f"Modo de extração desconhecido: {extracao}")
+
+def linhas_para_registros(ano, semestre, unidade, linhas):
+    registros = []
+    unidade_upper = unidade.upper()
+    for colunas in linhas:
+        if len(colunas) == 5:
+            curso = colunas[0].strip().upper()
+            periodo = colunas[1].strip().upper()
+            inscritos = colunas[2].strip().upper()
+            vagas = colunas[3].strip().upper()
+            demanda = colunas[4].strip().upper()
+            registros.append([ano, semestre, unidade_upper, curso, periodo, inscritos, vagas, demanda])
+    return registros
+
+# ======================================================
+# MOTOR HTTP (SEM NAVEGADOR): REPETE AS SUBMISSÕES DO FORMULÁRIO
+# ======================================================
+class FormularioParser(HTMLParser):
+    """
+    Lê os formulários da página: action, method, campos <input> e <select>.
+    Cada select guarda name, id, as opções (value) e o valor selecionado.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.formularios = []
+        self._form = None
+        self._select = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "form":
+            self._form = {
+                "action": attrs.get("action") or "",
+                "method": (attrs.get("method") or "get").lower(),
+                "campos": {},
+                "selects": [],
+            }
+            self.formularios.append(self._form)
+        elif self._form is None:
+            return
+        elif tag == "input" and attrs.get("name"):
+            if attrs.get("type", "text").lower() in ("checkbox", "radio") and "checked" not in attrs:
+                return
+            if attrs.get("type", "text").lower() not in ("submit", "button", "image", "reset"):
+                self._form["campos"][attrs["name"]] = attrs.get("value") or ""
+        elif tag == "select":
+            self._select = {"name": attrs.get("name"), "id": attrs.get("id"), "opcoes": [], "selecionado": None}
+            self._form["selects"].append(self._select)
+        elif tag == "option" and self._select is not None:
+            valor = attrs.get("value") or ""
+            self._select["opcoes"].append(valor)
+            if "selected" in attrs:
+                self._select["selecionado"] = valor
+
+    def handle_endtag(self, tag):
+        if tag == "select":
+            self._select = None
+        elif tag == "form":
+            self._form = None
+
+def parse_formulario(html, name=None, id=None):
+    """Retorna (formulario, select) do primeiro formulário que tem o select com esse name/id."""
+    parser = FormularioParser()
+    parser.feed(html)
+    parser.close()
+    for formulario in parser.formularios:
+        for select in formulario["selects"]:
+            if (name and select["name"] == name) or (id and select["id"] == id):
+                return formulario, select
+    raise RuntimeError(f"Formulário com o campo '{name or id}' não encontrado na página.")
+
+def dados_formulario(formulario, **valores):
+    """Monta os dados de envio: campos fixos, selects com o valor atual e os valores informados."""
+    dados = dict(formulario["campos"])
+    for select in formulario["selects"]:
+        if select["name"]:
+            atual = select["selecionado"]
+            if atual is None and select["opcoes"]:
+                atual = select["opcoes"][0]
+            dados[select["name"]] = atual or ""
+    dados.update(valores)
+    return dados
+
+def envia_formulario(sessao, url_pagina, formulario, dados, etapa="submete", rotulo=""):
+    destino = urljoin(url_pagina, formulario["action"]) if formulario["action"] else url_pagina
+    with CRONOMETRO.etapa(etapa, rotulo):
+        if formulario["method"] == "post":
+            resposta = sessao.post(destino, data=dados, timeout=30)
+        else:
+            resposta = sessao.get(destino, params=dados, timeout=30)
+    resposta.raise_for_status()
+    return resposta
+
+def submete_ano_sem_http(sessao, url, ano_sem):
+    with CRONOMETRO.etapa("carrega_pagina", ano_sem):
+        resposta = sessao.get(url, timeout=30)
+    resposta.raise_for_status()
+    formulario, _ = parse_formulario(resposta.text, name="ano-sem")
+    return envia_formulario(sessao, resposta.url, formulario, dados_formulario(formulario, **{"ano-sem": ano_sem}),
+                            "submete_ano_sem", ano_sem)
+
+def busca_anos_http(sessao, url=url):
+    with CRONOMETRO.etapa("carrega_pagina"):
+        resposta = sessao.get(url, timeout=30)
+    resposta.raise_for_status()
+    _, select_ano = parse_formulario(resposta.text, name="ano-sem")
+    anos_semestral = [valor for valor in select_ano["opcoes"] if valor]
+    del anos_semestral[0]  # Remove "Selecione..."
+    return anos_semestral
+
+def busca_unidades_http(sessao, ano_sem, url=url):
+    resposta = submete_ano_sem_http(sessao, url, ano_sem)
+    _, select_fatec = parse_formulario(resposta.text, id="FATEC")
+    return [valor for valor in select_fatec["opcoes"] if valor]
+
+def busca_demanda_unidade_http(sessao, ano_sem, unidade, url=url):
+    resposta = submete_ano_sem_http(sessao, url, ano_sem)
+    formulario, select_fatec = parse_formulario(resposta.text, id="FATEC")
+    dados = dados_formulario(formulario, **{select_fatec["name"] or "FATEC": unidade})
+    rotulo = f"{ano_sem} - {unidade.upper()}"
+    resposta = envia_formulario(sessao, resposta.url, formulario, dados, "submete_unidade", rotulo)
+
+    with CRONOMETRO.etapa("extracao", rotulo):
+        registros = linhas_para_registros(ano_sem[:4], ano_sem[4], unidade, parse_tabela_demanda(resposta.text))
+    print(f"[OK] {ano_sem} - {unidade.upper()}")
+    return registros
+
+def executa_em_paralelo(executor, sessao, tarefas, funcao):
+    # Mesmo contrato do executa_no_pool: resultados na ordem das tarefas, None nas que falharam
+    def executa(tarefa):
         try:
-            driver = webdriver.Chrome()
-            wait = WebDriverWait(driver, 10)
-            driver.get(url)
+            return funcao(sessao, *tarefa)
+        except Exception as e:
+            print(f"[ERRO] {' - '.join(str(t) for t in tarefa)}: {e}")
+            return None
 
-            select_ano = Select(wait.until(EC.presence_of_element_located((By.NAME, "ano-sem"))))
-            select_ano.select_by_value(ano_sem)
+    return list(executor.map(executa, tarefas))
 
-            btn_exibir = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.btn.btn-primary[type='send']")))
-            driver.execute_script("arguments[0].click();", btn_exibir)
+def busca_via_http(checkpoint, url, conexoes):
+    sessao = cria_sessao(conexoes, repete_post=True)
+    with ThreadPoolExecutor(max_workers=conexoes) as executor:
+        try:
+            anos_semestral = busca_anos_http(sessao, url)
+        except Exception as e:
+            print(f"[ERRO] ao busca o ano_sem para: {e}")
+            return
 
-            select_fatec = Select(wait.until(EC.presence_of_element_located((By.ID, "FATEC"))))
-            lista_unidades = [o.get_attribute("value") for o in select_fatec.options if o.get_attribute("value")]
+        busca_pendentes(
+            checkpoint, anos_semestral,
+            lambda tarefas, funcao: executa_em_paralelo(executor, sessao, tarefas, funcao),
+            functools.partial(busca_unidades_http, url=url),
+            functools.partial(busca_demanda_unidade_http, url=url),
+        )
 
-            driver.quit()
+# ======================================================
+# MOTOR SELENIUM
+# ======================================================
+def busca_via_selenium(checkpoint, url, navegadores, headless, extracao):
+    drivers = abre_pool(max(1, navegadores), headless=headless)
+    try:
+        # Anos disponíveis
+        try:
+            anos_semestral = busca_anos(drivers[0], url)
         except Exception as e:
-            print(f"[ERRO] ao buscar unidades para {ano_sem}: {e}")
-            continue
+            print(f"[ERRO] ao busca o ano_sem para: {e}")
+            return
+
+        #teste
+        #anos_semestral = ["20231", "20251"]
 
-        # Itera sobre cada unidade para o ano atual
-        for unidade in lista_unidades:
+        busca_pendentes(
+            checkpoint, anos_semestral,
+            lambda tarefas, funcao: executa_no_pool(drivers, tarefas, funcao, lambda: cria_driver(headless)),
+            functools.partial(busca_unidades, url=url),
+            functools.partial(busca_demanda_unidade, extracao=extracao, url=url),
+        )
+    finally:
+        fecha_pool(drivers)
+
+# ======================================================
+# CHECKPOINT (SQLITE): PARES (ano_sem, unidade) JÁ CONCLUÍDOS E SUAS LINHAS
+# ======================================================
+class Checkpoint:
+    """
+    Guarda, para cada ano_sem, a lista de unidades e, para cada par (ano_sem, unidade),
+    o status da busca e as linhas extraídas. Cada par é gravado assim que termina,
+    então uma queda no meio da execução não perde o que já foi buscado.
+    """
+
+    def __init__(self, caminho):
+        self.con = sqlite3.connect(caminho, check_same_thread=False)
+        self.trava = threading.Lock()
+        with self.con:
+            self.con.executescript("""
+                CREATE TABLE IF NOT EXISTS semestres (
+                    ano_sem TEXT PRIMARY KEY,
+                    ordem INTEGER NOT NULL,
+                    unidades_conhecidas INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TABLE IF NOT EXISTS pares (
+                    ano_sem TEXT NOT NULL,
+                    unidade TEXT NOT NULL,
+                    ordem INTEGER NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pendente',
+                    atualizado_em TEXT,
+                    PRIMARY KEY (ano_sem, unidade)
+                );
+                CREATE TABLE IF NOT EXISTS linhas (
+                    ano_sem TEXT NOT NULL,
+                    unidade TEXT NOT NULL,
+                    ordem INTEGER NOT NULL,
+                    registro TEXT NOT NULL,
+                    PRIMARY KEY (ano_sem, unidade, ordem)
+                );
+            """)
+
+    def fecha(self):
+        self.con.close()
+
+    def recomeca(self):
+        with self.trava, self.con:
+            self.con.executescript("DELETE FROM linhas; DELETE FROM pares; DELETE FROM semestres;")
+
+    def descarta_semestre(self, ano_sem):
+        # Força nova busca das unidades e de todos os pares do ano_sem
+        with self.trava, self.con:
+            self.con.execute("DELETE FROM linhas WHERE ano_sem = ?", (ano_sem,))
+            self.con.execute("DELETE FROM pares WHERE ano_sem = ?", (ano_sem,))
+            self.con.execute("UPDATE semestres SET unidades_conhecidas = 0 WHERE ano_sem = ?", (ano_sem,))
+
+    def registra_semestres(self, anos_semestral):
+        with self.trava, self.con:
+            for ordem, ano_sem in enumerate(anos_semestral):
+                self.con.execute(
+                    "INSERT INTO semestres (ano_sem, ordem) VALUES (?, ?) "
+                    "ON CONFLICT(ano_sem) DO UPDATE SET ordem = excluded.ordem",
+                    (ano_sem, ordem),
+                )
+
+    def semestres_sem_unidades(self):
+        return [ano_sem for (ano_sem,) in self.con.execute(
+            "SELECT ano_sem FROM semestres WHERE unidades_conhecidas = 0 ORDER BY ordem")]
+
+    def registra_unidades(self, ano_sem, unidades):
+        with self.trava, self.con:
+            for ordem, unidade in enumerate(unidades):
+                self.con.execute(
+                    "INSERT INTO pares (ano_sem, unidade, ordem) VALUES (?, ?, ?) "
+                    "ON CONFLICT(ano_sem, unidade) DO UPDATE SET ordem = excluded.ordem",
+                    (ano_sem, unidade, ordem),
+                )
+            self.con.execute("UPDATE semestres SET unidades_conhecidas = 1 WHERE ano_sem = ?", (ano_sem,))
+
+    def pares_pendentes(self):
+        return self.con.execute(
+            "SELECT p.ano_sem, p.unidade FROM pares p JOIN semestres s ON s.ano_sem = p.ano_sem "
+            "WHERE p.status <> 'ok' ORDER BY s.ordem, p.ordem"
+        ).fetchall()
+
+    def salva_par(self, ano_sem, unidade, registros):
+        agora = datetime.now().isoformat(timespec="seconds")
+        with self.trava, self.con:
+            self.con.execute("DELETE FROM linhas WHERE ano_sem = ? AND unidade = ?", (ano_sem, unidade))
+            self.con.executemany(
+                "INSERT INTO linhas (ano_sem, unidade, ordem, registro) VALUES (?, ?, ?, ?)",
+                [(ano_sem, unidade, ordem, json.dumps(registro, ensure_ascii=False))
+                 for ordem, registro in enumerate(registros)],
+            )
+            self.con.execute("UPDATE pares SET status = 'ok', atualizado_em = ? WHERE ano_sem = ? AND unidade = ?",
+                             (agora, ano_sem, unidade))
+
+    def marca_erro(self, ano_sem, unidade):
+        agora = datetime.now().isoformat(timespec="seconds")
+        with self.trava, self.con:
+            self.con.execute("UPDATE pares SET status = 'erro', atualizado_em = ? WHERE ano_sem = ? AND unidade = ?",
+                             (agora, ano_sem, unidade))
+
+    def salvando(self, funcao):
+        """Envolve funcao(contexto, ano_sem, unidade) para gravar o resultado (ou o erro) no checkpoint."""
+        def executa(contexto, ano_sem, unidade):
             try:
-                driver = webdriver.Chrome()
-                wait = WebDriverWait(driver, 10)
-                driver.get(url)
-
-                select_ano = Select(wait.until(EC.presence_of_element_located((By.NAME, "ano-sem"))))
-                select_ano.select_by_value(ano_sem)
-
-                btn_exibir = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.btn.btn-primary[type='send']")))
-                driver.execute_script("arguments[0].click();", btn_exibir)
-
-                select_fatec = Select(wait.until(EC.presence_of_element_located((By.ID, "FATEC"))))
-                select_fatec.select_by_value(unidade)
-
-                btn_exibir = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.btn.btn-primary[type='send']")))
-                driver.execute_script("arguments[0].click();", btn_exibir)
-                time.sleep(2)
-
-                tabela = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "table.table-striped")))
-                linhas = tabela.find_elements(By.TAG_NAME, "tr")[1:]
-
-                for linha in linhas:
-                    colunas = linha.find_elements(By.TAG_NAME, "td")
-                    if len(colunas) == 5:
-                        curso = colunas[0].text.strip().upper()
-                        periodo = colunas[1].text.strip().upper()
-                        inscritos = colunas[2].text.strip().upper()
-                        vagas = colunas[3].text.strip().upper()
-                        demanda = colunas[4].text.strip().upper()
-                        unidade_upper = unidade.upper()
-                        escritor.writerow([ano, semestre, unidade_upper, curso, periodo, inscritos, vagas, demanda])
-                print(f"[OK] {ano_sem} - {unidade_upper}")
-            except Exception as e:
-                print(f"[ERRO] {ano_sem} - {unidade_upper}: {e}")
-            finally:
-                driver.quit()
+                registros = funcao(contexto, ano_sem, unidade)
+            except Exception:
+                self.marca_erro(ano_sem, unidade)
+                raise
+            self.salva_par(ano_sem, unidade, registros)
+            return registros
+        return executa
+
+    def resumo(self):
+        return dict(self.con.execute("SELECT status, COUNT(*) FROM pares GROUP BY status").fetchall())
+
+    def exporta_csv(self, caminho):
+        # Ordem fixa: ano_sem na ordem do site, unidades na ordem do select, linhas na ordem da tabela
+        cursor = self.con.execute(
+            "SELECT l.registro FROM linhas l "
+            "JOIN pares p ON p.ano_sem = l.ano_sem AND p.unidade = l.unidade "
+            "JOIN semestres s ON s.ano_sem = l.ano_sem "
+            "WHERE p.status = 'ok' ORDER BY s.ordem, p.ordem, l.ordem"
+        )
+        with open(caminho, mode="w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(CABECALHO)
+            for (registro,) in cursor:
+                escritor.writerow(json.loads(registro))
+
+def busca_pendentes(checkpoint, anos_semestral, executa, busca_unidades_fn, busca_demanda_fn):
+    """
+    Busca só o que falta: as unidades dos ano_sem novos (ou que falharam antes)
+    e os pares (ano_sem, unidade) ainda não concluídos.
+    executa(tarefas, funcao) é o executor do motor (pool de navegadores ou de conexões).
+    """
+    checkpoint.registra_semestres(anos_semestral)
+
+    # Unidades válidas de cada ano_sem novo
+    novos = checkpoint.semestres_sem_unidades()
+    unidades_por_ano = executa([(ano_sem,) for ano_sem in novos], busca_unidades_fn)
+    for ano_sem, lista_unidades in zip(novos, unidades_por_ano):
+        if lista_unidades is not None:
+            checkpoint.registra_unidades(ano_sem, lista_unidades)
+
+    # Demanda de cada (ano_sem, unidade) pendente
+    tarefas = checkpoint.pares_pendentes()
+    print(f"{len(tarefas)} par(es) (ano_sem, unidade) a buscar.")
+    executa(tarefas, checkpoint.salvando(busca_demanda_fn))
+
+# ======================================================
+# PROGRAMA PRINCIPAL
+# ======================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Busca as demandas do vestibular de todas as Fatecs.")
+    parser.add_argument("--motor", choices=["selenium", "http"], default="selenium",
+                        help="selenium (navegador) ou http (repete o formulário direto, bem mais rápido)")
+    parser.add_argument("--url", default=url,
+                        help="endereço da página de demanda (ex.: servidor local do servidor_local_demanda.py)")
+    parser.add_argument("--conexoes", type=int, default=NUM_CONEXOES,
+                        help=f"requisições simultâneas no motor http (padrão: {NUM_CONEXOES})")
+    parser.add_argument("--navegadores", type=int, default=NUM_NAVEGADORES,
+                        help=f"quantidade de navegadores no pool (padrão: {NUM_NAVEGADORES})")
+    parser.add_argument("--com-janela", action="store_true",
+                        help="abre os navegadores com janela (sem headless)")
+    parser.add_argument("--extracao", choices=["script", "html", "celulas"], default=EXTRACAO_PADRAO,
+                        help=f"como ler a tabela de demanda (padrão: {EXTRACAO_PADRAO})")
+    parser.add_argument("--checkpoint", default=ARQUIVO_CHECKPOINT,
+                        help=f"arquivo SQLite com os pares já buscados (padrão: {ARQUIVO_CHECKPOINT})")
+    parser.add_argument("--atualizar", nargs="+", default=[], metavar="ANO_SEM",
+                        help="busca de novo esses ano_sem, mesmo que já concluídos (ex.: 20252)")
+    parser.add_argument("--recomecar", action="store_true",
+                        help="descarta o checkpoint e busca tudo do zero")
+    parser.add_argument("--tempos", metavar="ARQUIVO_JSON",
+                        help="grava os tempos de cada etapa (registros e resumo) nesse arquivo")
+    args = parser.parse_args(argv)
+
+    checkpoint = Checkpoint(args.checkpoint)
+    try:
+        if args.recomecar:
+            checkpoint.recomeca()
+        for ano_sem in args.atualizar:
+            checkpoint.descarta_semestre(ano_sem)
+
+        if args.motor == "http":
+            busca_via_http(checkpoint, args.url, max(1, args.conexoes))
+        else:
+            busca_via_selenium(checkpoint, args.url, args.navegadores, not args.com_janela, args.extracao)
+
+        # O CSV é sempre gerado a partir do checkpoint
+        checkpoint.exporta_csv(ARQUIVO_SAIDA)
+        resumo = checkpoint.resumo()
+    finally:
+        checkpoint.fecha()
+
+    if resumo.get("erro") or resumo.get("pendente"):
+        print(f"[AVISO] {resumo.get('erro', 0)} par(es) com erro e {resumo.get('pendente', 0)} pendente(s): "
+              "rode de novo para buscar só o que faltou.")
+    print(f"Extração completa. Dados salvos em '{ARQUIVO_SAIDA}'.")
+
+    print("\nTempo por etapa:")
+    print(CRONOMETRO.relatorio())
+    if args.tempos:
+        CRONOMETRO.salva_json(args.tempos)
 
-print("Extração completa. Dados salvos em 'todas_fatecs_demanda.csv'.")
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,71 @@
 #  BUSCA EDITAL CESU
 #  ESTE PROGRAMA LÊ OS DADOS DO SITE DA CESU (https://cgesg.cps.sp.gov.br/editais-cgesg/), POSSIBILITANDO A FILTRAGEM DOS DADOS.
 #  NO FINAL, ELE GERA UM ARQUIVO EM PDF COM OS EDITAIS DE INTERESSE (editais.pdf).
+#  COM --perfis perfis.json, BAIXA E LÊ O CSV UMA VEZ E GERA UM PDF POR PERFIL DE FILTRO, EM PARALELO.
+#  CADA EXECUÇÃO ATUALIZA A BASE LOCAL editais_cgesg.sqlite (base_editais.py); COM --delta, OS PDFs TRAZEM
+#  SÓ OS EDITAIS NOVOS OU ALTERADOS DESDE A EXECUÇÃO ANTERIOR.
+#  COM --documentos, TAMBÉM BAIXA (EM PARALELO, COM CACHE) O EDITAL, A FICHA E A TABELA DOS EDITAIS FILTRADOS.
 #  DANIEL RODRIGUES DE SOUSA 19/03/2025
 
+import argparse
+import hashlib
+import json
 import os
+import pickle
+import shutil
 import time
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from fpdf import FPDF
-from fpdf.enums import XPos, YPos
+from fpdf.enums import MethodReturnValue, XPos, YPos
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import base_editais
+import baixa_documentos
+from cronometro import Cronometro
+from texto import nome_arquivo_seguro, normaliza_termo
+
+CRONOMETRO = Cronometro()  # tempos de cada etapa, relatório no final da execução
+
+# ======================================================
+# ESPERA O DOWNLOAD TERMINAR
+# ======================================================
+def aguarda_download(pasta, timeout=30, intervalo=0.2):
+    """
+    Espera até existir um .csv completo na pasta: sem arquivos parciais do Chrome
+    (.crdownload/.tmp) e com o tamanho estável entre duas verificações seguidas.
+    Retorna o caminho do arquivo.
+    """
+    limite = time.time() + timeout
+    anterior = None
+    while time.time() < limite:
+        arquivos = os.listdir(pasta)
+        parciais = [f for f in arquivos if f.endswith((".crdownload", ".tmp"))]
+        csvs = [f for f in arquivos if f.endswith(".csv")]
+        if csvs and not parciais:
+            caminho = os.path.join(pasta, csvs[0])
+            tamanho = os.path.getsize(caminho)
+            if tamanho > 0 and (caminho, tamanho) == anterior:
+                return caminho
+            anterior = (caminho, tamanho)
+        else:
+            anterior = None
+        time.sleep(intervalo)
+
+    raise RuntimeError("CSV não foi baixado.")
 
 # ======================================================
 # DOWNLOAD DO CSV DA CGESG (COM PASTA TEMPORÁRIA)
 # ======================================================
 def baixar_csv_cgesg():
+    # O Selenium só é carregado aqui: com o CSV em cache (--ttl-horas), a execução nem inicia o navegador
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     URL = "https://cgesg.cps.sp.gov.br/editais-cgesg/"
 
     temp_dir = tempfile.TemporaryDirectory()
@@ -31,33 +77,23 @@ def baixar_csv_cgesg():
         "directory_upgrade": True
     })
 
-    driver = webdriver.Chrome(options=options)
+    with CRONOMETRO.etapa("inicio_driver"):
+        driver = webdriver.Chrome(options=options)
     wait = WebDriverWait(driver, 30)
 
     try:
-        driver.get(URL)
-        time.sleep(5)  # Aguarda JS
-
-        botao = wait.until(
-            EC.element_to_be_clickable(
-                (By.XPATH, "//button[normalize-space()='Download CSV (Excell)']")
+        # O botão só fica clicável depois que o JS da página monta a tabela
+        with CRONOMETRO.etapa("carrega_pagina"):
+            driver.get(URL)
+            botao = wait.until(
+                EC.element_to_be_clickable(
+                    (By.XPATH, "//button[normalize-space()='Download CSV (Excell)']")
+                )
             )
-        )
-
-        driver.execute_script("arguments[0].click();", botao)
 
-        timeout = time.time() + 30
-        while time.time() < timeout:
-            arquivos = [
-                f for f in os.listdir(temp_dir.name)
-                if f.endswith(".csv") and not f.endswith(".crdownload")
-            ]
-            if arquivos:
-                return os.path.join(temp_dir.name, arquivos[0]), temp_dir
-
-            time.sleep(1)
-
-        raise RuntimeError("CSV não foi baixado.")
+        with CRONOMETRO.etapa("download"):
+            driver.execute_script("arguments[0].click();", botao)
+            return aguarda_download(temp_dir.name, timeout=30), temp_dir
 
     except Exception:
         temp_dir.cleanup()
@@ -67,28 +103,9 @@ def baixar_csv_cgesg():
         driver.quit()
 
 # ======================================================
-# FILTRO FLEXÍVEL (SUPORTA CAMPOS MULTI-VALOR)
-# ======================================================
-def aplicar_filtro(df, coluna, vetor):
-    if not vetor:
-        return pd.Series([True] * len(df))
-
-    def corresponde(celula):
-        sub = [v.strip().lower() for v in str(celula).split(',') if v.strip()]
-        return any(v.lower().strip() in sub for v in vetor)
-
-    return df[coluna].apply(corresponde)
-
-# ======================================================
-# PROGRAMA PRINCIPAL
+# LEITURA DO CSV DA CGESG
 # ======================================================
-FONT_PATH = "DejaVuSans.ttf"
-
-print("📥 Baixando CSV da CGESG...")
-csv_path, temp_dir = baixar_csv_cgesg()
-print("✅ CSV baixado.")
-
-try:
+def le_csv_cgesg(csv_path):
     # Ler .csv com Pandas
     df = pd.read_csv(
         csv_path,
@@ -103,7 +120,7 @@ try:
         "Determinado ou indeterminado", "Período", "Data abertura",
         "Data limite", "Edital", "Ficha", "Tabela"
     ]
-       
+
     # Extrai apenas a primeira data válida do texto
     for coluna in ["Data limite", "Data abertura"]:
         df[coluna] = (
@@ -118,53 +135,199 @@ try:
             errors="coerce"
         )
 
-    # Apenas editais válidos
-    hoje = pd.to_datetime(datetime.now().date())
-    df = df[df["Data limite"] >= hoje]
-
-    # ======================
-    # FILTROS (OPCIONAIS)
-    # ======================
-    
-    # Vetores de dados que vão limitar a impressão dos editais. Filtros de busca (vazios = sem filtro)
-    # obs: se o vetor estiver vazio, imprime todos os dados da coluna 
-
-    fatec_vetor = [] # Exemplo: fatec_vetor = ["Tatuí", "Baixada Santista"]
-    curso_vetor = [] # Exemplo: curso_vetor = ["Gestão da Tecnologia da Informação", "Processos Gerenciais"]           
-    disciplina_vetor = [] # Exemplo: disciplina_vetor = ["PROJETOS DE TECNOLOGIA DA INFORMAÇÃO II", "Teoria das Organizações"]
-    area_disciplina_vetor = [] # Exemplo: area_disciplina_vetor = ["Ciência da computação", "Administração e negócios"]
-    determinado_vetor = [] # Exemplo: determinado_vetor = ["Determinado", "Indeterminado"]
-    periodo_aula_vetor = [] # Exemplo: periodo_aula_vetor = ["Noturno", "Vespertino"]    
-        
-    filtros = (
-        aplicar_filtro(df, "Fatec", fatec_vetor) &
-        aplicar_filtro(df, "Curso", curso_vetor) &
-        aplicar_filtro(df, "Disciplina", disciplina_vetor) &
-        aplicar_filtro(df, "Área da disciplina", area_disciplina_vetor) &
-        aplicar_filtro(df, "Determinado ou indeterminado", determinado_vetor) &
-        aplicar_filtro(df, "Período", periodo_aula_vetor)
-    )
-
-    df_filtrado = df[filtros]
+    return df
 
-    if df_filtrado.empty:
-        print("Nenhum edital encontrado com os critérios especificados.")
-        flag_edital = False
+# ======================================================
+# CACHE LOCAL DO CSV (TTL + HASH DO CONTEÚDO)
+# ======================================================
+PASTA_CACHE = "cache_cgesg"
+TTL_HORAS = 6  # dentro desse prazo, o CSV em cache é usado sem abrir o navegador
+
+def hash_arquivo(caminho):
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def obtem_editais(ttl_horas=TTL_HORAS, forcar_download=False, pasta_cache=PASTA_CACHE):
+    """
+    Retorna o DataFrame dos editais (com as datas já convertidas) usando o cache local:
+      - CSV baixado há menos de ttl_horas: não abre o navegador
+      - CSV baixado de novo com o mesmo conteúdo (mesmo SHA-256): não interpreta de novo,
+        usa o snapshot já convertido (pickle)
+    """
+    os.makedirs(pasta_cache, exist_ok=True)
+    csv_cache = os.path.join(pasta_cache, "editais_cgesg.csv")
+    snapshot = os.path.join(pasta_cache, "editais_cgesg.pkl")
+    caminho_meta = os.path.join(pasta_cache, "meta.json")
+
+    meta = {}
+    if os.path.exists(caminho_meta):
+        with open(caminho_meta, encoding="utf-8") as arquivo:
+            meta = json.load(arquivo)
+
+    idade = time.time() - meta.get("baixado_em", 0)
+    if not forcar_download and os.path.exists(csv_cache) and idade < ttl_horas * 3600:
+        print(f"📦 Usando o CSV em cache (baixado há {idade / 60:.0f} min).")
     else:
-        flag_edital = True
+        print("📥 Baixando CSV da CGESG...")
+        csv_path, temp_dir = baixar_csv_cgesg()
+        try:
+            shutil.copyfile(csv_path, csv_cache + ".tmp")
+            os.replace(csv_cache + ".tmp", csv_cache)
+        finally:
+            # Limpeza automática da pasta temporária
+            temp_dir.cleanup()
+        meta["baixado_em"] = time.time()
+        meta["sha256"] = hash_arquivo(csv_cache)
+        print("✅ CSV baixado.")
+
+    if meta.get("sha256") is None:
+        meta["sha256"] = hash_arquivo(csv_cache)
+
+    with CRONOMETRO.etapa("leitura_csv"):
+        df = None
+        if meta.get("snapshot_sha256") == meta["sha256"] and os.path.exists(snapshot):
+            try:
+                df = pd.read_pickle(snapshot)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError) as e:
+                # Snapshot corrompido ou gravado por outra versão do pandas: interpreta o CSV de novo
+                print(f"[AVISO] snapshot '{snapshot}' ilegível ({type(e).__name__}: {e}); lendo o CSV de novo.")
+        if df is None:
+            df = le_csv_cgesg(csv_cache)
+            df.to_pickle(snapshot)
+            meta["snapshot_sha256"] = meta["sha256"]
+
+    with open(caminho_meta, "w", encoding="utf-8") as arquivo:
+        json.dump(meta, arquivo, indent=2)
+
+    df.attrs["sha256"] = meta["sha256"]  # usado pela base local para pular snapshots repetidos
+    return df
+
+# ======================================================
+# ÍNDICE DOS FILTROS (TERMO -> LINHAS)
+# ======================================================
+COLUNAS_FILTRO = [
+    "Fatec", "Curso", "Disciplina", "Área da disciplina",
+    "Determinado ou indeterminado", "Período"
+]
+
+def constroi_indice(df, colunas=COLUNAS_FILTRO):
+    """
+    Índice invertido montado uma vez depois da leitura: para cada coluna,
+    termo normalizado (sem acentos, minúsculo) -> posições das linhas que o contêm.
+    Campos multi-valor são separados por vírgula.
+    """
+    indice = {}
+    for coluna in colunas:
+        partes = df[coluna].reset_index(drop=True).dropna().astype(str).str.split(",").explode()
+        partes = partes[partes.str.strip() != ""]
+
+        # Normaliza uma vez por valor distinto
+        codigos, unicos = pd.factorize(partes)
+        termos = np.array([normaliza_termo(valor) for valor in unicos], dtype=object).take(codigos)
+
+        pares = pd.DataFrame({"termo": termos, "posicao": partes.index.to_numpy()}).drop_duplicates()
+        indice[coluna] = {termo: grupo.to_numpy() for termo, grupo in pares.groupby("termo")["posicao"]}
+    return indice
+
+# ======================================================
+# FILTRO FLEXÍVEL (SUPORTA CAMPOS MULTI-VALOR)
+# ======================================================
+def aplicar_filtro(df, coluna, vetor, indice=None):
+    """
+    Máscara das linhas em que algum valor do vetor aparece na coluna (sem diferença de acentos e maiúsculas).
+    Com o índice da constroi_indice (do mesmo df), é só uma consulta por termo.
+    """
+    if not vetor:
+        return pd.Series(True, index=df.index)
+
+    if indice is None or coluna not in indice:
+        indice = constroi_indice(df, [coluna])
+
+    mascara = np.zeros(len(df), dtype=bool)
+    for valor in vetor:
+        posicoes = indice[coluna].get(normaliza_termo(valor))
+        if posicoes is not None:
+            mascara[posicoes] = True
+    return pd.Series(mascara, index=df.index)
+
+# ======================================================
+# GERAÇÃO DO PDF
+# ======================================================
+FONT_PATH = "DejaVuSans.ttf"
+
+ALTURA_LINHA = 6
+COR_FUNDO = (240, 240, 240)  # cinza claro
+COR_BORDA = (200, 200, 200)
+COR_TEXTO = (0, 0, 0)
+COR_LINK = (0, 0, 255)
+
+# Colunas usadas no bloco de cada edital, na ordem em que são lidas pelo laço
+COLUNAS_PDF = [
+    "Edital No", "Fatec", "Curso", "Disciplina", "Período", "Determinado ou indeterminado",
+    "Abertura", "Encerramento", "Área da disciplina", "Edital", "Ficha", "Tabela",
+]
+
+def formata_data(serie):
+    # Tratamento seguro para datas, de uma vez para a coluna inteira
+    return serie.dt.strftime("%d/%m/%Y").fillna("---")
+
+def colunas_pdf(df_filtrado):
+    """Colunas do PDF já como texto (datas formatadas), para o laço ler tuplas simples em vez de Series."""
+    return df_filtrado.assign(
+        **{
+            "Abertura": formata_data(df_filtrado["Data abertura"]),
+            "Encerramento": formata_data(df_filtrado["Data limite"]),
+        }
+    )[COLUNAS_PDF].astype(str)
+
+def quebra_linhas(pdf, texto, largura, larguras):
+    """
+    Quebra o texto em linhas de até `largura` (quebra nos espaços e em cada "\n", como o multi_cell).
+    `larguras` guarda a largura de cada palavra já medida: os termos se repetem muito entre editais.
+    Retorna None se alguma palavra sozinha não couber na linha (aí o multi_cell cuida da quebra no meio dela).
+    """
+    if " " not in larguras:
+        larguras[" "] = pdf.get_string_width(" ")
+    espaco = larguras[" "]
+
+    linhas = []
+    for paragrafo in texto.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        atual = []
+        ocupado = 0.0
+        for palavra in paragrafo.split(" "):
+            if palavra not in larguras:
+                larguras[palavra] = pdf.get_string_width(palavra)
+            largura_palavra = larguras[palavra]
+            if largura_palavra > largura:
+                return None
+            extra = largura_palavra + (espaco if atual else 0.0)
+            if atual and ocupado + extra > largura:
+                linhas.append(" ".join(atual))
+                atual, ocupado = [palavra], largura_palavra
+            else:
+                atual.append(palavra)
+                ocupado += extra
+        linhas.append(" ".join(atual))
+    return linhas
+
+def gera_pdf_editais(df_filtrado, caminho_saida="editais.pdf", font_path=FONT_PATH):
+    flag_edital = not df_filtrado.empty
 
     # Gerando o PDF com os editais encontrados, caso existam
     pdf = FPDF()
     pdf.add_page()
-    pdf.add_font("DejaVu", "", FONT_PATH)
+    pdf.add_font("DejaVu", "", font_path)
     pdf.set_font("DejaVu", size=12)
 
-    # Começo do "bloco"
-    pdf.set_fill_color(240, 240, 240)  # cinza claro
-    pdf.set_draw_color(200, 200, 200)
+    # Cores de fundo e borda são as mesmas no documento inteiro: definidas uma vez só
+    pdf.set_fill_color(*COR_FUNDO)
+    pdf.set_draw_color(*COR_BORDA)
 
     # Mudando a cor do texto para azul antes de adicionar o hiperlink
-    pdf.set_text_color(0, 0, 255)
+    pdf.set_text_color(*COR_LINK)
 
     # Cabeçalho do bloco
     pdf.cell(0, 8, "https://cgesg.cps.sp.gov.br/editais-cgesg/", link='https://cgesg.cps.sp.gov.br/editais-cgesg/',
@@ -174,79 +337,312 @@ try:
              new_x=XPos.LMARGIN, new_y=YPos.NEXT, fill=True)
 
     # Resetando a cor do texto para preto
-    pdf.set_text_color(0, 0, 0)
+    pdf.set_text_color(*COR_TEXTO)
 
     # Formatando a data e hora no formato desejado
     pdf.cell(0, 8, f"Data: {datetime.now().strftime('%d/%m/%Y, %H:%M:%S')}",
              new_x=XPos.LMARGIN, new_y=YPos.NEXT, fill=True)
 
-    if flag_edital == True:
-        for _, edital in df_filtrado.iterrows():
-            
-            # Estimar altura e quebrar página se necessário
-            altura_bloco = 70  # ajuste conforme necessário
-            if pdf.get_y() + altura_bloco > pdf.page_break_trigger:
-                pdf.add_page()
-
-            # Começo do "bloco"
-            pdf.set_fill_color(240, 240, 240)  # cinza claro
-            pdf.set_draw_color(200, 200, 200)
-            pdf.cell(0, 6, "", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-
-            # Cabeçalho do bloco
-            pdf.set_text_color(0, 0, 0)
-            pdf.cell(0, 8, f"Edital Nº {edital['Edital No']} - Fatec {edital['Fatec']}",
-                     new_x=XPos.LMARGIN, new_y=YPos.NEXT, fill=True)
-
-            # Linha 1 e 2
-            pdf.cell(0, 6, f"Curso: {edital['Curso']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf.cell(0, 6, f"Disciplina: {edital['Disciplina']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            
-            # Linha 3
-            pdf.cell(100, 6, f"Período: {edital['Período']}", new_x=XPos.RIGHT, new_y=YPos.TOP)
-            pdf.cell(0, 6, f"Tipo: {edital['Determinado ou indeterminado']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-
-            # Tratamento seguro para datas
-            data_abertura = edital['Data abertura'].strftime('%d/%m/%Y') if pd.notnull(edital['Data abertura']) else "---"
-            data_limite = edital['Data limite'].strftime('%d/%m/%Y') if pd.notnull(edital['Data limite']) else "---"
-
-            # Linha 4
-            pdf.cell(100, 6, f"Abertura: {data_abertura}", new_x=XPos.RIGHT, new_y=YPos.TOP)
-            pdf.cell(0, 6, f"Encerramento: {data_limite}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-
-            # Área e links
-            pdf.multi_cell(0, 6, f"Área(s): {edital['Área da disciplina']}")
-
-            pdf.set_text_color(0, 0, 255)
-            pdf.cell(0, 0, text="", new_x=XPos.LMARGIN, new_y=YPos.TOP)
-            pdf.cell(0, 6, "Link do Edital", link=str(edital['Edital']), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf.cell(0, 6, "Ficha de Interesse", link=str(edital['Ficha']), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf.cell(0, 6, "Tabela de Pontuação", link=str(edital['Tabela']), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-            pdf.set_text_color(0, 0, 0)
-            
-            # Espaço inferior
-            pdf.cell(0, 4, "", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-
-    else:
-        
-        # Estimar altura e quebrar página se necessário
-        altura_bloco = 70  # ajuste conforme necessário
-        if pdf.get_y() + altura_bloco > pdf.page_break_trigger:
+    if not flag_edital:
+        # Bloco vazio: espaço + cabeçalho
+        if pdf.get_y() + ALTURA_LINHA + 8 > pdf.page_break_trigger:
+            pdf.add_page()
+        pdf.cell(0, ALTURA_LINHA, "", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.cell(0, 8, "Nenhum edital encontrado com os critérios especificados.",
+                 new_x=XPos.LMARGIN, new_y=YPos.NEXT, fill=True)
+        pdf.output(caminho_saida)
+        return
+
+    # Altura fixa do bloco: espaço (6) + cabeçalho (8) + 4 linhas (6) + 3 links (6) + espaço inferior (4);
+    # só a área varia (multi_cell quebra o texto em quantas linhas forem precisas)
+    altura_fixa = ALTURA_LINHA + 8 + 4 * ALTURA_LINHA + 3 * ALTURA_LINHA + 4
+    nova_linha = {"new_x": XPos.LMARGIN, "new_y": YPos.NEXT}
+    ao_lado = {"new_x": XPos.RIGHT, "new_y": YPos.TOP}
+    largura_texto = pdf.epw - 2 * pdf.c_margin  # largura útil do multi_cell(0, ...)
+    larguras = {}
+
+    for (edital_no, fatec, curso, disciplina, periodo, tipo,
+         data_abertura, data_limite, area, link_edital, link_ficha, link_tabela) in colunas_pdf(df_filtrado).itertuples(index=False, name=None):
+
+        texto_area = f"Área(s): {area}"
+
+        # Altura real do bloco, para quebrar a página só quando o bloco não cabe.
+        # A área é quebrada em linhas aqui mesmo (bem mais barato que o multi_cell do fpdf)
+        linhas_area = quebra_linhas(pdf, texto_area, largura_texto, larguras)
+        if linhas_area is not None:
+            altura_area = len(linhas_area) * ALTURA_LINHA
+        else:
+            altura_area = pdf.multi_cell(0, ALTURA_LINHA, texto_area, dry_run=True, output=MethodReturnValue.HEIGHT)
+        if pdf.get_y() + altura_fixa + altura_area > pdf.page_break_trigger:
             pdf.add_page()
 
         # Começo do "bloco"
-        pdf.set_fill_color(240, 240, 240)  # cinza claro
-        pdf.set_draw_color(200, 200, 200)
-        pdf.cell(0, 6, "", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.cell(0, ALTURA_LINHA, "", **nova_linha)
 
         # Cabeçalho do bloco
-        pdf.set_text_color(0, 0, 0)
-        pdf.cell(0, 8, f"Nenhum edital encontrado com os critérios especificados.",
-                 new_x=XPos.LMARGIN, new_y=YPos.NEXT, fill=True)
+        pdf.cell(0, 8, f"Edital Nº {edital_no} - Fatec {fatec}", fill=True, **nova_linha)
+
+        # Linha 1 e 2
+        pdf.cell(0, ALTURA_LINHA, f"Curso: {curso}", **nova_linha)
+        pdf.cell(0, ALTURA_LINHA, f"Disciplina: {disciplina}", **nova_linha)
+
+        # Linha 3
+        pdf.cell(100, ALTURA_LINHA, f"Período: {periodo}", **ao_lado)
+        pdf.cell(0, ALTURA_LINHA, f"Tipo: {tipo}", **nova_linha)
 
-    pdf.output("editais.pdf")
-    print("✅ Arquivo 'editais.pdf' gerado com sucesso!")
+        # Linha 4
+        pdf.cell(100, ALTURA_LINHA, f"Abertura: {data_abertura}", **ao_lado)
+        pdf.cell(0, ALTURA_LINHA, f"Encerramento: {data_limite}", **nova_linha)
 
-finally:
-    # Limpeza automática da pasta temporária
-    temp_dir.cleanup()
+        # Área e links
+        if linhas_area is not None:
+            for linha in linhas_area:
+                pdf.cell(0, ALTURA_LINHA, linha, **nova_linha)
+        else:
+            pdf.multi_cell(0, ALTURA_LINHA, texto_area, **nova_linha)
+
+        pdf.set_text_color(*COR_LINK)
+        pdf.cell(0, ALTURA_LINHA, "Link do Edital", link=link_edital, **nova_linha)
+        pdf.cell(0, ALTURA_LINHA, "Ficha de Interesse", link=link_ficha, **nova_linha)
+        pdf.cell(0, ALTURA_LINHA, "Tabela de Pontuação", link=link_tabela, **nova_linha)
+        pdf.set_text_color(*COR_TEXTO)
+
+        # Espaço inferior
+        pdf.cell(0, 4, "", **nova_linha)
+
+    pdf.output(caminho_saida)
+
+# ======================================================
+# BENCHMARK DO PDF (EDITAIS SINTÉTICOS)
+# ======================================================
+def benchmark_pdf(quantidade, caminho_saida="benchmark_editais.pdf"):
+    # Mesmos editais sintéticos do benchmark.py, lidos pelo mesmo caminho do CSV real
+    from dados_sinteticos import gera_csv_cgesg
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_csv = os.path.join(pasta, "editais_cgesg.csv")
+        gera_csv_cgesg(caminho_csv, quantidade)
+        df = le_csv_cgesg(caminho_csv)
+    inicio = time.perf_counter()
+    gera_pdf_editais(df, caminho_saida)
+    segundos = time.perf_counter() - inicio
+    print(f"⏱️ {quantidade} editais sintéticos em {segundos:.2f} s "
+          f"({quantidade / segundos:.0f} editais/s) -> '{caminho_saida}'")
+    return segundos
+
+# ======================================================
+# PERFIS DE FILTRO
+# ======================================================
+# Chave do perfil -> coluna filtrada
+CAMPOS_PERFIL = {
+    "fatec": "Fatec",
+    "curso": "Curso",
+    "disciplina": "Disciplina",
+    "area": "Área da disciplina",
+    "tipo": "Determinado ou indeterminado",
+    "periodo": "Período",
+}
+
+def carrega_perfis(caminho):
+    """
+    Lê um JSON {nome_do_perfil: {"fatec": [...], "curso": [...], ...}} (ver perfis_exemplo.json).
+    Campos ausentes ou vazios = sem filtro naquela coluna.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        perfis = json.load(arquivo)
+    for nome, perfil in perfis.items():
+        desconhecidos = set(perfil) - set(CAMPOS_PERFIL)
+        if desconhecidos:
+            raise ValueError(f"Perfil '{nome}': campo(s) desconhecido(s) {sorted(desconhecidos)}; "
+                             f"use {sorted(CAMPOS_PERFIL)}.")
+    return perfis
+
+def filtra_perfil(df, indice, validos, perfil):
+    filtros = validos
+    for campo, coluna in CAMPOS_PERFIL.items():
+        filtros = filtros & aplicar_filtro(df, coluna, perfil.get(campo) or [], indice)
+    return df[filtros]
+
+def nome_arquivo_perfil(nome, sufixo=""):
+    return "editais_" + nome_arquivo_seguro(nome) + sufixo + ".pdf"
+
+def renderiza_perfil(nome, df_filtrado, caminho_saida):
+    # Executada em um processo do pool: devolve o resumo do perfil
+    inicio = time.perf_counter()
+    gera_pdf_editais(df_filtrado, caminho_saida)
+    return {"perfil": nome, "editais": len(df_filtrado), "segundos": time.perf_counter() - inicio,
+            "arquivo": caminho_saida}
+
+def gera_pdfs_perfis(perfis, filtra, pasta_saida, processos=None, sufixo=""):
+    """
+    Filtra cada perfil com filtra(perfil) -> DataFrame (rápido, no processo principal)
+    e renderiza os PDFs em paralelo em um pool de processos.
+    """
+    os.makedirs(pasta_saida, exist_ok=True)
+    resumos = []
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = {}
+        for nome, perfil in perfis.items():
+            inicio = time.perf_counter()
+            df_filtrado = filtra(perfil)
+            CRONOMETRO.registra("filtro", time.perf_counter() - inicio, nome)
+            caminho = os.path.join(pasta_saida, nome_arquivo_perfil(nome, sufixo))
+            futuros[executor.submit(renderiza_perfil, nome, df_filtrado, caminho)] = nome
+
+        for futuro in as_completed(futuros):
+            try:
+                resumo = futuro.result()
+            except Exception as e:
+                print(f"[ERRO] perfil '{futuros[futuro]}': {e}")
+                continue
+            CRONOMETRO.registra("pdf", resumo["segundos"], resumo["perfil"])
+            print(f"✅ {resumo['perfil']}: {resumo['editais']} edital(is) em {resumo['segundos']:.2f} s")
+            resumos.append(resumo)
+
+    # Resumo na ordem do arquivo de perfis
+    ordem = {nome: i for i, nome in enumerate(perfis)}
+    resumos.sort(key=lambda r: ordem[r["perfil"]])
+    pd.DataFrame(resumos, columns=["perfil", "editais", "segundos", "arquivo"]).to_csv(
+        os.path.join(pasta_saida, "resumo_perfis.csv"), index=False, encoding="utf-8")
+    return resumos
+
+# ======================================================
+# PROGRAMA PRINCIPAL
+# ======================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o PDF com os editais da CGESG de interesse.")
+    parser.add_argument("--ttl-horas", type=float, default=TTL_HORAS,
+                        help=f"usa o CSV em cache se ele tiver menos que isso (padrão: {TTL_HORAS} h)")
+    parser.add_argument("--forcar-download", action="store_true", help="ignora o cache e baixa o CSV de novo")
+    parser.add_argument("--perfis", metavar="ARQUIVO_JSON",
+                        help="gera um PDF por perfil de filtro (ver perfis_exemplo.json)")
+    parser.add_argument("--pasta-saida", default="editais_perfis",
+                        help="pasta dos PDFs gerados com --perfis (padrão: editais_perfis)")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="processos para renderizar os PDFs com --perfis (padrão: núcleos da CPU)")
+    parser.add_argument("--base", default=base_editais.ARQUIVO_BASE,
+                        help="base SQLite com o histórico dos editais, atualizada em toda execução e consultada só "
+                             f"com --delta (padrão: {base_editais.ARQUIVO_BASE})")
+    parser.add_argument("--delta", action="store_true",
+                        help="só os editais novos ou alterados desde a execução anterior (filtros como consultas na "
+                             "base SQLite; sem --delta, os filtros usam o índice em memória do CSV atual)")
+    parser.add_argument("--documentos", nargs="?", const=baixa_documentos.PASTA_DOCUMENTOS, metavar="PASTA",
+                        help="baixa Edital/Ficha/Tabela dos editais filtrados "
+                             f"(padrão da pasta: {baixa_documentos.PASTA_DOCUMENTOS})")
+    parser.add_argument("--conexoes", type=int, default=baixa_documentos.NUM_CONEXOES,
+                        help=f"downloads simultâneos com --documentos (padrão: {baixa_documentos.NUM_CONEXOES})")
+    parser.add_argument("--benchmark-pdf", type=int, metavar="N",
+                        help="só mede o tempo para gerar o PDF de N editais sintéticos (sem baixar nada)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark_pdf:
+        benchmark_pdf(args.benchmark_pdf)
+        return
+
+    # Perfis primeiro: um erro no arquivo aparece antes do download
+    perfis = carrega_perfis(args.perfis) if args.perfis else None
+
+    df = obtem_editais(args.ttl_horas, args.forcar_download)
+
+    # Base local: registra o snapshot (editais novos / alterados / vistos de novo)
+    with CRONOMETRO.etapa("base"):
+        con = base_editais.abre_base(args.base)
+        anterior_em, _ = base_editais.ultima_execucao(con)
+        contagem = base_editais.atualiza_base(con, df, df.attrs.get("sha256"))
+    if contagem is None:
+        print("🗄️ Base local: mesmo CSV da execução anterior, nada mudou.")
+    else:
+        print(f"🗄️ Base local: {contagem['novos']} novo(s), {contagem['alterados']} alterado(s), "
+              f"{contagem['iguais']} sem mudança.")
+
+    sufixo = ""
+    if args.delta:
+        # Filtros como consultas na base, limitados ao que mudou depois da execução anterior
+        # (na primeira execução, todos os editais são novos)
+        sufixo = "_novos"
+        print(f"🆕 Editais novos ou alterados desde {anterior_em or 'sempre'}.")
+
+        def filtra(perfil):
+            return base_editais.consulta_editais(con, perfil, desde=anterior_em)
+    else:
+        # Índice dos filtros, montado uma vez sobre todas as linhas do CSV atual. A base guarda também editais que já
+        # saíram do CSV (o histórico do --delta), então a lista completa sai do CSV e não dela
+        inicio = time.perf_counter()
+        indice = constroi_indice(df)
+
+        # Apenas editais válidos
+        hoje = pd.to_datetime(datetime.now().date())
+        validos = df["Data limite"] >= hoje
+        CRONOMETRO.registra("indice", time.perf_counter() - inicio)
+
+        def filtra(perfil):
+            return filtra_perfil(df, indice, validos, perfil)
+
+    # Guarda os editais filtrados de cada perfil para o download dos documentos
+    filtrados = []
+
+    def filtra_e_guarda(perfil):
+        filtrados.append(filtra(perfil))
+        return filtrados[-1]
+
+    if perfis is not None:
+        resumos = gera_pdfs_perfis(perfis, filtra_e_guarda, args.pasta_saida, args.processos, sufixo)
+
+        print("\n📊 Resumo por perfil:")
+        print(f"{'Perfil':<30} {'Editais':>8} {'Tempo (s)':>10}")
+        for resumo in resumos:
+            print(f"{resumo['perfil']:<30} {resumo['editais']:>8} {resumo['segundos']:>10.2f}")
+        print(f"✅ {len(resumos)} PDF(s) gerado(s) em '{args.pasta_saida}'.")
+    else:
+        # ======================
+        # FILTROS (OPCIONAIS)
+        # ======================
+
+        # Vetores de dados que vão limitar a impressão dos editais. Filtros de busca (vazios = sem filtro)
+        # obs: se o vetor estiver vazio, imprime todos os dados da coluna
+        # (para vários conjuntos de filtros de uma vez, use --perfis)
+
+        fatec_vetor = [] # Exemplo: fatec_vetor = ["Tatuí", "Baixada Santista"]
+        curso_vetor = [] # Exemplo: curso_vetor = ["Gestão da Tecnologia da Informação", "Processos Gerenciais"]
+        disciplina_vetor = [] # Exemplo: disciplina_vetor = ["PROJETOS DE TECNOLOGIA DA INFORMAÇÃO II", "Teoria das Organizações"]
+        area_disciplina_vetor = [] # Exemplo: area_disciplina_vetor = ["Ciência da computação", "Administração e negócios"]
+        determinado_vetor = [] # Exemplo: determinado_vetor = ["Determinado", "Indeterminado"]
+        periodo_aula_vetor = [] # Exemplo: periodo_aula_vetor = ["Noturno", "Vespertino"]
+
+        inicio = time.perf_counter()
+        df_filtrado = filtra_e_guarda({
+            "fatec": fatec_vetor,
+            "curso": curso_vetor,
+            "disciplina": disciplina_vetor,
+            "area": area_disciplina_vetor,
+            "tipo": determinado_vetor,
+            "periodo": periodo_aula_vetor,
+        })
+        CRONOMETRO.registra("filtro", time.perf_counter() - inicio)
+
+        if df_filtrado.empty:
+            print("Nenhum edital encontrado com os critérios especificados.")
+
+        caminho_saida = f"editais{sufixo}.pdf"
+        with CRONOMETRO.etapa("pdf"):
+            gera_pdf_editais(df_filtrado, caminho_saida)
+        print(f"✅ Arquivo '{caminho_saida}' gerado com sucesso!")
+
+    con.close()
+
+    if args.documentos and not filtrados:
+        print("📥 Nenhum perfil filtrado: não há documentos para baixar.")
+    elif args.documentos:
+        editais_documentos = pd.concat(filtrados).drop_duplicates(subset="Edital No")
+        print(f"📥 Baixando os documentos de {len(editais_documentos)} edital(is) em '{args.documentos}'...")
+        with CRONOMETRO.etapa("documentos"):
+            manifesto = baixa_documentos.baixa_documentos(
+                editais_documentos, args.documentos, args.conexoes, cronometro=CRONOMETRO)
+        situacoes = baixa_documentos.resume_manifesto(manifesto)
+        print("✅ Documentos: " + (", ".join(f"{n} {s}" for s, n in sorted(situacoes.items())) or "nenhum"))
+
+    print("\n⏱️ Tempo por etapa:")
+    print(CRONOMETRO.relatorio())
+
+if __name__ == "__main__":
+    main()
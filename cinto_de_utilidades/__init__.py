@@ -0,0 +1,35 @@
+#  CINTO DE UTILIDADES
+#  REÚNE AS FERRAMENTAS DO REPOSITÓRIO EM UM PACOTE IMPORTÁVEL E EM UM SÓ COMANDO (cli.py):
+#      python -m cinto_de_utilidades <demanda|normaliza|cubo|editais|imagens|qrcode> [opções do programa]
+#  OS PROGRAMAS CONTINUAM SENDO OS SCRIPTS DA RAIZ (E CONTINUAM RODANDO SOZINHOS); O PACOTE SÓ COLOCA A RAIZ NO
+#  sys.path E CARREGA CADA UM SOB DEMANDA: import cinto_de_utilidades NÃO IMPORTA NADA PESADO, E
+#  cinto_de_utilidades.qrcode_generator (por exemplo) SÓ É IMPORTADO NO PRIMEIRO ACESSO.
+#  LIMITAÇÕES (OS MÓDULOS NÃO FORAM MOVIDOS PARA DENTRO DO PACOTE):
+#    - NÃO É UM PACOTE INSTALÁVEL: NÃO HÁ pyproject NEM PONTO DE ENTRADA; USE A PARTIR DE UM CLONE DO REPOSITÓRIO
+#      (python -m cinto_de_utilidades NA RAIZ, OU COM A RAIZ NO PYTHONPATH).
+#    - IMPORTAR O PACOTE COLOCA A RAIZ DO REPOSITÓRIO NO FINAL DO sys.path, ENTÃO OS MÓDULOS DA RAIZ FICAM VISÍVEIS
+#      COMO MÓDULOS DE PRIMEIRO NÍVEL COM NOMES GENÉRICOS (texto, cronometro, base_editais, ...) PARA TODO O PROCESSO.
+#      POR FICAR NO FINAL, A RAIZ NÃO ESCONDE MÓDULOS INSTALADOS; MAS UM MÓDULO INSTALADO COM UM DESSES NOMES
+#      ESCONDE O DA RAIZ E QUEBRA A FERRAMENTA. NÃO IMPORTE O PACOTE EM UM PROGRAMA QUE TENHA MÓDULOS COM ESSES NOMES.
+
+import importlib
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.append(RAIZ)  # ver as limitações acima
+
+MODULOS = (
+    "baixa_documentos", "base_editais", "busca_demanda_vestibular_fatec", "busca_edital_CESU", "cronometro",
+    "cubo_demanda", "dados_sinteticos", "desenha_qrcode", "extrai_imagens_pdf", "indice_aliases",
+    "processa_arquivo_demanda_fatecs", "qrcode_generator", "servidor_local_demanda", "sessao_http", "texto",
+)
+
+def __getattr__(nome):
+    if nome in MODULOS:
+        return importlib.import_module(nome)
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+def __dir__():
+    return sorted(list(globals()) + list(MODULOS))
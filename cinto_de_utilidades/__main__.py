@@ -0,0 +1,3 @@
+from cinto_de_utilidades.cli import main
+
+main()
@@ -0,0 +1,134 @@
+#  CLI
+#  UM SÓ COMANDO PARA TODAS AS FERRAMENTAS. O SUBCOMANDO ESCOLHE O PROGRAMA, E O RESTO DA LINHA VAI PARA O main()
+#  DELE, COM AS MESMAS OPÇÕES DO SCRIPT ORIGINAL:
+#      python -m cinto_de_utilidades qrcode https://www.fatec.sp.gov.br
+#      python -m cinto_de_utilidades imagens documento.pdf --paginas 1-5
+#      python -m cinto_de_utilidades normaliza --help
+#  O PROGRAMA SÓ É IMPORTADO DEPOIS DE ESCOLHIDO O SUBCOMANDO, ENTÃO qrcode E imagens NÃO PAGAM PANDAS, FPDF NEM SELENIUM,
+#  E demanda SÓ CARREGA O SELENIUM SE FOR USADO O MOTOR selenium (COM --motor http, NUNCA).
+#  --verifica-inicio MEDE, EM INTERPRETADORES NOVOS, O TEMPO DE IMPORTAÇÃO DE CADA SUBCOMANDO LEVE E CONFERE QUE
+#  NENHUMA DEPENDÊNCIA PESADA FOI CARREGADA; SAI COM ERRO SE ALGUM ESTOURAR O ORÇAMENTO. NOS TESTES (tests/test_cli.py)
+#  AS DEPENDÊNCIAS PESADAS SÃO SEMPRE CONFERIDAS; O TEMPO, SÓ COM CINTO_MEDE_INICIO=1 (DEPENDE DA MÁQUINA).
+
+import argparse
+import importlib
+import json
+import subprocess
+import sys
+
+from cinto_de_utilidades import RAIZ
+
+PROG = "cinto_de_utilidades"
+
+# subcomando -> (módulo, descrição)
+SUBCOMANDOS = {
+    "demanda": ("busca_demanda_vestibular_fatec", "busca as demandas do vestibular de todas as Fatecs"),
+    "normaliza": ("processa_arquivo_demanda_fatecs", "normaliza Unidade e Período e atualiza o cubo de demanda"),
+    "cubo": ("cubo_demanda", "consultas no cubo de demanda"),
+    "editais": ("busca_edital_CESU", "gera os PDFs com os editais da CGESG de interesse"),
+    "imagens": ("extrai_imagens_pdf", "extrai as imagens de um PDF (ou de uma pasta de PDFs)"),
+    "qrcode": ("qrcode_generator", "gera QRCodes: um link só ou um lote a partir de um CSV"),
+}
+
+PESADOS = ("pandas", "selenium", "fpdf")
+
+# subcomando (None = só o pacote e a CLI) -> (orçamento de importação em ms, módulos que não podem ser carregados)
+ORCAMENTO_INICIO = {
+    None: (100, PESADOS + ("numpy", "fitz", "qrcode", "PIL", "requests")),
+    "demanda": (400, PESADOS),
+    "imagens": (400, PESADOS),
+    "qrcode": (400, PESADOS),
+}
+REPETICOES_INICIO = 3  # vale a menor medida: a primeira costuma pagar o cache de disco
+
+def carrega(subcomando):
+    return importlib.import_module(SUBCOMANDOS[subcomando][0])
+
+def executa(subcomando, argumentos):
+    modulo = carrega(subcomando)
+    # O argparse do programa usa sys.argv[0] no uso e nas mensagens de erro
+    argv_original = sys.argv
+    sys.argv = [f"{PROG} {subcomando}"] + list(argumentos)
+    try:
+        return modulo.main(argumentos)
+    finally:
+        sys.argv = argv_original
+
+# ======================================================
+# VERIFICAÇÃO DO TEMPO DE INÍCIO
+# ======================================================
+CODIGO_MEDICAO = """
+import json, sys, time
+inicio = time.perf_counter()
+from cinto_de_utilidades import cli
+subcomando = {subcomando!r}
+if subcomando:
+    cli.carrega(subcomando)
+ms = 1000 * (time.perf_counter() - inicio)
+print(json.dumps({{"ms": ms, "modulos": sorted(sys.modules)}}))
+"""
+
+def mede_inicio(subcomando):
+    """Tempo (ms) para importar a CLI e o programa do subcomando em um interpretador novo, e os módulos carregados."""
+    processo = subprocess.run(
+        [sys.executable, "-c", CODIGO_MEDICAO.format(subcomando=subcomando)],
+        capture_output=True, text=True, check=True, cwd=RAIZ)
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+def verifica_inicio(orcamentos=ORCAMENTO_INICIO, repeticoes=REPETICOES_INICIO):
+    """
+    Lista de {subcomando, ms, orcamento_ms, pesados, no_tempo, ok}, um por subcomando do orçamento.
+    ok = no_tempo e nenhum módulo pesado carregado.
+    """
+    verificacoes = []
+    for subcomando, (orcamento_ms, proibidos) in orcamentos.items():
+        medidas = [mede_inicio(subcomando) for _ in range(repeticoes)]
+        carregados = set(medidas[0]["modulos"])
+        pesados = [nome for nome in proibidos if nome in carregados]
+        ms = min(medida["ms"] for medida in medidas)
+        verificacoes.append({
+            "subcomando": subcomando or "(cli)",
+            "ms": ms,
+            "orcamento_ms": orcamento_ms,
+            "pesados": pesados,
+            "no_tempo": ms <= orcamento_ms,
+            "ok": ms <= orcamento_ms and not pesados,
+        })
+    return verificacoes
+
+def imprime_verificacao(verificacoes):
+    print(f"{'subcomando':<12} {'importação':>11} {'orçamento':>10}  situação")
+    for v in verificacoes:
+        situacao = "ok" if v["ok"] else "FALHOU"
+        if v["pesados"]:
+            situacao += f" (carregou {', '.join(v['pesados'])})"
+        print(f"{v['subcomando']:<12} {v['ms']:>8.1f} ms {v['orcamento_ms']:>7} ms  {situacao}")
+
+# ======================================================
+# MAIN
+# ======================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog=PROG, description="Ferramentas do cinto de utilidades em um só comando.",
+        epilog="subcomandos:\n" + "\n".join(f"  {nome:<11} {descricao}" for nome, (_, descricao) in SUBCOMANDOS.items())
+               + f"\n\nAs opções de cada subcomando: {PROG} <subcomando> --help",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("subcomando", nargs="?", choices=list(SUBCOMANDOS), metavar="subcomando")
+    parser.add_argument("argumentos", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    parser.add_argument("--verifica-inicio", action="store_true",
+                        help="mede o tempo de importação dos subcomandos leves e confere o orçamento")
+    args = parser.parse_args(argv)
+
+    if args.verifica_inicio:
+        verificacoes = verifica_inicio()
+        imprime_verificacao(verificacoes)
+        sys.exit(0 if all(v["ok"] for v in verificacoes) else 1)
+
+    if not args.subcomando:
+        parser.print_help()
+        sys.exit(2)
+
+    return executa(args.subcomando, args.argumentos)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#  CRONOMETRO
+#  MEDE O TEMPO DE CADA ETAPA DOS PROGRAMAS (ABRIR NAVEGADOR, CARREGAR PÁGINA, SUBMETER, TABELA PRONTA, EXTRAÇÃO, ...)
+#  E, NO FINAL, MOSTRA UM RELATÓRIO COM A DISTRIBUIÇÃO DOS TEMPOS POR ETAPA.
+#  USO:
+#      cronometro = Cronometro()
+#      with cronometro.etapa("carrega_pagina", "20251 - AMERICANA"):
+#          driver.get(url)
+#      print(cronometro.relatorio())
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+class Cronometro:
+    """Guarda um registro (etapa, rótulo, segundos) para cada etapa medida. Pode ser usado por várias threads."""
+
+    def __init__(self):
+        self.registros = []
+        self._trava = threading.Lock()
+        self._inicio = time.perf_counter()
+
+    def registra(self, etapa, segundos, rotulo=""):
+        with self._trava:
+            self.registros.append({"etapa": etapa, "rotulo": rotulo, "segundos": segundos})
+
+    @contextmanager
+    def etapa(self, etapa, rotulo=""):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registra(etapa, time.perf_counter() - inicio, rotulo)
+
+    def resumo(self):
+        """Retorna {etapa: {n, total, media, p50, p95, max}} na ordem em que as etapas apareceram."""
+        por_etapa = {}
+        with self._trava:
+            for registro in self.registros:
+                por_etapa.setdefault(registro["etapa"], []).append(registro["segundos"])
+
+        resumo = {}
+        for etapa, tempos in por_etapa.items():
+            tempos = sorted(tempos)
+            resumo[etapa] = {
+                "n": len(tempos),
+                "total": sum(tempos),
+                "media": sum(tempos) / len(tempos),
+                "p50": percentil(tempos, 50),
+                "p95": percentil(tempos, 95),
+                "max": tempos[-1],
+            }
+        return resumo
+
+    def relatorio(self):
+        resumo = self.resumo()
+        decorrido = time.perf_counter() - self._inicio
+        soma = sum(r["total"] for r in resumo.values()) or 1.0
+
+        linhas = [
+            f"{'Etapa':<20} {'n':>6} {'total (s)':>10} {'%':>6} {'média':>8} {'p50':>8} {'p95':>8} {'máx':>8}",
+            "-" * 80,
+        ]
+        for etapa, r in resumo.items():
+            linhas.append(
+                f"{etapa:<20} {r['n']:>6} {r['total']:>10.2f} {100 * r['total'] / soma:>5.1f}% "
+                f"{r['media']:>8.3f} {r['p50']:>8.3f} {r['p95']:>8.3f} {r['max']:>8.3f}"
+            )
+        linhas.append("-" * 80)
+        linhas.append(f"Tempo decorrido: {decorrido:.2f} s (o total das etapas soma o tempo de todas as threads)")
+        return "\n".join(linhas)
+
+    def salva_json(self, caminho):
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"resumo": self.resumo(), "registros": self.registros}, arquivo, ensure_ascii=False, indent=2)
+
+def percentil(valores_ordenados, p):
+    """Percentil p (0-100) por interpolação linear de uma lista já ordenada."""
+    if not valores_ordenados:
+        return 0.0
+    posicao = (len(valores_ordenados) - 1) * p / 100
+    baixo = int(posicao)
+    alto = min(baixo + 1, len(valores_ordenados) - 1)
+    return valores_ordenados[baixo] + (valores_ordenados[alto] - valores_ordenados[baixo]) * (posicao - baixo)
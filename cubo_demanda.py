@@ -0,0 +1,233 @@
+#  CUBO DEMANDA
+#  AGREGADOS PRÉ-CALCULADOS DA DEMANDA DO VESTIBULAR (SQLITE), MANTIDOS PELO processa_arquivo_demanda_fatecs.py:
+#      fatos         -> (Ano, Semestre, Unidade, Curso, Período) com Inscritos e Vagas somados
+#      por_unidade, por_curso, por_periodo, por_semestre -> totais de cada semestre por unidade, curso, período e geral
+#  CADA SEMESTRE GUARDA UM HASH DOS SEUS AGREGADOS: NUMA NOVA EXECUÇÃO, SÓ OS SEMESTRES NOVOS OU ALTERADOS SÃO
+#  REGRAVADOS, E SEMESTRES QUE NÃO ESTÃO NA ENTRADA CONTINUAM NO CUBO (DÁ PARA PROCESSAR SÓ O SEMESTRE NOVO).
+#  AS CONSULTAS (tendencia_unidade, top_cursos, demanda_por_periodo) LEEM SÓ OS AGREGADOS, NUNCA AS LINHAS ORIGINAIS:
+#      python cubo_demanda.py tendencia "FATEC AMERICANA - MINISTRO RALPH BIASI"
+#      python cubo_demanda.py top 2025 1 --criterio demanda
+#      python cubo_demanda.py periodos --ano 2025 --semestre 1
+
+import argparse
+import hashlib
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+ARQUIVO_CUBO = "demanda_cubo.sqlite"
+DIMENSOES = ["Ano", "Semestre", "Unidade", "Curso", "Período"]
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS fatos (
+    ano INTEGER NOT NULL, semestre INTEGER NOT NULL,
+    unidade TEXT NOT NULL, curso TEXT NOT NULL, periodo TEXT NOT NULL,
+    inscritos INTEGER NOT NULL, vagas INTEGER NOT NULL, linhas INTEGER NOT NULL,
+    PRIMARY KEY (ano, semestre, unidade, curso, periodo)
+);
+CREATE INDEX IF NOT EXISTS idx_fatos_unidade ON fatos (unidade);
+
+CREATE TABLE IF NOT EXISTS por_unidade (
+    ano INTEGER NOT NULL, semestre INTEGER NOT NULL, unidade TEXT NOT NULL,
+    inscritos INTEGER NOT NULL, vagas INTEGER NOT NULL, cursos INTEGER NOT NULL,
+    PRIMARY KEY (unidade, ano, semestre)
+);
+CREATE TABLE IF NOT EXISTS por_curso (
+    ano INTEGER NOT NULL, semestre INTEGER NOT NULL, curso TEXT NOT NULL,
+    inscritos INTEGER NOT NULL, vagas INTEGER NOT NULL, unidades INTEGER NOT NULL,
+    PRIMARY KEY (ano, semestre, curso)
+);
+CREATE TABLE IF NOT EXISTS por_periodo (
+    ano INTEGER NOT NULL, semestre INTEGER NOT NULL, periodo TEXT NOT NULL,
+    inscritos INTEGER NOT NULL, vagas INTEGER NOT NULL,
+    PRIMARY KEY (ano, semestre, periodo)
+);
+CREATE TABLE IF NOT EXISTS por_semestre (
+    ano INTEGER NOT NULL, semestre INTEGER NOT NULL,
+    inscritos INTEGER NOT NULL, vagas INTEGER NOT NULL, unidades INTEGER NOT NULL, cursos INTEGER NOT NULL,
+    PRIMARY KEY (ano, semestre)
+);
+
+CREATE TABLE IF NOT EXISTS semestres (
+    ano INTEGER NOT NULL, semestre INTEGER NOT NULL,
+    hash TEXT NOT NULL, linhas INTEGER NOT NULL, atualizado_em TEXT NOT NULL,
+    PRIMARY KEY (ano, semestre)
+);
+"""
+
+# Totais de um semestre, recalculados a partir dos fatos só desse semestre
+ROLLUPS = [
+    ("por_unidade", """INSERT INTO por_unidade
+        SELECT ano, semestre, unidade, SUM(inscritos), SUM(vagas), COUNT(DISTINCT curso)
+        FROM fatos WHERE ano = ? AND semestre = ? GROUP BY unidade"""),
+    ("por_curso", """INSERT INTO por_curso
+        SELECT ano, semestre, curso, SUM(inscritos), SUM(vagas), COUNT(DISTINCT unidade)
+        FROM fatos WHERE ano = ? AND semestre = ? GROUP BY curso"""),
+    ("por_periodo", """INSERT INTO por_periodo
+        SELECT ano, semestre, periodo, SUM(inscritos), SUM(vagas)
+        FROM fatos WHERE ano = ? AND semestre = ? GROUP BY periodo"""),
+    ("por_semestre", """INSERT INTO por_semestre
+        SELECT ano, semestre, SUM(inscritos), SUM(vagas), COUNT(DISTINCT unidade), COUNT(DISTINCT curso)
+        FROM fatos WHERE ano = ? AND semestre = ? GROUP BY ano, semestre"""),
+]
+
+def abre_cubo(caminho=ARQUIVO_CUBO):
+    con = sqlite3.connect(caminho)
+    con.executescript(ESQUEMA)
+    return con
+
+class AcumuladorCubo:
+    """
+    Soma Inscritos e Vagas por (Ano, Semestre, Unidade, Curso, Período) bloco a bloco.
+    Recebe os blocos já tipados (tipa_bloco); a memória cresce com o número de combinações, não de linhas.
+    """
+
+    def __init__(self):
+        self.parciais = []
+
+    def adiciona(self, tipado: pd.DataFrame):
+        tipado = tipado.dropna(subset=["Ano", "Semestre"])
+        parcial = (
+            tipado.assign(Linhas=1)
+            .groupby(DIMENSOES, observed=True, sort=False)[["Inscritos", "Vagas", "Linhas"]]
+            .sum(min_count=0)
+            .reset_index()
+        )
+        self.parciais.append(parcial)
+        # Junta os parciais de vez em quando para não guardar um por bloco
+        if len(self.parciais) >= 16:
+            self.parciais = [self.resultado()]
+
+    def resultado(self) -> pd.DataFrame:
+        if not self.parciais:
+            return pd.DataFrame(columns=DIMENSOES + ["Inscritos", "Vagas", "Linhas"])
+        juntos = pd.concat([p.astype({c: str for c in DIMENSOES[2:]}) for p in self.parciais], ignore_index=True)
+        return juntos.groupby(DIMENSOES, sort=True)[["Inscritos", "Vagas", "Linhas"]].sum().reset_index()
+
+def hash_semestre(linhas):
+    sha = hashlib.sha256()
+    for linha in linhas:
+        sha.update(repr(linha).encode("utf-8"))
+    return sha.hexdigest()
+
+def atualiza_cubo(con, agregado: pd.DataFrame, agora=None):
+    """
+    Junta os agregados (saída do AcumuladorCubo) ao cubo, semestre a semestre.
+    Retorna {"novos": [...], "atualizados": [...], "iguais": [...]} com os semestres ("20251", ...).
+    """
+    agora = agora or datetime.now().isoformat(timespec="seconds")
+    hashes = {(ano, semestre): h for ano, semestre, h in con.execute("SELECT ano, semestre, hash FROM semestres")}
+    situacao = {"novos": [], "atualizados": [], "iguais": []}
+
+    with con:
+        for (ano, semestre), grupo in agregado.groupby(["Ano", "Semestre"], sort=True):
+            ano, semestre = int(ano), int(semestre)
+            linhas = [
+                (ano, semestre, unidade, curso, periodo, int(inscritos), int(vagas), int(n_linhas))
+                for unidade, curso, periodo, inscritos, vagas, n_linhas in grupo[
+                    ["Unidade", "Curso", "Período", "Inscritos", "Vagas", "Linhas"]].itertuples(index=False, name=None)
+            ]
+            novo_hash = hash_semestre(linhas)
+            rotulo = f"{ano}{semestre}"
+            anterior = hashes.get((ano, semestre))
+            if anterior == novo_hash:
+                situacao["iguais"].append(rotulo)
+                continue
+            situacao["novos" if anterior is None else "atualizados"].append(rotulo)
+
+            con.execute("DELETE FROM fatos WHERE ano = ? AND semestre = ?", (ano, semestre))
+            con.executemany("INSERT INTO fatos VALUES (?, ?, ?, ?, ?, ?, ?, ?)", linhas)
+            for tabela, sql in ROLLUPS:
+                con.execute(f"DELETE FROM {tabela} WHERE ano = ? AND semestre = ?", (ano, semestre))
+                con.execute(sql, (ano, semestre))
+            con.execute("INSERT OR REPLACE INTO semestres VALUES (?, ?, ?, ?, ?)",
+                        (ano, semestre, novo_hash, len(linhas), agora))
+    return situacao
+
+# ======================================================
+# CONSULTAS
+# ======================================================
+def demanda(inscritos, vagas):
+    return round(inscritos / vagas, 2) if vagas else None
+
+def unidades(con):
+    return [u for (u,) in con.execute("SELECT DISTINCT unidade FROM por_unidade ORDER BY unidade")]
+
+def semestres_disponiveis(con):
+    return [f"{a}{s}" for a, s in con.execute("SELECT ano, semestre FROM semestres ORDER BY ano, semestre")]
+
+def tendencia_unidade(con, unidade):
+    """Inscritos, vagas e demanda (candidatos por vaga) da unidade em cada semestre, do mais antigo ao mais novo."""
+    return [
+        {"ano": a, "semestre": s, "inscritos": i, "vagas": v, "demanda": demanda(i, v), "cursos": c}
+        for a, s, i, v, c in con.execute(
+            "SELECT ano, semestre, inscritos, vagas, cursos FROM por_unidade WHERE unidade = ? ORDER BY ano, semestre",
+            (unidade,))
+    ]
+
+def top_cursos(con, ano, semestre, n=10, criterio="inscritos"):
+    """Os n cursos do semestre com mais inscritos (criterio="inscritos") ou maior demanda (criterio="demanda")."""
+    ordem = {"inscritos": "inscritos DESC", "demanda": "CAST(inscritos AS REAL) / NULLIF(vagas, 0) DESC"}[criterio]
+    return [
+        {"curso": c, "inscritos": i, "vagas": v, "demanda": demanda(i, v), "unidades": u}
+        for c, i, v, u in con.execute(
+            f"SELECT curso, inscritos, vagas, unidades FROM por_curso WHERE ano = ? AND semestre = ? "
+            f"ORDER BY {ordem}, curso LIMIT ?", (ano, semestre, n))
+    ]
+
+def demanda_por_periodo(con, ano=None, semestre=None):
+    """Candidatos por vaga em cada período; sem ano/semestre, soma todo o histórico."""
+    condicoes, parametros = [], []
+    if ano is not None:
+        condicoes.append("ano = ?")
+        parametros.append(ano)
+    if semestre is not None:
+        condicoes.append("semestre = ?")
+        parametros.append(semestre)
+    onde = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+    return [
+        {"periodo": p, "inscritos": i, "vagas": v, "demanda": demanda(i, v)}
+        for p, i, v in con.execute(
+            f"SELECT periodo, SUM(inscritos), SUM(vagas) FROM por_periodo {onde} "
+            f"GROUP BY periodo ORDER BY SUM(inscritos) * 1.0 / NULLIF(SUM(vagas), 0) DESC", parametros)
+    ]
+
+def imprime(linhas):
+    if not linhas:
+        print("(nada encontrado)")
+        return
+    print(pd.DataFrame(linhas).to_string(index=False))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultas no cubo de demanda (gerado pelo processa_arquivo_demanda_fatecs.py).")
+    parser.add_argument("--cubo", default=ARQUIVO_CUBO, help=f"arquivo do cubo (padrão: {ARQUIVO_CUBO})")
+    consultas = parser.add_subparsers(dest="consulta", required=True)
+    tendencia = consultas.add_parser("tendencia", help="demanda da unidade semestre a semestre")
+    tendencia.add_argument("unidade", help="nome canônico da unidade (ver: unidades)")
+    top = consultas.add_parser("top", help="cursos com mais inscritos (ou maior demanda) no semestre")
+    top.add_argument("ano", type=int)
+    top.add_argument("semestre", type=int)
+    top.add_argument("-n", type=int, default=10)
+    top.add_argument("--criterio", choices=["inscritos", "demanda"], default="inscritos")
+    periodos = consultas.add_parser("periodos", help="candidatos por vaga em cada período")
+    periodos.add_argument("--ano", type=int)
+    periodos.add_argument("--semestre", type=int)
+    consultas.add_parser("unidades", help="unidades no cubo")
+    args = parser.parse_args(argv)
+
+    con = abre_cubo(args.cubo)
+    try:
+        if args.consulta == "tendencia":
+            imprime(tendencia_unidade(con, args.unidade))
+        elif args.consulta == "top":
+            imprime(top_cursos(con, args.ano, args.semestre, args.n, args.criterio))
+        elif args.consulta == "periodos":
+            imprime(demanda_por_periodo(con, args.ano, args.semestre))
+        else:
+            print("\n".join(unidades(con)))
+    finally:
+        con.close()
+
+if __name__ == "__main__":
+    main()
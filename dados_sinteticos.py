@@ -0,0 +1,208 @@
+#  DADOS SINTETICOS
+#  GERA ENTRADAS ARTIFICIAIS (MAS NO FORMATO REAL) PARA TESTAR E MEDIR AS FERRAMENTAS SEM INTERNET:
+#      gera_paginas_demanda  -> páginas da demanda (mesmo formato de paginas_demanda/), para o servidor_local_demanda.py
+#      gera_demanda_csv      -> todas_fatecs_demanda.csv grande, com grafias variadas das unidades (normalização)
+#      gera_csv_cgesg        -> CSV de editais no formato baixado da CGESG (";" e datas dd/mm/aaaa)
+#      gera_pdf_imagens      -> PDF com muitas imagens (um logotipo repetido + uma imagem própria por página)
+#      gera_payloads_csv     -> CSV id,payload para o qrcode_generator.py --lote
+#  TUDO É DETERMINÍSTICO PARA A MESMA semente.
+
+import csv
+import html
+import os
+import random
+import string
+from datetime import date, timedelta
+
+from indice_aliases import PREFIXO_UNIDADE
+from servidor_local_demanda import nome_pagina
+from texto import remove_acentos
+
+DICT_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dicionario_editado.csv")
+
+CURSOS = [
+    "Análise e Desenvolvimento de Sistemas", "Gestão Empresarial", "Gestão da Tecnologia da Informação",
+    "Logística", "Processos Gerenciais", "Mecatrônica Industrial", "Comércio Exterior", "Ciência de Dados",
+    "Produção Têxtil", "Segurança da Informação", "Gestão Comercial", "Redes de Computadores",
+]
+PERIODOS = ["Manhã", "Tarde", "Noite", "Integral"]
+
+def nomes_unidades(quantidade=None):
+    """Nomes curtos das unidades (aliases de canônicos FATEC do dicionário), como aparecem no select FATEC do site."""
+    with open(DICT_CSV, newline="", encoding="utf-8") as arquivo:
+        aliases = [linha["aliases"] for linha in csv.DictReader(arquivo)
+                   if linha["canonical"].upper().startswith(PREFIXO_UNIDADE)]
+    nomes = list(dict.fromkeys(alias.title() for alias in aliases if alias and len(alias) < 40))
+    return nomes[:quantidade] if quantidade else nomes
+
+def semestres(quantidade, ultimo=(2025, 2)):
+    """Lista de ano_sem ("20252", "20251", ...) do mais novo para o mais antigo."""
+    ano, semestre = ultimo
+    lista = []
+    for _ in range(quantidade):
+        lista.append(f"{ano}{semestre}")
+        ano, semestre = (ano, 1) if semestre == 2 else (ano - 1, 2)
+    return lista
+
+def numero_br(valor):
+    return f"{valor:.2f}".replace(".", ",")
+
+def linhas_demanda(sorteio, cursos_por_unidade):
+    """[(curso, período, inscritos, vagas, demanda)] de uma unidade."""
+    linhas = []
+    for curso in sorteio.sample(CURSOS, cursos_por_unidade):
+        vagas = sorteio.choice([35, 40, 80])
+        inscritos = sorteio.randint(0, 12 * vagas)
+        linhas.append((curso, sorteio.choice(PERIODOS), inscritos, vagas, inscritos / vagas))
+    return linhas
+
+# ======================================================
+# PÁGINAS DA DEMANDA
+# ======================================================
+def pagina_demanda(lista_semestres, ano_sem=None, unidades=None, unidade=None, linhas=None):
+    opcoes_sem = "\n".join(
+        f'      <option value="{s}"{" selected" if s == ano_sem else ""}>{s[:4]}/{s[4]}º semestre</option>'
+        for s in lista_semestres)
+    partes = [
+        '<!DOCTYPE html>\n<html lang="pt-br">\n<head>\n  <meta charset="utf-8">\n'
+        '  <title>Vestibular Fatec - Demanda</title>\n</head>\n<body>\n  <h1>Demanda do Vestibular</h1>\n'
+        '  <form method="post" action="">\n    <select name="ano-sem" class="form-control">\n'
+        '      <option value="0">Selecione...</option>\n' + opcoes_sem + '\n    </select>\n'
+        '    <button class="btn btn-primary" type="send">Exibir</button>\n'
+    ]
+    if unidades:
+        opcoes_unidade = "\n".join(
+            f'      <option value="{html.escape(u)}"{" selected" if u == unidade else ""}>Fatec {html.escape(u)}</option>'
+            for u in unidades)
+        partes.append(
+            '    <select name="FATEC" id="FATEC" class="form-control">\n'
+            '      <option value="">Selecione a Fatec...</option>\n' + opcoes_unidade + '\n    </select>\n'
+            '    <button class="btn btn-primary" type="send">Exibir</button>\n')
+    partes.append('  </form>\n')
+    if linhas is not None:
+        corpo = "\n".join(
+            f"      <tr><td>{html.escape(curso)}</td><td>{periodo}</td><td>{inscritos}</td><td>{vagas}</td>"
+            f"<td>{numero_br(demanda)}</td></tr>"
+            for curso, periodo, inscritos, vagas, demanda in linhas)
+        partes.append(
+            '  <table class="table table-striped">\n    <thead>\n'
+            '      <tr><th>Curso</th><th>Período</th><th>Inscritos</th><th>Vagas</th><th>Demanda</th></tr>\n'
+            '    </thead>\n    <tbody>\n' + corpo + '\n    </tbody>\n  </table>\n')
+    partes.append('</body>\n</html>\n')
+    return "".join(partes)
+
+def gera_paginas_demanda(pasta, num_semestres=4, num_unidades=20, cursos_por_unidade=6, semente=0):
+    """Grava inicio.html, <ano_sem>.html e <ano_sem>_<UNIDADE>.html. Retorna o total de tabelas (pares)."""
+    sorteio = random.Random(semente)
+    os.makedirs(pasta, exist_ok=True)
+    lista_semestres = semestres(num_semestres)
+    unidades = nomes_unidades(num_unidades)
+
+    def grava(nome, conteudo):
+        with open(os.path.join(pasta, nome), "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+
+    grava("inicio.html", pagina_demanda(lista_semestres))
+    for ano_sem in lista_semestres:
+        grava(f"{ano_sem}.html", pagina_demanda(lista_semestres, ano_sem, unidades))
+        for unidade in unidades:
+            linhas = linhas_demanda(sorteio, cursos_por_unidade)
+            grava(f"{ano_sem}_{nome_pagina(unidade)}.html",
+                  pagina_demanda(lista_semestres, ano_sem, unidades, unidade, linhas))
+    return len(lista_semestres) * len(unidades)
+
+# ======================================================
+# CSVs
+# ======================================================
+def variacao_unidade(sorteio, unidade):
+    """Grafias que aparecem no site ao longo dos anos: caixa, acentos, prefixo "Fatec", espaços."""
+    variacoes = [
+        unidade, unidade.upper(), remove_acentos(unidade), f"Fatec {unidade}", f"FATEC {unidade.upper()}",
+        f"  {unidade}  ", unidade.replace(" ", "  "),
+    ]
+    return sorteio.choice(variacoes)
+
+def gera_demanda_csv(caminho, linhas, semente=0):
+    """todas_fatecs_demanda.csv com o CABECALHO do busca_demanda_vestibular_fatec.py. Retorna o número de linhas."""
+    sorteio = random.Random(semente)
+    unidades = nomes_unidades()
+    lista_semestres = semestres(min(20, max(1, linhas // 10_000)))
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["Ano", "Semestre", "Unidade", "Curso", "Período", "Inscritos", "Vagas", "Demanda"])
+        for i in range(linhas):
+            ano_sem = lista_semestres[i * len(lista_semestres) // linhas]
+            vagas = sorteio.choice([35, 40, 80])
+            inscritos = sorteio.randint(0, 12 * vagas)
+            escritor.writerow([
+                ano_sem[:4], ano_sem[4], variacao_unidade(sorteio, sorteio.choice(unidades)), sorteio.choice(CURSOS),
+                sorteio.choice(PERIODOS + ["NOITE", "noite", "Manha"]), f"{inscritos:,}".replace(",", "."), vagas,
+                numero_br(inscritos / vagas),
+            ])
+    return linhas
+
+def gera_csv_cgesg(caminho, quantidade, semente=0, url_documentos="https://cgesg.cps.sp.gov.br"):
+    """CSV de editais como o baixado da CGESG (separador ";", UTF-8 com BOM, datas como texto dd/mm/aaaa)."""
+    sorteio = random.Random(semente)
+    fatecs = nomes_unidades(40)
+    disciplinas = ["Teoria das Organizações", "Projetos de Tecnologia da Informação II", "Estatística Aplicada",
+                   "Programação Orientada a Objetos", "Contabilidade", "Inglês IV", "Banco de Dados"]
+    areas = ["Ciência da computação", "Administração e negócios", "Matemática", "Engenharia mecânica",
+             "Letras", "Economia", "Sistemas de informação"]
+    hoje = date.today()
+    with open(caminho, "w", newline="", encoding="utf-8-sig") as arquivo:
+        escritor = csv.writer(arquivo, delimiter=";")
+        escritor.writerow(["Edital Nº", "Fatec", "Curso", "Disciplina", "Área da disciplina",
+                           "Determinado ou indeterminado", "Período", "Data abertura", "Data limite",
+                           "Edital", "Ficha", "Tabela"])
+        for n in range(quantidade):
+            abertura = hoje - timedelta(days=sorteio.randint(0, 30))
+            limite = hoje + timedelta(days=sorteio.randint(-10, 60))
+            escritor.writerow([
+                f"{n:05d}/{hoje.year}", sorteio.choice(fatecs), ", ".join(sorteio.sample(CURSOS, sorteio.randint(1, 2))),
+                sorteio.choice(disciplinas), ", ".join(sorteio.sample(areas, sorteio.randint(1, 4))),
+                sorteio.choice(["Determinado", "Indeterminado"]), sorteio.choice(["Noturno", "Matutino", "Vespertino"]),
+                abertura.strftime("%d/%m/%Y"), f"Até {limite.strftime('%d/%m/%Y')} às 23h59",
+                f"{url_documentos}/editais/{n}.pdf", f"{url_documentos}/fichas/{n}.pdf",
+                f"{url_documentos}/tabelas/{n}.pdf",
+            ])
+    return quantidade
+
+def gera_payloads_csv(caminho, quantidade, semente=0):
+    sorteio = random.Random(semente)
+    letras = string.ascii_letters + string.digits
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["id", "payload"])
+        for n in range(quantidade):
+            caminho_url = "".join(sorteio.choices(letras, k=sorteio.randint(8, 120)))
+            escritor.writerow([f"QR {n:05d}", f"https://vestibular.fatec.sp.gov.br/{caminho_url}"])
+    return quantidade
+
+# ======================================================
+# PDF COM IMAGENS
+# ======================================================
+def gera_pdf_imagens(caminho, paginas=100, lado=400, semente=0):
+    """
+    PDF com um logotipo igual em todas as páginas (mesmo objeto) e uma imagem RGB aleatória própria em cada página,
+    como um documento digitalizado com cabeçalho. Retorna o número de ocorrências de imagem.
+    """
+    import fitz
+    import numpy as np
+
+    rng = np.random.default_rng(semente)
+    documento = fitz.open()
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 120, 120), False)
+    logo.set_rect(logo.irect, (180, 20, 30))
+    logo_png = logo.tobytes("png")
+    for _ in range(paginas):
+        pagina = documento.new_page()
+        pagina.insert_image(fitz.Rect(20, 20, 80, 80), stream=logo_png)
+        # Blocos de 8x8 pixels: comprime como uma digitalização, não como ruído puro
+        blocos = rng.integers(0, 255, (lado // 8, lado // 8, 3), dtype=np.uint8)
+        pixels = blocos.repeat(8, axis=0).repeat(8, axis=1)
+        imagem = fitz.Pixmap(fitz.csRGB, pixels.shape[1], pixels.shape[0], pixels.tobytes(), False)
+        pagina.insert_image(fitz.Rect(50, 100, 50 + lado * 0.75, 100 + lado * 0.75), pixmap=imagem)
+    documento.save(caminho, deflate=True)
+    documento.close()
+    return 2 * paginas
@@ -0,0 +1,64 @@
+#  DESENHA QRCODE
+#  DESENHA UM QRCODE A PARTIR DA MATRIZ DE MÓDULOS (qr.modules), SEM PASSAR PELO PIL:
+#  A MATRIZ VIRA UM ARRAY NUMPY, É AMPLIADA (box_size) E RECEBE A BORDA (border), E O PNG DE 1 BIT É
+#  CODIFICADO DIRETO (zlib + struct). O SVG É MONTADO COMO TEXTO, UM RETÂNGULO POR SEQUÊNCIA DE MÓDULOS ESCUROS.
+#  O PNG SAI COM OS MESMOS PIXELS DO qr.make_image(fill_color="black", back_color="white") (ver qrcode_generator.py --benchmark).
+
+import struct
+import zlib
+
+import numpy as np
+
+ASSINATURA_PNG = b"\x89PNG\r\n\x1a\n"
+
+def matriz_modulos(qr):
+    """Matriz booleana (True = módulo escuro), sem a borda. O qr precisa já ter sido montado (qr.make())."""
+    return np.array(qr.modules, dtype=bool)
+
+def matriz_pixels(modulos, box_size, border):
+    """Amplia cada módulo para box_size x box_size pixels e acrescenta border módulos claros em volta."""
+    modulos = np.pad(modulos, border, constant_values=False)
+    return modulos.repeat(box_size, axis=0).repeat(box_size, axis=1)
+
+def bloco_png(tipo, dados):
+    return struct.pack(">I", len(dados)) + tipo + dados + struct.pack(">I", zlib.crc32(tipo + dados))
+
+def png_1bit(pixels):
+    """PNG em tons de cinza, 1 bit por pixel (0 = preto), a partir do array booleano (True = escuro)."""
+    altura, largura = pixels.shape
+    linhas = np.packbits(~pixels, axis=1)  # cada linha vira bytes, 8 pixels por byte; branco = 1
+    linhas = np.hstack([np.zeros((altura, 1), dtype=np.uint8), linhas])  # filtro 0 (None) no início de cada linha
+    cabecalho = struct.pack(">IIBBBBB", largura, altura, 1, 0, 0, 0, 0)
+    return (ASSINATURA_PNG
+            + bloco_png(b"IHDR", cabecalho)
+            + bloco_png(b"IDAT", zlib.compress(linhas.tobytes(), 6))
+            + bloco_png(b"IEND", b""))
+
+def svg_texto(modulos, box_size, border, cor="#000000"):
+    """
+    SVG com um único path: cada sequência horizontal de módulos escuros vira um retângulo.
+    As coordenadas são em módulos (viewBox), e o tamanho final é o mesmo do PNG (box_size pixels por módulo).
+    """
+    tamanho = modulos.shape[0] + 2 * border
+    # Início e fim de cada sequência de escuros, linha a linha (diferença do array com zeros nas pontas)
+    bordas = np.diff(np.pad(modulos.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    partes = []
+    for y, linha in enumerate(bordas):
+        inicios = np.flatnonzero(linha == 1)
+        fins = np.flatnonzero(linha == -1)
+        partes.extend(f"M{x + border},{y + border}h{w}v1h-{w}z" for x, w in zip(inicios.tolist(), (fins - inicios).tolist()))
+    lado = tamanho * box_size
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{lado}" height="{lado}" '
+            f'viewBox="0 0 {tamanho} {tamanho}" shape-rendering="crispEdges">'
+            f'<rect width="{tamanho}" height="{tamanho}" fill="#ffffff"/>'
+            f'<path fill="{cor}" d="{"".join(partes)}"/></svg>')
+
+def png_qrcode(qr, box_size=None, border=None):
+    box_size = qr.box_size if box_size is None else box_size
+    border = qr.border if border is None else border
+    return png_1bit(matriz_pixels(matriz_modulos(qr), box_size, border))
+
+def svg_qrcode(qr, box_size=None, border=None):
+    box_size = qr.box_size if box_size is None else box_size
+    border = qr.border if border is None else border
+    return svg_texto(matriz_modulos(qr), box_size, border)
@@ -1,58 +1,374 @@
 #  EXTRAI IMAGENS PDF
 #  ESTE PROGRAMA LÊ UM ARQUIVO PDF E EXTRAI AS IMAGENS DO ARQUIVO EM UMA PASTA DESTINO.
+#  CADA IMAGEM (xref) É EXTRAÍDA E GRAVADA UMA ÚNICA VEZ, MESMO QUE APAREÇA EM VÁRIAS PÁGINAS (EX.: UM LOGOTIPO),
+#  E O manifesto.csv DIZ QUAL ARQUIVO APARECE EM CADA PÁGINA. COM --dedupe-conteudo, IMAGENS DIFERENTES NO PDF
+#  MAS COM O MESMO CONTEÚDO TAMBÉM VIRAM UM SÓ ARQUIVO. AS PÁGINAS SÃO DIVIDIDAS EM FAIXAS ENTRE VÁRIOS PROCESSOS.
+#  SE O CAMINHO FOR UMA PASTA, PROCESSA TODOS OS PDFs DELA (E DAS SUBPASTAS), UM PDF POR PROCESSO.
+#  ERROS EM UMA IMAGEM OU EM UM PDF NÃO INTERROMPEM OS DEMAIS: FICAM NO RESUMO.
+#      python extrai_imagens_pdf.py seu_arquivo.pdf --saida imagens_extraidas
+#      python extrai_imagens_pdf.py pasta_com_pdfs --saida imagens_extraidas --min-tamanho 64 --formatos png,jpeg
+#  PARA USAR EM OUTRO PROGRAMA, iter_images GERA AS IMAGENS UMA A UMA (METADADOS + BYTES) SEM GRAVAR NADA.
 #  DANIEL RODRIGUES DE SOUSA 09/06/2025
 
-import fitz  # Importa a biblioteca PyMuPDF para manipulação de PDFs
+import argparse
+import csv
+import hashlib
 import os    # Importa a biblioteca OS para lidar com diretórios e arquivos
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz  # Importa a biblioteca PyMuPDF para manipulação de PDFs
+
+MIN_IMAGENS_POR_PROCESSO = 50  # abaixo disso, o custo de subir os processos não compensa
+FAIXAS_POR_PROCESSO = 4  # mais faixas que processos: equilibra PDFs com imagens concentradas em poucas páginas
+PDFS_EM_ANDAMENTO_POR_PROCESSO = 2  # no modo pasta, limita os PDFs enviados ao pool (memória)
+
+def normaliza_formatos(formatos):
+    if not formatos:
+        return None
+    sinonimos = {"jpg": "jpeg", "tif": "tiff"}
+    return {sinonimos.get(f.strip().lower(), f.strip().lower()) for f in formatos if f.strip()}
+
+def paginas_do_texto(texto):
+    """Converte "1-5,8,10-" em um filtro de páginas (base 1) para iter_images/lista_imagens."""
+    paginas = []
+    for parte in texto.split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        if "-" in parte:
+            inicio, fim = parte.split("-", 1)
+            paginas.append((int(inicio or 1), int(fim) if fim else None))
+        else:
+            paginas.append((int(parte), int(parte)))
+    return paginas
 
-def extrai_imagens_do_pdf(pdf_path, output_folder):
+def numeros_paginas(total, pages=None):
+    """Páginas (base 1) do documento selecionadas por pages: None, números ou faixas (inicio, fim|None)."""
+    if pages is None:
+        return range(1, total + 1)
+    selecionadas = set()
+    for item in pages:
+        if isinstance(item, tuple):
+            inicio, fim = item
+            selecionadas.update(range(max(1, inicio), min(total, fim or total) + 1))
+        elif 1 <= item <= total:
+            selecionadas.add(item)
+    return sorted(selecionadas)
+
+def lista_imagens(pdf_document, pages=None, min_size=0):
+    """
+    Percorre as páginas sem decodificar nenhuma imagem e retorna (ocorrencias, primeira):
+    ocorrencias = [(pagina, indice, xref)], primeira = {xref: (pagina, indice)}.
+    Imagens com largura ou altura menor que min_size (pixels) ficam de fora.
+    """
+    ocorrencias = []
+    primeira = {}
+    for pagina in numeros_paginas(len(pdf_document), pages):
+        for indice, img in enumerate(pdf_document.get_page_images(pagina - 1, full=True), start=1):
+            xref, largura, altura = img[0], img[2], img[3]  # Referência da imagem no PDF e tamanho em pixels
+            if min(largura, altura) < min_size:
+                continue
+            ocorrencias.append((pagina, indice, xref))
+            primeira.setdefault(xref, (pagina, indice))
+    return ocorrencias, primeira
+
+def extrai_imagem(pdf_document, xref, formatos=None):
+    """
+    Extrai os dados de um xref. Retorna o dict do PyMuPDF (image, ext, width, height, ...),
+    None se o formato não estiver em formatos, ou {"erro": ...} se a extração falhar.
+    """
     try:
-        # Tenta abrir o arquivo PDF
-        pdf_document = fitz.open(pdf_path)
+        base_image = pdf_document.extract_image(xref)  # Extrai os dados da imagem
     except Exception as e:
-        print(f"Erro ao abrir o arquivo PDF: {e}")
-        return
-    
+        return {"erro": f"{type(e).__name__}: {e}"}
+    if not base_image:
+        return {"erro": "xref sem imagem"}
+    if formatos and normaliza_formatos([base_image["ext"]]).isdisjoint(formatos):
+        return None
+    return base_image
+
+def gera_imagens(pdf_document, tarefas, formatos=None):
+    """
+    Extrai cada (xref, pagina, indice) das tarefas e gera os dicts do iter_images. É o único caminho de extração:
+    iter_images e extrai_faixa (modo arquivo e modo pasta) passam por aqui.
+    """
+    for xref, pagina, indice in tarefas:
+        base_image = extrai_imagem(pdf_document, xref, formatos)
+        if base_image is None:
+            continue
+        yield {
+            "pagina": pagina, "indice": indice, "xref": xref,
+            "largura": base_image.get("width"), "altura": base_image.get("height"),
+            "ext": base_image.get("ext"), "imagem": base_image.get("image"), "erro": base_image.get("erro"),
+        }
+
+def iter_images(pdf_path, pages=None, min_size=0, formats=None, unicas=True):
+    """
+    Gera as imagens do PDF uma a uma, sem gravar nada, como dicts:
+        {"pagina", "indice", "xref", "largura", "altura", "ext", "imagem" (bytes), "erro"}
+    - pages: números de página (base 1) e/ou faixas (inicio, fim|None); None = todas
+    - min_size: ignora imagens menores que isso (em pixels, largura ou altura), sem decodificá-las
+    - formats: extensões aceitas (ex.: ["png", "jpeg"]); None = todas
+    - unicas: cada xref sai uma vez só, na primeira página em que aparece
+    Se uma imagem não puder ser extraída, ela sai com "imagem", "largura" e "altura" None e a mensagem em "erro",
+    e a geração continua.
+    """
+    formatos = normaliza_formatos(formats)
+    pdf_document = fitz.open(pdf_path)
     try:
-        # Cria a pasta de saída, se ela ainda não existir
-        if not os.path.exists(output_folder):
-            os.makedirs(output_folder)
-    except Exception as e:
-        print(f"Erro ao criar a pasta de saída: {e}")
-        return
-    
+        ocorrencias, primeira = lista_imagens(pdf_document, pages, min_size)
+        if unicas:
+            tarefas = [(xref, pagina, indice) for xref, (pagina, indice) in primeira.items()]
+        else:
+            tarefas = [(xref, pagina, indice) for pagina, indice, xref in ocorrencias]
+        yield from gera_imagens(pdf_document, tarefas, formatos)
+    finally:
+        pdf_document.close()
+
+def divide_em_faixas(primeira, num_faixas):
+    """Agrupa os xrefs pela faixa de páginas onde aparecem pela primeira vez."""
+    if not primeira:
+        return []
+    ultima_pagina = max(pagina for pagina, _ in primeira.values())
+    tamanho = max(1, -(-ultima_pagina // num_faixas))
+    faixas = {}
+    for xref, (pagina, indice) in primeira.items():
+        faixas.setdefault((pagina - 1) // tamanho, []).append((xref, pagina, indice))
+    return [faixas[chave] for chave in sorted(faixas)]
+
+def extrai_faixa(pdf_path, output_folder, tarefas, formatos=None):
+    """
+    Executada em um processo do pool: abre o próprio documento, extrai cada xref da faixa uma vez e grava o arquivo
+    com o nome da primeira ocorrência (image_page<pagina>_<indice>.<ext>).
+    Retorna ({xref: (arquivo, sha256, bytes)}, [erros]); uma imagem com erro não interrompe as outras.
+    """
+    pdf_document = fitz.open(pdf_path)
+    resultados = {}
+    erros = []
     try:
-        # Itera por todas as páginas do PDF
-        for page_num in range(len(pdf_document)):
-            page = pdf_document.load_page(page_num)  # Carrega a página atual
-            image_list = page.get_images(full=True)  # Obtém todas as imagens da página
-            
-            # Itera por todas as imagens encontradas na página
-            for img_index, img in enumerate(image_list):
-                xref = img[0]  # Referência da imagem no PDF
-                base_image = pdf_document.extract_image(xref)  # Extrai os dados da imagem
-                image_bytes = base_image["image"]  # Conteúdo da imagem em bytes
-                image_ext = base_image["ext"]      # Extensão do arquivo da imagem (ex: png, jpeg)
-                
-                # Define o nome do arquivo da imagem com base na página e índice
-                image_filename = f"image_page{page_num + 1}_{img_index + 1}.{image_ext}"
-                image_path = os.path.join(output_folder, image_filename)  # Caminho completo do arquivo
-                
-                try:
-                    # Salva a imagem no disco
-                    with open(image_path, "wb") as image_file:
-                        image_file.write(image_bytes)
-                except Exception as e:
-                    print(f"Erro ao salvar a imagem '{image_filename}': {e}")
-                    return
+        for item in gera_imagens(pdf_document, tarefas, formatos):
+            xref, pagina, indice = item["xref"], item["pagina"], item["indice"]
+            if item["erro"]:
+                erros.append(f"página {pagina}, imagem {indice} (xref {xref}): {item['erro']}")
+                continue
+            image_bytes = item["imagem"]  # Conteúdo da imagem em bytes
+            image_ext = item["ext"]       # Extensão do arquivo da imagem (ex: png, jpeg)
+
+            image_filename = f"image_page{pagina}_{indice}.{image_ext}"
+            image_path = os.path.join(output_folder, image_filename)  # Caminho completo do arquivo
+            try:
+                # Salva a imagem no disco
+                with open(image_path, "wb") as image_file:
+                    image_file.write(image_bytes)
+            except Exception as e:
+                erros.append(f"Erro ao salvar a imagem '{image_filename}': {e}")
+                continue
+            resultados[xref] = (image_filename, hashlib.sha256(image_bytes).hexdigest(), len(image_bytes))
+    finally:
+        pdf_document.close()
+    return resultados, erros
+
+def grava_manifesto(caminho, ocorrencias, arquivos):
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["pagina", "indice", "xref", "arquivo"])
+        for pagina, indice, xref in ocorrencias:
+            if xref in arquivos:
+                escritor.writerow([pagina, indice, xref, arquivos[xref]])
+
+def extrai_pdf(pdf_path, output_folder, processos=1, dedupe_conteudo=False, pages=None, min_size=0, formats=None):
+    """
+    Extrai as imagens de um PDF para output_folder (com manifesto.csv) e retorna o resumo:
+    {"pdf", "ocorrencias", "arquivos", "bytes", "erros": [...], "segundos", "processos"}.
+    Exceções só para erros que impedem o PDF inteiro (abrir o arquivo, criar a pasta).
+    """
+    inicio = time.perf_counter()
+    formatos = normaliza_formatos(formats)
+
+    # Lista as imagens das páginas (sem extrair nada) e divide os xrefs únicos em faixas de páginas
+    pdf_document = fitz.open(pdf_path)
+    try:
+        ocorrencias, primeira = lista_imagens(pdf_document, pages, min_size)
+    finally:
+        pdf_document.close()
+
+    # Cria a pasta de saída, se ela ainda não existir
+    os.makedirs(output_folder, exist_ok=True)
+
+    processos = processos or os.cpu_count() or 1
+    processos = max(1, min(processos, len(primeira) // MIN_IMAGENS_POR_PROCESSO))
+    faixas = divide_em_faixas(primeira, processos * FAIXAS_POR_PROCESSO)
+
+    resultados = {}
+    erros = []
+    if processos == 1:
+        parciais = (extrai_faixa(pdf_path, output_folder, tarefas, formatos) for tarefas in faixas)
+        for parcial, erros_faixa in parciais:
+            resultados.update(parcial)
+            erros.extend(erros_faixa)
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            n = len(faixas)
+            for parcial, erros_faixa in executor.map(
+                    extrai_faixa, [pdf_path] * n, [output_folder] * n, faixas, [formatos] * n):
+                resultados.update(parcial)
+                erros.extend(erros_faixa)
+
+    arquivos = {xref: arquivo for xref, (arquivo, _, _) in resultados.items()}
+    total_bytes = sum(tamanho for _, _, tamanho in resultados.values())
+    removidos = 0
+    if dedupe_conteudo:
+        # Mesmo conteúdo em xrefs diferentes: fica o arquivo da primeira ocorrência no PDF
+        por_conteudo = {}
+        for xref in sorted(resultados, key=lambda x: primeira[x]):
+            arquivo, sha256, tamanho = resultados[xref]
+            if sha256 in por_conteudo:
+                os.remove(os.path.join(output_folder, arquivo))
+                arquivos[xref] = por_conteudo[sha256]
+                total_bytes -= tamanho
+                removidos += 1
+            else:
+                por_conteudo[sha256] = arquivo
+
+    grava_manifesto(os.path.join(output_folder, "manifesto.csv"), ocorrencias, arquivos)
+    return {"pdf": pdf_path, "ocorrencias": len(ocorrencias), "arquivos": len(resultados) - removidos,
+            "bytes": total_bytes, "erros": erros, "segundos": time.perf_counter() - inicio, "processos": processos}
+
+def extrai_imagens_do_pdf(pdf_path, output_folder, processos=None, dedupe_conteudo=False,
+                          pages=None, min_size=0, formats=None):
+    try:
+        resumo = extrai_pdf(pdf_path, output_folder, processos, dedupe_conteudo, pages, min_size, formats)
     except Exception as e:
         print(f"Erro ao processar o PDF: {e}")
-        return
-    
+        return None
+
+    for erro in resumo["erros"]:
+        print(f"[ERRO] {erro}")
+
     # Mensagem de confirmação
-    print(f"Imagens extraídas e salvas na pasta '{output_folder}'.")
+    print(f"{resumo['ocorrencias']} ocorrência(s) de imagem, {resumo['arquivos']} arquivo(s) único(s), "
+          f"em {resumo['segundos']:.2f} s ({resumo['processos']} processo(s)).")
+    print(f"Imagens extraídas e salvas na pasta '{output_folder}' (páginas -> arquivos em manifesto.csv).")
+    return resumo
+
+# ======================================================
+# MODO PASTA (VÁRIOS PDFs)
+# ======================================================
+def lista_pdfs(pasta):
+    pdfs = []
+    for raiz, subpastas, arquivos in os.walk(pasta):
+        subpastas.sort()
+        pdfs.extend(os.path.join(raiz, nome) for nome in sorted(arquivos) if nome.lower().endswith(".pdf"))
+    return pdfs
+
+def resumo_com_erro(pdf_path, erro):
+    return {"pdf": pdf_path, "ocorrencias": 0, "arquivos": 0, "bytes": 0, "erros": [erro],
+            "segundos": 0.0, "processos": 1}
+
+def extrai_pdf_do_lote(pdf_path, output_folder, dedupe_conteudo, pages, min_size, formats):
+    # Executada em um processo do pool: um PDF inteiro, sem pool interno; erros viram parte do resumo
+    try:
+        return extrai_pdf(pdf_path, output_folder, 1, dedupe_conteudo, pages, min_size, formats)
+    except Exception as e:
+        return resumo_com_erro(pdf_path, f"{type(e).__name__}: {e}")
+
+def extrai_imagens_da_pasta(pasta, output_folder, processos=None, dedupe_conteudo=False,
+                            pages=None, min_size=0, formats=None):
+    """
+    Extrai as imagens de todos os PDFs da pasta (e subpastas), um PDF por processo, para
+    output_folder/<caminho relativo do PDF sem .pdf>/. No máximo PDFS_EM_ANDAMENTO_POR_PROCESSO PDFs por processo
+    ficam na fila, então a memória não cresce com o número de arquivos. Grava resumo_lote.csv e retorna os resumos.
+    Se um processo morrer (falta de memória, falha no MuPDF), os PDFs que estavam no pool entram como erro e
+    um pool novo continua com os PDFs restantes.
+    """
+    pdfs = lista_pdfs(pasta)
+    processos = processos or os.cpu_count() or 1
+    limite = processos * PDFS_EM_ANDAMENTO_POR_PROCESSO
+    print(f"{len(pdfs)} PDF(s) em '{pasta}', {processos} processo(s).")
+
+    inicio = time.perf_counter()
+    resumos = []
+    total_imagens = total_bytes = 0
+    pendentes = iter(pdfs)
+    executor = ProcessPoolExecutor(max_workers=processos)
+    try:
+        em_andamento = {}  # futuro -> PDF
+        pool_quebrado = False
+        while True:
+            for pdf_path in ([] if pool_quebrado else pendentes):
+                destino = os.path.join(output_folder, os.path.splitext(os.path.relpath(pdf_path, pasta))[0])
+                em_andamento[executor.submit(
+                    extrai_pdf_do_lote, pdf_path, destino, dedupe_conteudo, pages, min_size, formats)] = pdf_path
+                if len(em_andamento) >= limite:
+                    break
+            if not em_andamento:
+                break
+
+            prontos, _ = wait(em_andamento, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                pdf_path = em_andamento.pop(futuro)
+                try:
+                    resumo = futuro.result()
+                except BrokenProcessPool as e:
+                    # Não dá para saber qual PDF derrubou o processo: todos os que estavam no pool ficam com erro
+                    pool_quebrado = True
+                    resumo = resumo_com_erro(pdf_path, f"BrokenProcessPool: {e}")
+                resumos.append(resumo)
+                total_imagens += resumo["arquivos"]
+                total_bytes += resumo["bytes"]
+                decorrido = time.perf_counter() - inicio
+                situacao = f"{len(resumo['erros'])} erro(s)" if resumo["erros"] else "ok"
+                print(f"[{len(resumos)}/{len(pdfs)}] {os.path.relpath(resumo['pdf'], pasta)}: "
+                      f"{resumo['arquivos']} imagem(ns), {situacao} | "
+                      f"{len(resumos) / decorrido:.1f} PDF/s, {total_imagens / decorrido:.0f} imagens/s, "
+                      f"{total_bytes / decorrido / 1e6:.1f} MB/s")
+                for erro in resumo["erros"]:
+                    print(f"    [ERRO] {erro}")
+
+            if pool_quebrado and not em_andamento:
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=processos)
+                pool_quebrado = False
+    finally:
+        executor.shutdown()
+
+    os.makedirs(output_folder, exist_ok=True)
+    resumos.sort(key=lambda r: r["pdf"])
+    with open(os.path.join(output_folder, "resumo_lote.csv"), "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["pdf", "ocorrencias", "arquivos", "bytes", "segundos", "erros"])
+        for r in resumos:
+            escritor.writerow([os.path.relpath(r["pdf"], pasta), r["ocorrencias"], r["arquivos"], r["bytes"],
+                               f"{r['segundos']:.3f}", " | ".join(r["erros"])])
+
+    decorrido = time.perf_counter() - inicio
+    com_erro = sum(1 for r in resumos if r["erros"])
+    print(f"{len(resumos)} PDF(s), {total_imagens} imagem(ns), {total_bytes / 1e6:.1f} MB em {decorrido:.2f} s; "
+          f"{com_erro} PDF(s) com erro (ver resumo_lote.csv em '{output_folder}').")
+    return resumos
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extrai as imagens de um PDF (ou de uma pasta de PDFs).")
+    parser.add_argument("pdf", nargs="?", default="seu_arquivo.pdf",
+                        help="arquivo PDF ou pasta com PDFs (padrão: seu_arquivo.pdf)")
+    parser.add_argument("--saida", default="imagens_extraidas", help="pasta das imagens (padrão: imagens_extraidas)")
+    parser.add_argument("--processos", type=int, default=None, help="processos (padrão: núcleos da CPU)")
+    parser.add_argument("--dedupe-conteudo", action="store_true",
+                        help="um só arquivo para imagens com o mesmo conteúdo, mesmo que sejam objetos diferentes no PDF")
+    parser.add_argument("--paginas", type=paginas_do_texto, default=None, help='páginas, ex.: "1-5,8,10-"')
+    parser.add_argument("--min-tamanho", type=int, default=0,
+                        help="ignora imagens com largura ou altura menor que isso (pixels)")
+    parser.add_argument("--formatos", type=lambda texto: texto.split(","), default=None,
+                        help='só esses formatos, ex.: "png,jpeg"')
+    args = parser.parse_args(argv)
+
+    opcoes = (args.processos, args.dedupe_conteudo, args.paginas, args.min_tamanho, args.formatos)
+    if os.path.isdir(args.pdf):
+        extrai_imagens_da_pasta(args.pdf, args.saida, *opcoes)
+    else:
+        extrai_imagens_do_pdf(args.pdf, args.saida, *opcoes)
 
-# Exemplo de uso do programa
-pdf_path = "seu_arquivo.pdf"  # Caminho do arquivo PDF (substitua pelo seu)
-output_folder = "imagens_extraidas"  # Nome da pasta onde as imagens serão salvas
-extrai_imagens_do_pdf(pdf_path, output_folder)
\ No newline at end of file
+if __name__ == "__main__":
+    main()
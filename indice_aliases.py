@@ -0,0 +1,144 @@
+#  INDICE ALIASES
+#  ÍNDICE DE BUSCA APROXIMADA PARA O DICIONÁRIO DE UNIDADES (dicionario_editado.csv).
+#  RESOLVE GRAFIAS NOVAS (ACENTOS, "PROF." x "PROFESSOR", PONTUAÇÃO, PEQUENOS ERROS) PARA O NOME CANÔNICO MAIS PRÓXIMO,
+#  COM UM GRAU DE CONFIANÇA. O ÍNDICE É MONTADO UMA VEZ E GUARDADO EM DISCO (<dicionario>.indice.pkl).
+
+import hashlib
+import pickle
+import re
+
+from texto import chave_busca
+
+LIMIAR_CONFIANCA = 0.85  # confiança mínima para aceitar a sugestão
+MARGEM_AMBIGUIDADE = 0.05  # se dois canônicos diferentes empatam dentro dessa margem, não resolve
+PREFIXO_UNIDADE = "FATEC"  # só os canônicos de unidades entram no índice (o dicionário também traz os períodos)
+# Palavras que não distinguem unidades: "FATEC" está em todos os canônicos e só em parte dos aliases e das consultas,
+# então, se contasse, "Fatec Jaú" ficaria longe do alias "JAÚ"
+PALAVRAS_IGNORADAS = frozenset({"FATEC"})
+
+# Números ("2", "1O" de "1º") e romanos até XXXIX: "GUARULHOS II" é outra unidade, não uma grafia de "GUARULHOS"
+PADRAO_NUMERAL = re.compile(r"\d+[A-Z]?|X{0,3}(?:IX|IV|V?I{0,3})")
+
+def trigramas(chave: str) -> frozenset:
+    texto = f"  {chave} "
+    return frozenset(texto[i:i + 3] for i in range(len(texto) - 2))
+
+def chave_indice(texto: str) -> str:
+    return " ".join(t for t in chave_busca(texto).split() if t not in PALAVRAS_IGNORADAS)
+
+def numerais(tokens) -> frozenset:
+    return frozenset(t for t in tokens if PADRAO_NUMERAL.fullmatch(t))
+
+class IndiceAliases:
+    """
+    Índice invertido de trigramas de caracteres sobre as chaves (sem acentos, abreviações expandidas, sem "FATEC")
+    de todos os aliases e canônicos de unidades do dicionário (canônico começando com "FATEC").
+    A busca só compara a consulta com as entradas que compartilham algum trigrama raro,
+    então o custo não cresce com o tamanho do dicionário.
+    """
+
+    VERSAO = 3
+
+    def __init__(self, dmap: dict):
+        self.exatos = {}       # chave -> canônico
+        self.chaves = []       # chave de cada entrada
+        self.canonicos = []    # canônico de cada entrada
+        self.grams = []        # trigramas de cada entrada
+        self.tokens = []       # palavras de cada entrada
+        self.numerais = []     # números e romanos de cada entrada
+        self.postings = {}     # trigrama -> ids das entradas
+
+        unidades = {alias: canonico for alias, canonico in dmap.items()
+                    if canonico.upper().startswith(PREFIXO_UNIDADE)}
+        pares = list(unidades.items()) + [(canonico, canonico) for canonico in set(unidades.values())]
+        for alias, canonico in pares:
+            chave = chave_indice(alias)
+            if not chave or chave in self.exatos:
+                continue
+            self.exatos[chave] = canonico
+            id_entrada = len(self.chaves)
+            self.chaves.append(chave)
+            self.canonicos.append(canonico)
+            self.grams.append(trigramas(chave))
+            self.tokens.append(frozenset(chave.split()))
+            self.numerais.append(numerais(self.tokens[-1]))
+            for gram in self.grams[-1]:
+                self.postings.setdefault(gram, []).append(id_entrada)
+
+        self.limiar = LIMIAR_CONFIANCA
+
+        # Trigramas presentes em muitas entradas ("FAT", "TEC", ...) não servem para escolher candidatos
+        self.limite_frequencia = max(8, len(self.chaves) // 20)
+
+    def candidatos(self, grams):
+        raros = [g for g in grams if g in self.postings and len(self.postings[g]) <= self.limite_frequencia]
+        if not raros:
+            raros = [g for g in grams if g in self.postings]
+        ids = set()
+        for gram in raros:
+            ids.update(self.postings[gram])
+        return ids
+
+    def resolve(self, valor: str):
+        """
+        Retorna (canonico, confianca, sugestao).
+        canonico é None quando a confiança fica abaixo do limiar ou há empate entre canônicos diferentes;
+        sugestao é sempre o canônico mais próximo encontrado (ou None).
+        Entradas com números ou romanos diferentes dos da consulta nunca são candidatas.
+        """
+        chave = chave_indice(valor)
+        if not chave:
+            return None, 0.0, None
+        if chave in self.exatos:
+            return self.exatos[chave], 1.0, self.exatos[chave]
+
+        grams = trigramas(chave)
+        tokens = frozenset(chave.split())
+        numerais_consulta = numerais(tokens)
+        melhores = {}  # canônico -> maior confiança
+        for id_entrada in self.candidatos(grams):
+            if self.numerais[id_entrada] != numerais_consulta:
+                continue
+            comuns = len(grams & self.grams[id_entrada])
+            dice = 2 * comuns / (len(grams) + len(self.grams[id_entrada]))
+            jaccard = len(tokens & self.tokens[id_entrada]) / len(tokens | self.tokens[id_entrada])
+            confianca = max(dice, jaccard)
+            canonico = self.canonicos[id_entrada]
+            if confianca > melhores.get(canonico, 0.0):
+                melhores[canonico] = confianca
+
+        if not melhores:
+            return None, 0.0, None
+
+        ordenados = sorted(melhores.items(), key=lambda item: item[1], reverse=True)
+        sugestao, confianca = ordenados[0]
+        ambiguo = len(ordenados) > 1 and confianca - ordenados[1][1] < MARGEM_AMBIGUIDADE
+        if confianca < self.limiar or ambiguo:
+            return None, confianca, sugestao
+        return sugestao, confianca, sugestao
+
+def carrega_indice(dict_csv_path: str, dmap: dict, cache_path: str = None) -> IndiceAliases:
+    """
+    Carrega o índice do cache em disco se ele foi montado a partir do mesmo dicionário (mesmo hash);
+    senão monta de novo e atualiza o cache.
+    """
+    cache_path = cache_path or f"{dict_csv_path}.indice.pkl"
+    with open(dict_csv_path, "rb") as arquivo:
+        hash_dicionario = hashlib.sha256(arquivo.read()).hexdigest()
+
+    try:
+        with open(cache_path, "rb") as arquivo:
+            cache = pickle.load(arquivo)
+        if cache.get("versao") == IndiceAliases.VERSAO and cache.get("hash") == hash_dicionario:
+            return cache["indice"]
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, KeyError, TypeError, ValueError):
+        # Cache corrompido ou de outra versão do código (ex.: módulo renomeado): o índice é montado de novo
+        pass
+
+    indice = IndiceAliases(dmap)
+    try:
+        with open(cache_path, "wb") as arquivo:
+            pickle.dump({"versao": IndiceAliases.VERSAO, "hash": hash_dicionario, "indice": indice}, arquivo)
+    except OSError as e:
+        print(f"[AVISO] não foi possível gravar o cache do índice '{cache_path}': {e}")
+    return indice
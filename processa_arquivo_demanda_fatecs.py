@@ -1,16 +1,45 @@
 #  PROCESSA ARQUIVO DEMANDA FATECS (PÓS PROCESSAMENTO DE busca_demanda_vestibular_fatec.py)
 #  ESTE PROGRAMA FAZ O PÓS PROCESSAMENTO DO ARQUIVO todas_fatecs_demanda.csv, NORMALIZANDO O NOME DAS UNIDADES.
 #  NO FINAL, ELE GERA UM ARQUIVO CSV COM OS DADOS NORMALIZADOS (todas_fatecs_demanda_normalizado.csv).
+#  UNIDADES QUE NÃO ESTÃO NO DICIONÁRIO SÃO RESOLVIDAS POR BUSCA APROXIMADA (indice_aliases.py); O QUE FOI RESOLVIDO
+#  ASSIM, OU NÃO PÔDE SER, FICA NO RELATÓRIO relatorio_aliases.csv PARA REVISÃO DO DICIONÁRIO.
+#  TAMBÉM GERA UMA CÓPIA TIPADA EM PARQUET (todas_fatecs_demanda_normalizado.parquet/), PARTICIONADA POR Ano/Semestre,
+#  COM Inscritos/Vagas INTEIROS, Demanda DECIMAL E Unidade/Curso/Período CATEGÓRICOS (PRECISA DO pyarrow).
+#  E MANTÉM O CUBO DE AGREGADOS demanda_cubo.sqlite (cubo_demanda.py), ONDE SÓ OS SEMESTRES NOVOS OU ALTERADOS SÃO
+#  REGRAVADOS; AS PERGUNTAS DO DIA A DIA (TENDÊNCIA POR UNIDADE, CURSOS MAIS PROCURADOS, DEMANDA POR PERÍODO) SAEM DELE.
+#  O ARQUIVO É LIDO E GRAVADO EM BLOCOS (--chunksize), ENTÃO O USO DE MEMÓRIA NÃO CRESCE COM O TAMANHO DA ENTRADA.
 #  DANIEL RODRIGUES DE SOUSA 27/12/2025
 
+import argparse
+import json
+import os
+import shutil
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # o Parquet é opcional
+    pa = pq = None
+
+from cubo_demanda import ARQUIVO_CUBO, AcumuladorCubo, abre_cubo, atualiza_cubo
+from indice_aliases import LIMIAR_CONFIANCA, carrega_indice
+
 # Configuração de arquivos
 INPUT_CSV = "todas_fatecs_demanda.csv"                       # arquivo original com os dados
                                                              # gerado pelo busca_demanda_vestibular_fatec.py
 OUTPUT_NORMALIZED = "todas_fatecs_demanda_normalizado.csv"   # saída final
 DICT_TEMPLATE = "dicionario.csv"                             # gerado com valores únicos (útil para a criação do dicionário)
 DICT_CSV = "dicionario_editado.csv"                          # seu dicionário editado (um alias por linha)
+OUTPUT_PARQUET = "todas_fatecs_demanda_normalizado.parquet"  # pasta com o Parquet particionado por Ano/Semestre
+RELATORIO_ALIASES = "relatorio_aliases.csv"                 # valores fora do dicionário (resolvidos ou não)
+CHUNKSIZE = 100_000                                          # linhas lidas por bloco
+
+COLUNAS_NORMALIZADAS = ["Unidade", "Período"]
+COLUNAS_APROXIMADAS = ["Unidade"]                            # colunas com busca aproximada no dicionário
+COLUNAS_CATEGORICAS = ["Unidade", "Curso", "Período"]
+COLUNAS_PARTICAO = ["Ano", "Semestre"]
 
 # Normalização mínima: só espaços (colapsa internos + strip)
 def normalize_space(s: str) -> str:
@@ -34,71 +63,218 @@ def build_alias_mapping(dict_csv_path: str):
         dic.rename(columns={dic.columns[1]: "canonical"}, inplace=True)
 
     dmap = {}
-    for _, row in dic.iterrows():
-        alias = normalize_space(str(row.get("aliases", "")))
-        canonical = normalize_space(str(row.get("canonical", "")))
-        key = alias.upper()
+    for alias, canonical in zip(dic["aliases"].astype(str), dic["canonical"].astype(str)):
+        key = normalize_space(alias).upper()
         if key:
-            dmap[key] = canonical
+            dmap[key] = normalize_space(canonical)
     return dmap
 
-# Normaliza e aplica o mapa para um campo específico
-def normalize_column(df: pd.DataFrame, column_name: str, dmap: dict) -> pd.DataFrame:
+# Normaliza um valor: espaços e, se houver, o canônico do dicionário (exato ou, com índice, aproximado)
+def normalize_value(valor: str, dmap: dict, indice=None, relatorio: list = None) -> str:
+    norm = normalize_space(valor)
+    key = norm.upper()
+    if key in dmap or indice is None or not norm:
+        return dmap.get(key, norm)
+
+    canonical, confianca, sugestao = indice.resolve(norm)
+    if relatorio is not None:
+        relatorio.append({
+            "valor": norm,
+            "sugestao": sugestao or "",
+            "confianca": round(confianca, 3),
+            "status": "resolvido" if canonical else "nao_resolvido",
+        })
+    return canonical or norm
+
+# Normaliza e aplica o mapa em uma série, uma vez por valor distinto
+def normalize_values(serie: pd.Series, dmap: dict, cache: dict = None, indice=None, relatorio: list = None) -> np.ndarray:
+    """
+    Fatoriza a série (códigos + valores únicos), normaliza só os valores únicos e
+    expande de volta pelos códigos. O cache (valor bruto -> normalizado) pode ser
+    compartilhado entre blocos, para que cada valor distinto seja tratado uma única vez no arquivo.
+    """
+    if cache is None:
+        cache = {}
+    codigos, unicos = pd.factorize(serie.astype(str))
+    normalizados = np.empty(len(unicos), dtype=object)
+    for i, valor in enumerate(unicos):
+        if valor not in cache:
+            cache[valor] = normalize_value(valor, dmap, indice, relatorio)
+        normalizados[i] = cache[valor]
+    return normalizados.take(codigos)
+
+# Normaliza e aplica o mapa para um campo específico (altera o próprio DataFrame, sem cópia)
+def normalize_column(df: pd.DataFrame, column_name: str, dmap: dict, cache: dict = None,
+                     indice=None, relatorio: list = None) -> pd.DataFrame:
     if column_name not in df.columns:
         raise KeyError(f"Coluna '{column_name}' não encontrada no CSV.")
-    out = df.copy()
-    norm_before = out[column_name].astype(str).apply(normalize_space)
-    keys_upper = norm_before.str.upper()
-    canon = keys_upper.map(lambda k: dmap.get(k, None))
-    out[column_name] = norm_before
-    mask = canon.notna()
-    out.loc[mask, column_name] = canon[mask].values
-    return out
+    df[column_name] = normalize_values(df[column_name], dmap, cache, indice, relatorio)
+    return df
+
+# Processa o arquivo em blocos: normaliza, grava o bloco e guarda só os valores únicos para o template
+def processa_em_blocos(input_csv: str, output_csv: str, dmap: dict, chunksize: int = CHUNKSIZE, indice=None,
+                       parquet_dir: str = None, cubo: AcumuladorCubo = None):
+    """
+    Com parquet_dir, cada bloco normalizado também é gravado tipado em Parquet (particionado por Ano/Semestre).
+    Com cubo, cada bloco normalizado é somado no acumulador do cubo de agregados.
+    Retorna (linhas_processadas, unicos, relatorios):
+      - unicos: {coluna: {alias_normalizado: None}} com os valores únicos, na ordem em que apareceram
+      - relatorios: {coluna: [linhas do relatório]} dos valores fora do dicionário (só com índice)
+    """
+    caches = {coluna: {} for coluna in COLUNAS_NORMALIZADAS}
+    unicos = {coluna: {} for coluna in COLUNAS_NORMALIZADAS}
+    relatorios = {coluna: [] for coluna in COLUNAS_NORMALIZADAS}
+    linhas = 0
+
+    if parquet_dir and os.path.isdir(parquet_dir):
+        shutil.rmtree(parquet_dir)  # write_to_dataset acrescenta arquivos: começa sempre do zero
+
+    leitor = pd.read_csv(input_csv, encoding="utf-8", dtype=str, keep_default_na=False, chunksize=chunksize)
+    with open(output_csv, mode="w", newline="", encoding="utf-8") as saida:
+        for i, bloco in enumerate(leitor):
+            for coluna in COLUNAS_NORMALIZADAS:
+                if coluna not in bloco.columns:
+                    continue
+                # Template: valores só com espaços normalizados (antes do dicionário)
+                for valor in pd.unique(bloco[coluna]):
+                    unicos[coluna].setdefault(normalize_space(valor), None)
+                normalize_column(bloco, coluna, dmap, caches[coluna],
+                                 indice if coluna in COLUNAS_APROXIMADAS else None, relatorios[coluna])
+
+            bloco.to_csv(saida, index=False, header=(i == 0))
+            if parquet_dir or cubo is not None:
+                tipado = tipa_bloco(bloco)
+                if parquet_dir:
+                    grava_bloco_parquet(tipado, parquet_dir, i)
+                if cubo is not None:
+                    cubo.adiciona(tipado)
+            linhas += len(bloco)
+
+    return linhas, unicos, relatorios
+
+# Converte números no formato brasileiro ("1.204", "15,05") para número; o que não for número vira nulo
+def parse_numero_br(serie: pd.Series) -> pd.Series:
+    texto = serie.astype(str).str.strip().str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    return pd.to_numeric(texto, errors="coerce")
+
+# Bloco com os tipos certos para análise
+def tipa_bloco(bloco: pd.DataFrame) -> pd.DataFrame:
+    tipado = pd.DataFrame({
+        "Ano": parse_numero_br(bloco["Ano"]).astype("Int16"),
+        "Semestre": parse_numero_br(bloco["Semestre"]).astype("Int8"),
+        "Inscritos": parse_numero_br(bloco["Inscritos"]).astype("Int64"),
+        "Vagas": parse_numero_br(bloco["Vagas"]).astype("Int64"),
+        "Demanda": parse_numero_br(bloco["Demanda"]).astype("float64"),
+    })
+    for coluna in COLUNAS_CATEGORICAS:
+        tipado[coluna] = bloco[coluna].astype("category")
+    return tipado[["Ano", "Semestre", "Unidade", "Curso", "Período", "Inscritos", "Vagas", "Demanda"]]
+
+def schema_parquet():
+    # Esquema fixo: todos os blocos gravam os mesmos tipos, inclusive os dicionários das categorias
+    categoria = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("Ano", pa.int16()),
+        ("Semestre", pa.int8()),
+        ("Unidade", categoria),
+        ("Curso", categoria),
+        ("Período", categoria),
+        ("Inscritos", pa.int64()),
+        ("Vagas", pa.int64()),
+        ("Demanda", pa.float64()),
+    ])
+
+def grava_bloco_parquet(tipado: pd.DataFrame, pasta: str, numero_bloco: int):
+    tabela = pa.Table.from_pandas(tipado, schema=schema_parquet(), preserve_index=False)
+
+    # As colunas de partição saem dos arquivos e voltam na leitura com o tipo da partição;
+    # se continuarem nos metadados do pandas, a leitura da pasta inteira falha no conflito de tipos
+    metadados = json.loads(tabela.schema.metadata[b"pandas"])
+    metadados["columns"] = [c for c in metadados["columns"] if c["name"] not in COLUNAS_PARTICAO]
+    tabela = tabela.replace_schema_metadata({b"pandas": json.dumps(metadados).encode("utf-8")})
+    pq.write_to_dataset(
+        tabela,
+        root_path=pasta,
+        partition_cols=COLUNAS_PARTICAO,
+        basename_template=f"bloco{numero_bloco:05d}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+def grava_template(unicos: dict, dict_template: str) -> int:
+    # Gera template com valores únicos de Unidade e Período (já normalizadas)
+    templates = []
+    for coluna in COLUNAS_NORMALIZADAS:
+        if unicos.get(coluna):
+            aliases = list(unicos[coluna])
+            templates.append(pd.DataFrame({"aliases": aliases, "canonical": aliases}))
+
+    # Concatena e salva template único
+    template_df = pd.concat(templates, ignore_index=True) if templates else pd.DataFrame(columns=["aliases", "canonical"])
+    template_df.to_csv(dict_template, index=False, encoding="utf-8")
+    return len(template_df)
+
+def grava_relatorio_aliases(relatorios: dict, caminho: str) -> dict:
+    linhas = [{"coluna": coluna, **linha} for coluna, itens in relatorios.items() for linha in itens]
+    pd.DataFrame(linhas, columns=["coluna", "valor", "sugestao", "confianca", "status"]).to_csv(
+        caminho, index=False, encoding="utf-8")
+    resolvidos = sum(1 for linha in linhas if linha["status"] == "resolvido")
+    return {"resolvidos": resolvidos, "nao_resolvidos": len(linhas) - resolvidos}
 
 # Fluxo principal
-df = pd.read_csv(INPUT_CSV, encoding="utf-8")
-
-# Gera template com valores únicos de Unidade e Período (já normalizadas)
-templates = []
-
-# Unidade
-if "Unidade" in df.columns:
-    uniq_un = (
-        pd.DataFrame({"Unidade": df["Unidade"].astype(str)})
-        .assign(aliases=lambda d: d["Unidade"].apply(normalize_space))
-        .drop_duplicates(subset=["aliases"])
-    )[["aliases"]]
-    uniq_un["canonical"] = uniq_un["aliases"]
-    templates.append(uniq_un[["aliases", "canonical"]])
-
-# Período
-if "Período" in df.columns:
-    uniq_pe = (
-        pd.DataFrame({"Período": df["Período"].astype(str)})
-        .assign(aliases=lambda d: d["Período"].apply(normalize_space))
-        .drop_duplicates(subset=["aliases"])
-    )[["aliases"]]
-    uniq_pe["canonical"] = uniq_pe["aliases"]
-    templates.append(uniq_pe[["aliases", "canonical"]])
-
-# Concatena e salva template único
-template_df = pd.concat(templates, ignore_index=True)
-template_df.to_csv(DICT_TEMPLATE, index=False, encoding="utf-8")
-
-# Carrega seu dicionário (ou use o template)
-dmap = build_alias_mapping(DICT_CSV)
-
-# Aplica normalização e mapeamento nas duas colunas
-out = df.copy()
-out = normalize_column(out, "Unidade", dmap)
-out = normalize_column(out, "Período", dmap)
-
-# Salva saída final
-out.to_csv(OUTPUT_NORMALIZED, index=False, encoding="utf-8")
-
-print({
-    "linhas_no_arquivo": len(df),
-    "linhas_no_dicionario": len(template_df),
-    "arquivo_dicionario": DICT_TEMPLATE,
-    "arquivo_gerado": OUTPUT_NORMALIZED
-})
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Normaliza Unidade e Período do arquivo de demanda das Fatecs.")
+    parser.add_argument("--entrada", default=INPUT_CSV, help=f"CSV de entrada (padrão: {INPUT_CSV})")
+    parser.add_argument("--saida", default=OUTPUT_NORMALIZED, help=f"CSV normalizado (padrão: {OUTPUT_NORMALIZED})")
+    parser.add_argument("--dicionario", default=DICT_CSV, help=f"dicionário editado (padrão: {DICT_CSV})")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE,
+                        help=f"linhas lidas por bloco (padrão: {CHUNKSIZE})")
+    parser.add_argument("--parquet", default=OUTPUT_PARQUET,
+                        help=f"pasta do Parquet tipado (padrão: {OUTPUT_PARQUET})")
+    parser.add_argument("--sem-parquet", action="store_true", help="não gera o Parquet tipado")
+    parser.add_argument("--cubo", default=ARQUIVO_CUBO,
+                        help=f"cubo de agregados, atualizado por semestre (padrão: {ARQUIVO_CUBO})")
+    parser.add_argument("--sem-cubo", action="store_true", help="não atualiza o cubo de agregados")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_CONFIANCA,
+                        help=f"confiança mínima da busca aproximada (padrão: {LIMIAR_CONFIANCA})")
+    parser.add_argument("--sem-aproximacao", action="store_true",
+                        help="usa só as correspondências exatas do dicionário")
+    args = parser.parse_args(argv)
+
+    # Carrega seu dicionário (ou use o template)
+    dmap = build_alias_mapping(args.dicionario)
+    indice = None
+    if not args.sem_aproximacao:
+        indice = carrega_indice(args.dicionario, dmap)
+        indice.limiar = args.limiar
+
+    parquet_dir = None if args.sem_parquet else args.parquet
+    if parquet_dir and pa is None:
+        print("[AVISO] pyarrow não está instalado: o Parquet tipado não será gerado (pip install pyarrow).")
+        parquet_dir = None
+
+    # Aplica normalização e mapeamento nas duas colunas, bloco a bloco
+    acumulador = None if args.sem_cubo else AcumuladorCubo()
+    linhas, unicos, relatorios = processa_em_blocos(args.entrada, args.saida, dmap, args.chunksize, indice,
+                                                    parquet_dir, acumulador)
+    situacao_cubo = None
+    if acumulador is not None:
+        con = abre_cubo(args.cubo)
+        try:
+            situacao_cubo = atualiza_cubo(con, acumulador.resultado())
+        finally:
+            con.close()
+    linhas_template = grava_template(unicos, DICT_TEMPLATE)
+    aproximados = grava_relatorio_aliases(relatorios, RELATORIO_ALIASES) if indice else {}
+
+    print({
+        "linhas_no_arquivo": linhas,
+        "linhas_no_dicionario": linhas_template,
+        "arquivo_dicionario": DICT_TEMPLATE,
+        "arquivo_gerado": args.saida,
+        **({"arquivo_parquet": parquet_dir} if parquet_dir else {}),
+        **({"aliases_aproximados": aproximados, "arquivo_relatorio": RELATORIO_ALIASES} if indice else {}),
+        **({"arquivo_cubo": args.cubo, "semestres_no_cubo": situacao_cubo} if situacao_cubo else {}),
+    })
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,309 @@
 #  QRCODE GENERATOR
 #  ESTE PROGRAMA GERA UM QRCODE, PASSANDO UMA URL. SALVA NO ARQUIVO qrcode_personalizado.png
+#  COM --lote ARQUIVO.csv (COLUNAS id,payload), GERA UM QRCODE POR LINHA EM PARALELO: UM PNG/SVG POR LINHA
+#  OU UMA FOLHA EM PDF PARA IMPRESSÃO (VÁRIOS QRCODES POR PÁGINA, COM LEGENDA). OS QRCODES FICAM EM CACHE
+#  (PELO payload E PELAS OPÇÕES), ENTÃO UMA NOVA EXECUÇÃO SÓ GERA AS LINHAS QUE MUDARAM.
+#  NO LOTE, OS QRCODES SÃO DESENHADOS DIRETO DA MATRIZ DE MÓDULOS (desenha_qrcode.py), SEM O PIL.
+#  --benchmark N COMPARA ESSE CAMINHO COM O qr.make_image E CONFERE SE OS PIXELS SÃO IGUAIS.
+#      python qrcode_generator.py --lote cursos.csv --formato pdf --saida qrcodes
 #  DANIEL RODRIGUES DE SOUSA 04/08/2024
 
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import qrcode
+from PIL import Image
+
+from desenha_qrcode import png_qrcode, svg_qrcode
+from texto import nome_arquivo_seguro
+
+FONT_PATH = "DejaVuSans.ttf"
+PASTA_SAIDA = "qrcodes"
+VERSAO_CACHE = 2  # mude se a forma de desenhar mudar, para invalidar o cache
+FORMATOS = ("png", "svg", "pdf")
+CORRECOES = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H,
+}
+
+# Folha em PDF (A4, medidas em mm)
+COLUNAS_FOLHA = 4
+MARGEM_FOLHA = 10
+ESPACO_FOLHA = 6
+ALTURA_LEGENDA = 8
+
+def cria_qrcode(payload, correcao="L", box_size=5, border=0):
+    # Crie o QRCode com opções de personalização
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=CORRECOES[correcao],
+        box_size=box_size,
+        border=border)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    return qr
+
+def gera_qrcode(link, arquivo="qrcode_personalizado.png"):
+    qr = cria_qrcode(link)
+    imagem = qr.make_image(fill_color="black", back_color="white")
+
+    # Salve a imagem personalizada
+    imagem.save(arquivo)
+
+# ======================================================
+# MODO LOTE
+# ======================================================
+def le_lote(caminho):
+    """Lê o CSV com as colunas id e payload. Retorna [(id, payload)] sem linhas vazias nem ids repetidos."""
+    with open(caminho, newline="", encoding="utf-8-sig") as arquivo:
+        leitor = csv.DictReader(arquivo)
+        if not leitor.fieldnames or not {"id", "payload"} <= set(leitor.fieldnames):
+            raise ValueError(f"'{caminho}' precisa das colunas id e payload (tem: {leitor.fieldnames}).")
+        linhas = []
+        vistos = set()
+        for numero, linha in enumerate(leitor, start=2):
+            identificador, payload = (linha["id"] or "").strip(), linha["payload"] or ""
+            if not identificador or not payload:
+                continue
+            if identificador in vistos:
+                print(f"[AVISO] linha {numero}: id '{identificador}' repetido, ignorado.")
+                continue
+            vistos.add(identificador)
+            linhas.append((identificador, payload))
+    return linhas
+
+def chave_cache(payload, opcoes, extensao):
+    conteudo = json.dumps([VERSAO_CACHE, payload, opcoes, extensao], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+def renderiza(payload, opcoes, extensao):
+    """Executada em um processo do pool: monta a matriz do QRCode e devolve o arquivo (PNG ou SVG) em bytes."""
+    qr = cria_qrcode(payload, opcoes["correcao"], opcoes["box_size"], opcoes["border"])
+    if extensao == "svg":
+        return svg_qrcode(qr).encode("utf-8")
+    return png_qrcode(qr)
+
+def nome_arquivo(identificador, extensao):
+    return nome_arquivo_seguro(identificador) + "." + extensao
+
+def nomes_arquivos(identificadores, extensao):
+    """
+    Nome de arquivo de cada id. Ids diferentes que dariam o mesmo nome ("QR 1" e "QR_1", ou só maiúsculas diferentes,
+    que colidem em sistemas de arquivos sem distinção) não se sobrescrevem: do segundo em diante, o nome ganha um
+    sufixo tirado do próprio id, então é sempre o mesmo de uma execução para outra.
+    """
+    nomes = []
+    usados = {}  # nome em minúsculas -> id que ficou com ele
+    for identificador in identificadores:
+        nome = nome_arquivo(identificador, extensao)
+        if nome.lower() in usados:
+            sufixo = hashlib.sha256(identificador.encode("utf-8")).hexdigest()[:8]
+            print(f"[AVISO] id '{identificador}' daria o mesmo arquivo que '{usados[nome.lower()]}' ({nome}); "
+                  f"gravado com o sufixo _{sufixo}.")
+            nome = nome_arquivo(f"{identificador}_{sufixo}", extensao)
+        usados[nome.lower()] = identificador
+        nomes.append(nome)
+    return nomes
+
+def gera_folha_pdf(itens, caminho_saida, font_path=FONT_PATH, colunas=COLUNAS_FOLHA):
+    """Folha A4 com os QRCodes em grade (colunas por linha) e o id como legenda embaixo de cada um."""
+    from fpdf import FPDF
+
+    pdf = FPDF(orientation="P", unit="mm", format="A4")
+    pdf.set_auto_page_break(auto=False)
+    pdf.set_margins(MARGEM_FOLHA, MARGEM_FOLHA, MARGEM_FOLHA)
+    pdf.add_font("DejaVu", "", font_path)
+    pdf.set_font("DejaVu", size=8)
+
+    lado = (pdf.w - 2 * MARGEM_FOLHA - (colunas - 1) * ESPACO_FOLHA) / colunas
+    altura_celula = lado + ALTURA_LEGENDA + ESPACO_FOLHA
+    linhas_por_pagina = max(1, int((pdf.h - 2 * MARGEM_FOLHA + ESPACO_FOLHA) // altura_celula))
+    por_pagina = linhas_por_pagina * colunas
+
+    for posicao, (identificador, caminho_png) in enumerate(itens):
+        if posicao % por_pagina == 0:
+            pdf.add_page()
+        linha, coluna = divmod(posicao % por_pagina, colunas)
+        x = MARGEM_FOLHA + coluna * (lado + ESPACO_FOLHA)
+        y = MARGEM_FOLHA + linha * altura_celula
+        pdf.image(caminho_png, x=x, y=y, w=lado, h=lado)
+
+        legenda = identificador
+        while len(legenda) > 1 and pdf.get_string_width(legenda) > lado:
+            legenda = legenda[:-2] + "…"
+        pdf.set_xy(x, y + lado + 1)
+        pdf.cell(lado, ALTURA_LEGENDA - 2, legenda, align="C")
+
+    pdf.output(caminho_saida)
+
+def gera_lote(caminho_csv, pasta_saida=PASTA_SAIDA, formato="png", processos=None, opcoes=None,
+              colunas=COLUNAS_FOLHA, font_path=FONT_PATH):
+    """
+    Gera os QRCodes do CSV em pasta_saida. Os PNG/SVG ficam em <pasta_saida>/cache/<chave>.<ext>, com a chave
+    calculada do payload e das opções: só as linhas sem arquivo em cache são desenhadas (em paralelo).
+    formato "png"/"svg": um arquivo por id em pasta_saida (só regravado se mudou); "pdf": qrcodes.pdf em folhas A4.
+    Retorna {"linhas", "renderizados", "gravados", "segundos"}.
+    """
+    inicio = time.perf_counter()
+    opcoes = opcoes or {"correcao": "L", "box_size": 5, "border": 0}
+    extensao = "svg" if formato == "svg" else "png"
+    pasta_cache = os.path.join(pasta_saida, "cache")
+    os.makedirs(pasta_cache, exist_ok=True)
+
+    linhas = le_lote(caminho_csv)
+    chaves = [chave_cache(payload, opcoes, extensao) for _, payload in linhas]
+
+    def em_cache(chave):
+        return os.path.join(pasta_cache, f"{chave}.{extensao}")
+
+    # Só desenha o que não está em cache (payloads repetidos são desenhados uma vez)
+    faltando = {}
+    for (_, payload), chave in zip(linhas, chaves):
+        if chave not in faltando and not os.path.exists(em_cache(chave)):
+            faltando[chave] = payload
+
+    if faltando:
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            n = len(faltando)
+            conteudos = executor.map(renderiza, faltando.values(), [opcoes] * n, [extensao] * n,
+                                     chunksize=max(1, n // (4 * (processos or os.cpu_count() or 1))))
+            for chave, conteudo in zip(faltando, conteudos):
+                with open(em_cache(chave) + ".tmp", "wb") as arquivo:
+                    arquivo.write(conteudo)
+                os.replace(em_cache(chave) + ".tmp", em_cache(chave))
+
+    gravados = 0
+    if formato == "pdf":
+        gera_folha_pdf([(identificador, em_cache(chave)) for (identificador, _), chave in zip(linhas, chaves)],
+                       os.path.join(pasta_saida, "qrcodes.pdf"), font_path, colunas)
+        gravados = 1
+    else:
+        # Um manifesto por formato: gerar SVG depois de PNG (ou o contrário) não invalida os arquivos do outro
+        caminho_manifesto = os.path.join(pasta_saida, f"manifesto_{extensao}.csv")
+        anteriores = {}
+        if os.path.exists(caminho_manifesto):
+            with open(caminho_manifesto, newline="", encoding="utf-8") as arquivo:
+                anteriores = {linha["arquivo"]: linha["chave"] for linha in csv.DictReader(arquivo)}
+
+        manifesto = []
+        arquivos = nomes_arquivos([identificador for identificador, _ in linhas], extensao)
+        for (identificador, payload), chave, arquivo in zip(linhas, chaves, arquivos):
+            destino = os.path.join(pasta_saida, arquivo)
+            if anteriores.get(arquivo) != chave or not os.path.exists(destino):
+                shutil.copyfile(em_cache(chave), destino)
+                gravados += 1
+            manifesto.append({"id": identificador, "payload": payload, "chave": chave, "arquivo": arquivo})
+
+        with open(caminho_manifesto, "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=["id", "payload", "chave", "arquivo"])
+            escritor.writeheader()
+            escritor.writerows(manifesto)
+
+    return {"linhas": len(linhas), "renderizados": len(faltando), "gravados": gravados,
+            "segundos": time.perf_counter() - inicio}
+
+# ======================================================
+# BENCHMARK: qr.make_image x MATRIZ + NUMPY
+# ======================================================
+def benchmark(quantidade, opcoes=None):
+    """
+    Mede, para os mesmos QRCodes já montados, o tempo de gerar o PNG pelo qr.make_image (PIL) e pelo
+    desenha_qrcode (NumPy), e confere pixel a pixel se as duas imagens são iguais. Retorna o resumo.
+    Os payloads vêm do mesmo gerador do benchmark.py (dados_sinteticos.gera_payloads_csv).
+    """
+    from dados_sinteticos import gera_payloads_csv
+
+    opcoes = opcoes or {"correcao": "L", "box_size": 5, "border": 0}
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_csv = os.path.join(pasta, "payloads.csv")
+        gera_payloads_csv(caminho_csv, quantidade)
+        payloads = [payload for _, payload in le_lote(caminho_csv)]
+    inicio = time.perf_counter()
+    qrs = [cria_qrcode(p, opcoes["correcao"], opcoes["box_size"], opcoes["border"]) for p in payloads]
+    tempo_matriz = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    pngs_pil = []
+    for qr in qrs:
+        saida = io.BytesIO()
+        qr.make_image(fill_color="black", back_color="white").save(saida)
+        pngs_pil.append(saida.getvalue())
+    tempo_pil = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    pngs_numpy = [png_qrcode(qr) for qr in qrs]
+    tempo_numpy = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for qr in qrs:
+        svg_qrcode(qr)
+    tempo_svg = time.perf_counter() - inicio
+
+    diferentes = sum(
+        1 for png_pil, png_numpy in zip(pngs_pil, pngs_numpy)
+        if not np.array_equal(np.asarray(Image.open(io.BytesIO(png_pil)).convert("L")),
+                              np.asarray(Image.open(io.BytesIO(png_numpy)).convert("L")))
+    )
+
+    resumo = {"quantidade": quantidade, "matriz_s": tempo_matriz, "make_image_s": tempo_pil,
+              "numpy_s": tempo_numpy, "svg_s": tempo_svg, "diferentes": diferentes}
+
+    def por_imagem(segundos):
+        return 1e6 * segundos / quantidade
+
+    print(f"{quantidade} QRCodes (box_size={opcoes['box_size']}, border={opcoes['border']}):")
+    print(f"  montar a matriz (qr.make):   {por_imagem(tempo_matriz):8.0f} µs/QRCode")
+    print(f"  PNG pelo qr.make_image:      {por_imagem(tempo_pil):8.0f} µs/QRCode")
+    print(f"  PNG pelo NumPy:              {por_imagem(tempo_numpy):8.0f} µs/QRCode "
+          f"({tempo_pil / tempo_numpy:.1f}x mais rápido)")
+    print(f"  SVG em texto:                {por_imagem(tempo_svg):8.0f} µs/QRCode")
+    print("  pixels idênticos: " + ("sim" if diferentes == 0 else f"NÃO ({diferentes} imagem(ns) diferente(s))"))
+    return resumo
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera QRCodes: um link só ou um lote a partir de um CSV (id,payload).")
+    parser.add_argument("link", nargs="?", default="https://encurtador.com.br/AgKPH",
+                        help="link do QRCode único (salvo em qrcode_personalizado.png)")
+    parser.add_argument("--lote", metavar="ARQUIVO_CSV", help="CSV com as colunas id,payload")
+    parser.add_argument("--saida", default=PASTA_SAIDA, help=f"pasta do lote (padrão: {PASTA_SAIDA})")
+    parser.add_argument("--formato", choices=FORMATOS, default="png",
+                        help="png/svg: um arquivo por linha; pdf: folhas A4 para impressão (padrão: png)")
+    parser.add_argument("--processos", type=int, default=None, help="processos (padrão: núcleos da CPU)")
+    parser.add_argument("--colunas", type=int, default=COLUNAS_FOLHA,
+                        help=f"QRCodes por linha na folha PDF (padrão: {COLUNAS_FOLHA})")
+    parser.add_argument("--correcao", choices=sorted(CORRECOES), default="L", help="correção de erros (padrão: L)")
+    parser.add_argument("--box-size", type=int, default=5, help="pixels por módulo (padrão: 5)")
+    parser.add_argument("--border", type=int, default=0, help="borda em módulos (padrão: 0)")
+    parser.add_argument("--benchmark", type=int, metavar="N",
+                        help="compara qr.make_image com o desenho pelo NumPy em N QRCodes e confere os pixels")
+    args = parser.parse_args(argv)
+
+    opcoes = {"correcao": args.correcao, "box_size": args.box_size, "border": args.border}
+    if args.benchmark:
+        resumo = benchmark(args.benchmark, opcoes)
+        if resumo["diferentes"]:
+            raise SystemExit(1)
+        return
+
+    if not args.lote:
+        gera_qrcode(args.link)
+        return
+
+    resumo = gera_lote(args.lote, args.saida, args.formato, args.processos, opcoes, args.colunas)
+    print(f"{resumo['linhas']} QRCode(s): {resumo['renderizados']} desenhado(s), "
+          f"{resumo['linhas'] - resumo['renderizados']} do cache (ou repetidos), {resumo['gravados']} arquivo(s) gravado(s) "
+          f"em '{args.saida}' ({resumo['segundos']:.2f} s).")
 
-# Insira o link
-link = "https://encurtador.com.br/AgKPH"
-
-# Crie o QRCode com opções de personalização
-qr = qrcode.QRCode(
-    version=1,
-    error_correction=qrcode.constants.ERROR_CORRECT_L,
-    box_size=5,
-    border=0)
-qr.add_data(link)
-qr.make(fit=True)
-imagem = qr.make_image(fill_color="black", back_color="white")
-
-# Salve a imagem personalizada
-imagem.save("qrcode_personalizado.png")
+if __name__ == "__main__":
+    main()
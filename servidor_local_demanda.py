@@ -0,0 +1,141 @@
+#  SERVIDOR LOCAL DEMANDA
+#  ESTE PROGRAMA SOBE UM SERVIDOR HTTP LOCAL QUE IMITA A PÁGINA DE DEMANDA DA CESU (https://vestibular.fatec.sp.gov.br/demanda/),
+#  RESPONDENDO COM AS PÁGINAS GRAVADAS NA PASTA paginas_demanda. SERVE PARA TESTAR O busca_demanda_vestibular_fatec.py SEM INTERNET:
+#      python servidor_local_demanda.py --porta 8765
+#      python busca_demanda_vestibular_fatec.py --motor http --url http://127.0.0.1:8765/demanda/
+#  PÁGINAS GRAVADAS:
+#      inicio.html                  -> formulário inicial (select ano-sem)
+#      <ano_sem>.html               -> formulário depois de escolher o ano_sem (select FATEC)
+#      <ano_sem>_<UNIDADE>.html     -> tabela table-striped da unidade (UNIDADE sem acentos, espaços trocados por _)
+#  COM --documentos PASTA, TAMBÉM SERVE OS ARQUIVOS DA PASTA (E DAS SUBPASTAS) EM /documentos/<caminho>, COM ETag E Last-Modified
+#  (RESPONDE 304 ÀS REQUISIÇÕES CONDICIONAIS), PARA TESTAR O DOWNLOAD DOS EDITAIS/FICHAS/TABELAS (baixa_documentos.py).
+#  COM --cgesg ARQUIVO.csv, SERVE ESSE CSV EM /cgesg/editais.csv (NO LUGAR DO CSV DA CGESG; VER dados_sinteticos.py).
+
+import argparse
+import email.utils
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+PASTA_PAGINAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "paginas_demanda")
+
+def nome_pagina(valor):
+    valor = unicodedata.normalize("NFKD", valor).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^A-Za-z0-9]+", "_", valor).strip("_").upper()
+
+def caminho_documento(pasta_documentos, relativo):
+    """Arquivo de pasta_documentos pedido em /documentos/<relativo> (ex.: editais/3.pdf); None se sair da pasta."""
+    partes = relativo.replace("\\", "/").split("/")
+    if any(parte in ("..", ".") for parte in partes) or not any(partes):
+        return None
+    raiz = os.path.realpath(pasta_documentos)
+    caminho = os.path.realpath(os.path.join(raiz, *[parte for parte in partes if parte]))
+    return caminho if os.path.commonpath([raiz, caminho]) == raiz else None
+
+def cria_handler(pasta, pasta_documentos=None, arquivo_cgesg=None):
+    class DemandaHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # mantém a conexão aberta (keep-alive), como o site real
+        disable_nagle_algorithm = True  # sem isso cabeçalho e corpo saem em pacotes separados (+40 ms por resposta)
+
+        def log_message(self, format, *args):
+            pass
+
+        def responde(self, nome_arquivo):
+            caminho = os.path.join(pasta, nome_arquivo)
+            if not os.path.isfile(caminho):
+                self.send_error(404, f"Página não gravada: {nome_arquivo}")
+                return
+            with open(caminho, "rb") as arquivo:
+                conteudo = arquivo.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(conteudo)))
+            self.end_headers()
+            self.wfile.write(conteudo)
+
+        def responde_formulario(self, campos):
+            ano_sem = (campos.get("ano-sem") or [""])[0]
+            unidade = (campos.get("FATEC") or [""])[0]
+            if ano_sem and unidade:
+                self.responde(f"{ano_sem}_{nome_pagina(unidade)}.html")
+            elif ano_sem:
+                self.responde(f"{ano_sem}.html")
+            else:
+                self.responde("inicio.html")
+
+        def responde_documento(self, caminho):
+            if not caminho or not os.path.isfile(caminho):
+                self.send_error(404, f"Documento não encontrado: {os.path.basename(caminho or '')}")
+                return
+            with open(caminho, "rb") as arquivo:
+                conteudo = arquivo.read()
+            etag = '"' + hashlib.sha1(conteudo).hexdigest() + '"'
+            modificado = email.utils.formatdate(int(os.path.getmtime(caminho)), usegmt=True)
+
+            if self.headers.get("If-None-Match") == etag or (
+                    "If-None-Match" not in self.headers and self.headers.get("If-Modified-Since") == modificado):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            tipos = {".pdf": "application/pdf", ".csv": "text/csv; charset=utf-8"}
+            self.send_header("Content-Type", tipos.get(os.path.splitext(caminho)[1].lower(), "application/octet-stream"))
+            self.send_header("Content-Length", str(len(conteudo)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", modificado)
+            self.end_headers()
+            self.wfile.write(conteudo)
+
+        def do_GET(self):
+            caminho = urlparse(self.path).path
+            if pasta_documentos and caminho.startswith("/documentos/"):
+                # O subcaminho é mantido: /documentos/editais/3.pdf e /documentos/fichas/3.pdf são arquivos diferentes
+                self.responde_documento(caminho_documento(pasta_documentos, unquote(caminho[len("/documentos/"):])))
+                return
+            if arquivo_cgesg and caminho == "/cgesg/editais.csv":
+                self.responde_documento(arquivo_cgesg)
+                return
+            self.responde_formulario(parse_qs(urlparse(self.path).query))
+
+        def do_POST(self):
+            tamanho = int(self.headers.get("Content-Length") or 0)
+            corpo = self.rfile.read(tamanho).decode("utf-8")
+            self.responde_formulario(parse_qs(corpo))
+
+    return DemandaHandler
+
+def inicia_servidor(porta=0, pasta=PASTA_PAGINAS, pasta_documentos=None, arquivo_cgesg=None):
+    """
+    Sobe o servidor em uma thread e retorna (servidor, url_demanda).
+    Com porta=0 o sistema escolhe uma porta livre. Para encerrar: servidor.shutdown().
+    Os documentos (se houver) ficam em url_demanda trocando /demanda/ por /documentos/<caminho na pasta>,
+    e o CSV de editais em /cgesg/editais.csv.
+    """
+    servidor = ThreadingHTTPServer(("127.0.0.1", porta), cria_handler(pasta, pasta_documentos, arquivo_cgesg))
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}/demanda/"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local que imita a página de demanda da CESU.")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--pasta", default=PASTA_PAGINAS, help="pasta com as páginas gravadas")
+    parser.add_argument("--documentos", metavar="PASTA", help="pasta servida em /documentos/ (editais, fichas, tabelas)")
+    parser.add_argument("--cgesg", metavar="ARQUIVO_CSV", help="CSV de editais servido em /cgesg/editais.csv")
+    args = parser.parse_args()
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", args.porta), cria_handler(args.pasta, args.documentos, args.cgesg))
+    print(f"Servindo as páginas de '{args.pasta}' em http://127.0.0.1:{args.porta}/demanda/ (Ctrl+C para sair)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
@@ -0,0 +1,20 @@
+#  SESSAO HTTP
+#  SESSÃO requests COMPARTILHADA PELOS PROGRAMAS QUE FAZEM MUITAS REQUISIÇÕES EM PARALELO
+#  (busca_demanda_vestibular_fatec.py NO MOTOR http, baixa_documentos.py).
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def cria_sessao(conexoes, hosts=1, repete_post=False):
+    """
+    Sessão única, com pool de até `conexoes` conexões por host (para `hosts` hosts) e novas tentativas em falhas
+    transitórias (500, 502, 503, 504). Com repete_post, também repete POST (o formulário da demanda só consulta).
+    """
+    sessao = requests.Session()
+    metodos = None if repete_post else Retry.DEFAULT_ALLOWED_METHODS
+    tentativas = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504), allowed_methods=metodos)
+    adaptador = HTTPAdapter(pool_connections=hosts, pool_maxsize=conexoes, max_retries=tentativas)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    return sessao
@@ -0,0 +1,7 @@
+# Os programas são scripts soltos na raiz do repositório: os testes os importam pelo nome, como eles importam uns aos outros
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
@@ -0,0 +1,58 @@
+import os
+
+import pandas as pd
+import pytest
+import requests
+
+from baixa_documentos import baixa_documentos, resume_manifesto
+from servidor_local_demanda import caminho_documento, inicia_servidor
+
+@pytest.fixture
+def servidor_documentos(tmp_path):
+    pasta = tmp_path / "servidos"
+    for subpasta, conteudo in [("editais", b"%PDF edital 1"), ("fichas", b"%PDF ficha 1"), ("tabelas", b"%PDF edital 1")]:
+        (pasta / subpasta).mkdir(parents=True)
+        (pasta / subpasta / "1.pdf").write_bytes(conteudo)
+    servidor, url_demanda = inicia_servidor(pasta_documentos=str(pasta))
+    yield pasta, url_demanda.replace("/demanda/", "/documentos")
+    servidor.shutdown()
+    servidor.server_close()
+
+def situacoes(manifesto):
+    return {linha["tipo"]: linha["situacao"] for linha in manifesto}
+
+def test_novo_nao_modificado_alterado(tmp_path, servidor_documentos):
+    pasta, url = servidor_documentos
+    df = pd.DataFrame([{"Edital No": "1/2024", "Edital": f"{url}/editais/1.pdf",
+                        "Ficha": f"{url}/fichas/1.pdf", "Tabela": f"{url}/tabelas/1.pdf"}])
+    destino = str(tmp_path / "baixados")
+
+    manifesto = baixa_documentos(df, destino, conexoes=2)
+    assert situacoes(manifesto) == {"Edital": "novo", "Ficha": "novo", "Tabela": "novo"}
+    # Edital e Tabela têm o mesmo conteúdo: um só objeto no cache
+    sha = {linha["tipo"]: linha["sha256"] for linha in manifesto}
+    assert sha["Edital"] == sha["Tabela"] != sha["Ficha"]
+    objetos = [nome for _, _, nomes in os.walk(os.path.join(destino, "objetos")) for nome in nomes]
+    assert sorted(objetos) == sorted({sha["Edital"], sha["Ficha"]})
+
+    manifesto = baixa_documentos(df, destino, conexoes=2)
+    assert resume_manifesto(manifesto) == {"nao_modificado": 3}
+
+    (pasta / "fichas" / "1.pdf").write_bytes(b"%PDF ficha 1, segunda versao")
+    manifesto = baixa_documentos(df, destino, conexoes=2)
+    assert situacoes(manifesto) == {"Edital": "nao_modificado", "Ficha": "alterado", "Tabela": "nao_modificado"}
+    linha_ficha = next(linha for linha in manifesto if linha["tipo"] == "Ficha")
+    with open(linha_ficha["arquivo"], "rb") as arquivo:
+        assert arquivo.read() == b"%PDF ficha 1, segunda versao"
+
+def test_servidor_nao_sai_da_pasta_documentos(servidor_documentos):
+    pasta, url = servidor_documentos
+    assert requests.get(f"{url}/editais/1.pdf").content == b"%PDF edital 1"
+    assert requests.get(f"{url}/fichas/1.pdf").content == b"%PDF ficha 1"
+    # O cliente normaliza "/../" na URL; codificado, o ".." chega ao servidor
+    for caminho in ["/editais/%2e%2e/fichas/1.pdf", "/%2e%2e%2f%2e%2e%2fconftest.py", "/"]:
+        assert requests.get(url + caminho).status_code == 404
+
+    assert caminho_documento(str(pasta), "editais/1.pdf") == os.path.realpath(pasta / "editais" / "1.pdf")
+    for relativo in ["../servidos/editais/1.pdf", "editais/../fichas/1.pdf", "..\\conftest.py", "", "/"]:
+        assert caminho_documento(str(pasta), relativo) is None
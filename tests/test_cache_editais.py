@@ -0,0 +1,34 @@
+import json
+import os
+import time
+
+import busca_edital_CESU
+from dados_sinteticos import gera_csv_cgesg
+
+def prepara_cache(pasta):
+    csv_cache = os.path.join(pasta, "editais_cgesg.csv")
+    gera_csv_cgesg(csv_cache, 20)
+    sha = busca_edital_CESU.hash_arquivo(csv_cache)
+    with open(os.path.join(pasta, "meta.json"), "w", encoding="utf-8") as arquivo:
+        json.dump({"baixado_em": time.time(), "sha256": sha, "snapshot_sha256": sha}, arquivo)
+    return csv_cache
+
+def test_snapshot_corrompido_volta_para_o_csv(tmp_path):
+    prepara_cache(str(tmp_path))
+    (tmp_path / "editais_cgesg.pkl").write_bytes(b"isto nao e um pickle")
+
+    df = busca_edital_CESU.obtem_editais(pasta_cache=str(tmp_path))
+
+    assert len(df) == 20
+    # O snapshot foi regravado e volta a ser usado na execução seguinte
+    assert len(busca_edital_CESU.obtem_editais(pasta_cache=str(tmp_path))) == 20
+
+def test_perfis_vazios_com_documentos_nao_falha(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(busca_edital_CESU.PASTA_CACHE)
+    prepara_cache(busca_edital_CESU.PASTA_CACHE)
+    (tmp_path / "vazio.json").write_text("{}", encoding="utf-8")
+
+    busca_edital_CESU.main(["--perfis", "vazio.json", "--documentos", "docs"])
+
+    assert "não há documentos para baixar" in capsys.readouterr().out
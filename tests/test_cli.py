@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+from cinto_de_utilidades import cli
+
+def test_orcamento_de_inicio():
+    verificacoes = cli.verifica_inicio(repeticoes=1)
+    assert {v["subcomando"] for v in verificacoes} == {"(cli)", "demanda", "imagens", "qrcode"}
+    # Os módulos carregados não dependem da máquina: sempre conferidos
+    carregaram_pesados = [v for v in verificacoes if v["pesados"]]
+    assert not carregaram_pesados, carregaram_pesados
+
+@pytest.mark.skipif(not os.environ.get("CINTO_MEDE_INICIO"), reason="tempo depende da máquina; CINTO_MEDE_INICIO=1")
+def test_tempo_de_inicio():
+    estouraram = [v for v in cli.verifica_inicio() if not v["no_tempo"]]
+    assert not estouraram, estouraram
+
+def test_subcomando_recebe_o_resto_da_linha(capsys):
+    argv_original = list(sys.argv)
+    with pytest.raises(SystemExit) as saida:
+        cli.main(["cubo", "--help"])
+    assert saida.value.code == 0
+    assert "cinto_de_utilidades cubo" in capsys.readouterr().out
+    assert sys.argv == argv_original
+
+def test_subcomando_desconhecido():
+    with pytest.raises(SystemExit) as saida:
+        cli.main(["nao_existe"])
+    assert saida.value.code == 2
@@ -0,0 +1,16 @@
+import csv
+
+from dados_sinteticos import DICT_CSV, gera_demanda_csv, nomes_unidades
+from texto import chave_busca
+
+def test_nomes_unidades_sao_so_unidades():
+    with open(DICT_CSV, newline="", encoding="utf-8") as arquivo:
+        canonicos = {chave_busca(linha["aliases"]): linha["canonical"] for linha in csv.DictReader(arquivo)}
+    nomes = nomes_unidades()
+    assert nomes
+    assert all(canonicos[chave_busca(nome)].startswith("FATEC") for nome in nomes)
+
+def test_demanda_csv_deterministico(tmp_path):
+    gera_demanda_csv(tmp_path / "a.csv", 500, semente=3)
+    gera_demanda_csv(tmp_path / "b.csv", 500, semente=3)
+    assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
@@ -0,0 +1,27 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from dados_sinteticos import gera_payloads_csv
+from desenha_qrcode import png_qrcode
+from qrcode_generator import cria_qrcode, le_lote
+
+def pixels(png):
+    return np.asarray(Image.open(io.BytesIO(png)).convert("L"))
+
+@pytest.mark.parametrize("correcao, box_size, border", [
+    ("L", 5, 0), ("L", 1, 4), ("M", 3, 2), ("Q", 10, 1), ("H", 7, 4),
+])
+def test_png_qrcode_igual_ao_make_image(tmp_path, correcao, box_size, border):
+    gera_payloads_csv(str(tmp_path / "payloads.csv"), 5)
+    payloads = [payload for _, payload in le_lote(str(tmp_path / "payloads.csv"))]
+    for payload in payloads + ["", "a", "https://encurtador.com.br/AgKPH"]:
+        qr = cria_qrcode(payload, correcao, box_size, border)
+        saida = io.BytesIO()
+        qr.make_image(fill_color="black", back_color="white").save(saida)
+        esperado = pixels(saida.getvalue())
+        obtido = pixels(png_qrcode(qr))
+        assert obtido.shape == esperado.shape
+        assert np.array_equal(obtido, esperado)
@@ -0,0 +1,75 @@
+import csv
+import hashlib
+import os
+
+import extrai_imagens_pdf
+from dados_sinteticos import gera_pdf_imagens
+from extrai_imagens_pdf import extrai_imagens_da_pasta, extrai_pdf, iter_images
+
+EXTRAI_PDF_DO_LOTE = extrai_imagens_pdf.extrai_pdf_do_lote
+
+def extrai_ou_derruba_o_processo(pdf_path, *args):
+    # Imita uma falha que mata o processo do pool (ex.: falta de memória), sem exceção para capturar
+    if os.path.basename(pdf_path) == "derruba.pdf":
+        os._exit(1)
+    return EXTRAI_PDF_DO_LOTE(pdf_path, *args)
+
+def test_iter_images_unicas_e_todas(tmp_path):
+    pdf = str(tmp_path / "a.pdf")
+    gera_pdf_imagens(pdf, paginas=5, lado=64)
+
+    unicas = list(iter_images(pdf))
+    assert len(unicas) == 6  # o logotipo (mesmo xref em todas as páginas) sai uma vez só
+    assert all(item["erro"] is None and item["imagem"] for item in unicas)
+    assert len(list(iter_images(pdf, unicas=False))) == 10
+    assert [item["pagina"] for item in iter_images(pdf, pages=[(2, 3)])] == [2, 2, 3]
+    assert [item["largura"] for item in iter_images(pdf, min_size=100)] == [120]  # só o logotipo
+
+def test_extrai_pdf_grava_o_que_o_iter_images_gera(tmp_path):
+    pdf = str(tmp_path / "a.pdf")
+    gera_pdf_imagens(pdf, paginas=5, lado=64)
+    saida = tmp_path / "saida"
+
+    resumo = extrai_pdf(pdf, str(saida))
+
+    assert resumo["ocorrencias"] == 10 and resumo["arquivos"] == 6 and not resumo["erros"]
+    gravados = {nome: hashlib.sha256((saida / nome).read_bytes()).hexdigest()
+                for nome in os.listdir(saida) if nome != "manifesto.csv"}
+    gerados = {f"image_page{i['pagina']}_{i['indice']}.{i['ext']}": hashlib.sha256(i["imagem"]).hexdigest()
+               for i in iter_images(pdf)}
+    assert gravados == gerados
+    with open(saida / "manifesto.csv", newline="", encoding="utf-8") as arquivo:
+        assert len(list(csv.DictReader(arquivo))) == 10
+
+def test_modo_pasta(tmp_path):
+    pasta = tmp_path / "pdfs"
+    (pasta / "sub").mkdir(parents=True)
+    gera_pdf_imagens(str(pasta / "a.pdf"), paginas=2, lado=32)
+    gera_pdf_imagens(str(pasta / "sub" / "b.pdf"), paginas=3, lado=32)
+    (pasta / "quebrado.pdf").write_bytes(b"nao e pdf")
+
+    resumos = extrai_imagens_da_pasta(str(pasta), str(tmp_path / "saida"), processos=2)
+
+    por_pdf = {os.path.relpath(r["pdf"], pasta): r for r in resumos}
+    assert por_pdf["a.pdf"]["arquivos"] == 3
+    assert por_pdf[os.path.join("sub", "b.pdf")]["arquivos"] == 4
+    assert por_pdf["quebrado.pdf"]["erros"]
+    assert (tmp_path / "saida" / "resumo_lote.csv").exists()
+
+def test_modo_pasta_sobrevive_a_processo_derrubado(tmp_path, monkeypatch):
+    monkeypatch.setattr(extrai_imagens_pdf, "extrai_pdf_do_lote", extrai_ou_derruba_o_processo)
+    pasta = tmp_path / "pdfs"
+    pasta.mkdir()
+    nomes = ["a.pdf", "derruba.pdf", "e.pdf", "f.pdf", "g.pdf", "h.pdf"]
+    for nome in nomes:
+        gera_pdf_imagens(str(pasta / nome), paginas=1, lado=16)
+
+    resumos = extrai_imagens_da_pasta(str(pasta), str(tmp_path / "saida"), processos=1)
+
+    por_pdf = {os.path.basename(r["pdf"]): r for r in resumos}
+    assert sorted(por_pdf) == nomes
+    assert por_pdf["derruba.pdf"]["erros"][0].startswith("BrokenProcessPool")
+    # No máximo PDFS_EM_ANDAMENTO_POR_PROCESSO PDFs estavam no pool quando ele quebrou; os seguintes vão para o pool novo
+    assert all(not por_pdf[nome]["erros"] and por_pdf[nome]["arquivos"] == 2 for nome in ["f.pdf", "g.pdf", "h.pdf"])
+    with open(tmp_path / "saida" / "resumo_lote.csv", newline="", encoding="utf-8") as arquivo:
+        assert len(list(csv.DictReader(arquivo))) == len(nomes)
@@ -0,0 +1,45 @@
+import os
+
+from indice_aliases import IndiceAliases, carrega_indice
+from processa_arquivo_demanda_fatecs import build_alias_mapping
+
+DICIONARIO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dicionario_editado.csv")
+
+DMAP = {
+    "GUARULHOS": "FATEC GUARULHOS",
+    "SAO PAULO": "FATEC SÃO PAULO",
+    "ARAÇATUBA": "FATEC ARAÇATUBA - PROF. FERNANDO AMARAL DE ALMEIDA PRADO",
+    "NOTURNO": "NOITE",
+    "1º AO 3º VESPERTINO/ 4º AO 6º NOTURNO": "1º AO 3º TARDE/4º AO 6º NOITE",
+}
+
+def test_resolve_grafias_de_unidades():
+    indice = IndiceAliases(DMAP)
+    assert indice.resolve("Fatec Sao  Paulo")[0] == "FATEC SÃO PAULO"
+    assert indice.resolve("Fatec Araçatuba - Prof Fernando Amaral de Almeida Prado")[0] == DMAP["ARAÇATUBA"]
+
+def test_periodos_nao_entram_no_indice():
+    indice = IndiceAliases(DMAP)
+    assert "NOITE" not in indice.canonicos
+    canonico, _, sugestao = indice.resolve("Fatec 1º Ao 3º Vespertino/ 4º Ao 6º Noturno")
+    assert canonico is None
+    assert sugestao is None or sugestao.startswith("FATEC")
+
+def test_numeral_diferente_nao_funde_unidades():
+    indice = IndiceAliases(DMAP)
+    assert indice.resolve("GUARULHOS II")[0] is None
+    assert indice.resolve("Fatec Guarulhos 2")[0] is None
+
+def test_prefixo_fatec_em_alias_do_dicionario():
+    dmap = build_alias_mapping(DICIONARIO)
+    indice = IndiceAliases(dmap)
+    assert indice.resolve("Fatec Jaú")[0] == dmap["JAÚ"]
+    assert indice.resolve("Fatec São Caetano")[0] == dmap["SÃO CAETANO"]
+    assert indice.resolve("Fatec")[0] is None
+
+def test_cache_de_modulo_renomeado_e_remontado(tmp_path):
+    cache = tmp_path / "dicionario.indice.pkl"
+    cache.write_bytes(b"cmodulo_que_nao_existe\nIndiceAntigo\n.")  # pickle que aponta para um módulo que sumiu
+    indice = carrega_indice(DICIONARIO, build_alias_mapping(DICIONARIO), str(cache))
+    assert indice.resolve("Fatec Jaú")[1] == 1.0
+    assert carrega_indice(DICIONARIO, {}, str(cache)).resolve("Fatec Jaú")[1] == 1.0  # veio do cache regravado
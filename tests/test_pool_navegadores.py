@@ -0,0 +1,67 @@
+import threading
+
+from busca_demanda_vestibular_fatec import executa_no_pool
+
+class NavegadorFalso:
+    """Imita o driver: depois de derrubado, qualquer comando falha (como um Chrome que caiu)."""
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.caiu = False
+        self.fechado = False
+
+    @property
+    def current_url(self):
+        if self.caiu:
+            raise RuntimeError("invalid session id")
+        return "about:blank"
+
+    def quit(self):
+        self.fechado = True
+
+def test_navegador_que_cai_e_trocado_e_a_tarefa_repetida():
+    trava = threading.Lock()
+    derrubado = []
+
+    def funcao(driver, numero):
+        with trava:
+            if numero == 3 and not derrubado:
+                derrubado.append(driver)
+                driver.caiu = True
+        if driver.caiu:
+            raise RuntimeError("invalid session id")
+        return (numero, driver.nome)
+
+    novos = []
+
+    def cria():
+        novos.append(NavegadorFalso(f"novo{len(novos)}"))
+        return novos[-1]
+
+    drivers = [NavegadorFalso("a"), NavegadorFalso("b")]
+    resultados = executa_no_pool(drivers, [(n,) for n in range(10)], funcao, cria)
+
+    assert [r[0] for r in resultados] == list(range(10))
+    assert derrubado[0].fechado and len(novos) == 1
+    assert novos[0] in drivers  # o pool passa a fechar o navegador novo no fim
+
+def test_erro_da_pagina_nao_troca_o_navegador():
+    def funcao(driver, numero):
+        if numero == 1:
+            raise ValueError("tabela não encontrada")
+        return numero
+
+    drivers = [NavegadorFalso("a")]
+    resultados = executa_no_pool(drivers, [(n,) for n in range(3)], funcao, cria=None)
+    assert resultados == [0, None, 2]
+    assert not drivers[0].fechado
+
+def test_sem_como_reabrir_a_thread_para_e_as_outras_continuam():
+    def funcao(driver, numero):
+        if driver.nome == "a":
+            driver.caiu = True
+            raise RuntimeError("chrome not reachable")
+        return numero
+
+    resultados = executa_no_pool([NavegadorFalso("a"), NavegadorFalso("b")], [(n,) for n in range(6)], funcao)
+    assert resultados == list(range(6))
@@ -0,0 +1,34 @@
+import csv
+
+from qrcode_generator import gera_lote, nomes_arquivos
+
+def escreve_lote(caminho, linhas):
+    with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["id", "payload"])
+        escritor.writerows(linhas)
+
+def test_trocar_de_formato_nao_regrava_o_outro(tmp_path):
+    lote = tmp_path / "lote.csv"
+    escreve_lote(lote, [("a", "https://a"), ("b", "https://b")])
+    saida = str(tmp_path / "qrcodes")
+
+    assert gera_lote(str(lote), saida, "png", processos=1)["gravados"] == 2
+    assert gera_lote(str(lote), saida, "svg", processos=1)["gravados"] == 2
+    assert gera_lote(str(lote), saida, "png", processos=1)["gravados"] == 0
+    assert (tmp_path / "qrcodes" / "manifesto_png.csv").exists()
+    assert (tmp_path / "qrcodes" / "manifesto_svg.csv").exists()
+
+def test_ids_com_o_mesmo_nome_de_arquivo_nao_se_sobrescrevem(tmp_path):
+    nomes = nomes_arquivos(["QR 1", "QR_1", "qr-1", "qr_1"], "png")
+    assert nomes[0] == "QR_1.png" and nomes[2] == "qr-1.png"
+    assert len({nome.lower() for nome in nomes}) == 4
+    assert nomes == nomes_arquivos(["QR 1", "QR_1", "qr-1", "qr_1"], "png")
+
+    lote = tmp_path / "lote.csv"
+    escreve_lote(lote, [("QR 1", "https://um"), ("QR_1", "https://outro")])
+    gera_lote(str(lote), str(tmp_path / "qrcodes"), "png", processos=1)
+    with open(tmp_path / "qrcodes" / "manifesto_png.csv", newline="", encoding="utf-8") as arquivo:
+        arquivos = [linha["arquivo"] for linha in csv.DictReader(arquivo)]
+    assert len(set(arquivos)) == 2
+    assert all((tmp_path / "qrcodes" / nome).exists() for nome in arquivos)
@@ -0,0 +1,25 @@
+import os
+
+from fpdf import FPDF
+
+from busca_edital_CESU import FONT_PATH, quebra_linhas
+
+def pdf_de_teste():
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.add_font("DejaVu", "", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), FONT_PATH))
+    pdf.set_font("DejaVu", size=12)
+    return pdf
+
+def test_quebra_nos_espacos_como_o_multi_cell():
+    pdf = pdf_de_teste()
+    texto = "Área(s): " + ", ".join(["Ciência da computação", "Administração e negócios", "Matemática"] * 4)
+    largura = pdf.epw - 2 * pdf.c_margin
+    linhas = quebra_linhas(pdf, texto, largura, {})
+    assert linhas == pdf.multi_cell(0, 6, texto, dry_run=True, output="LINES")
+
+def test_quebra_em_cada_nova_linha():
+    pdf = pdf_de_teste()
+    linhas = quebra_linhas(pdf, "Área(s): Matemática\nEstatística\r\nEconomia", 150, {})
+    assert linhas == ["Área(s): Matemática", "Estatística", "Economia"]
+    assert all("\n" not in linha and "\r" not in linha for linha in linhas)
@@ -0,0 +1,32 @@
+import os
+
+from busca_demanda_vestibular_fatec import linhas_para_registros, parse_tabela_demanda
+PAGINA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "paginas_demanda", "20251_SAO_PAULO.html")
+
+def le_pagina():
+    with open(PAGINA, encoding="utf-8") as arquivo:
+        return arquivo.read()
+
+def test_parse_tabela_demanda_le_linhas_e_celulas():
+    linhas = parse_tabela_demanda(le_pagina())
+    assert linhas == [
+        ["Análise e Desenvolvimento de Sistemas", "Manhã", "1.204", "80", "15,05"],
+        ["Mecânica de Precisão", "Noite", "143", "40", "3,58"],
+        ["Edifícios", "Tarde", "210", "40", "5,25"],
+        ["Turismo", "Noite", "66", "40", "1,65"],
+    ]
+
+def test_parse_tabela_demanda_ignora_tabelas_de_outra_classe():
+    html = ('<table class="outra"><tr><td>x</td></tr></table>'
+            '<table class="table table-striped"><tr><th>Curso</th></tr>'
+            '<tr><td> Logística<br>EaD </td><td>Noite</td></tr></table>')
+    assert parse_tabela_demanda(html) == [["Logística EaD", "Noite"]]
+
+def test_linhas_para_registros_mantem_numeros_como_texto():
+    registros = linhas_para_registros("2025", "1", "São Paulo", parse_tabela_demanda(le_pagina()))
+    assert len(registros) == 4
+    assert registros[0] == ["2025", "1", "SÃO PAULO", "ANÁLISE E DESENVOLVIMENTO DE SISTEMAS", "MANHÃ",
+                            "1.204", "80", "15,05"]
+
+def test_linhas_para_registros_descarta_linhas_incompletas():
+    assert linhas_para_registros("2025", "1", "Americana", [["Turismo", "Noite", "66"]]) == []
@@ -0,0 +1,42 @@
+#  TEXTO
+#  FUNÇÕES DE NORMALIZAÇÃO DE TEXTO COMPARTILHADAS PELOS PROGRAMAS (SEM ACENTOS, SEM DIFERENÇA DE MAIÚSCULAS/MINÚSCULAS).
+
+import re
+import unicodedata
+
+# Abreviações comuns nos nomes das unidades (já sem acentos e sem pontuação)
+ABREVIACOES = {
+    "PROF": "PROFESSOR",
+    "PROFA": "PROFESSOR",
+    "PROFESSORA": "PROFESSOR",
+    "DR": "DOUTOR",
+    "DRA": "DOUTOR",
+    "DEP": "DEPUTADO",
+    "PREF": "PREFEITO",
+    "ENG": "ENGENHEIRO",
+    "PE": "PADRE",
+    "STA": "SANTA",
+    "STO": "SANTO",
+}
+
+def remove_acentos(texto: str) -> str:
+    # NFKD separa letra e acento (e transforma ª/º em a/o); os acentos são descartados
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+def chave_busca(texto: str) -> str:
+    """
+    Chave de comparação: sem acentos, maiúsculas, pontuação trocada por espaço,
+    abreviações expandidas e espaços colapsados. Ex.: "Prof. João" -> "PROFESSOR JOAO".
+    """
+    texto = remove_acentos(str(texto)).upper()
+    tokens = re.sub(r"[^A-Z0-9]+", " ", texto).split()
+    return " ".join(ABREVIACOES.get(t, t) for t in tokens)
+
+def nome_arquivo_seguro(texto: str) -> str:
+    """Trecho de nome de arquivo: letras, números, "_" e "-"; o resto vira "_". Ex.: "QR 1/2025" -> "QR_1_2025"."""
+    return re.sub(r"[^\w-]+", "_", str(texto), flags=re.UNICODE).strip("_")
+
+def normaliza_termo(texto: str) -> str:
+    """Termo de filtro: sem acentos, minúsculas e espaços colapsados. Ex.: " Área  de TI" -> "area de ti"."""
+    return " ".join(remove_acentos(str(texto)).casefold().split())